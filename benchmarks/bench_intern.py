@@ -0,0 +1,58 @@
+"""
+Allocation benchmark: memory allocated per scrape with and without interned samples
+
+Every scrape is traced with tracemalloc from a cleared trace table, so "retained"
+is the size of blocks allocated by the scrape and still alive after it, and "peak"
+is its transient high-water mark.
+
+Usage: python -m benchmarks.bench_intern [--commands 200] [--dbs 16] [--iterations 50]
+"""
+
+import argparse
+import tracemalloc
+
+from exporter import Options, RedisCollector
+
+from benchmarks.synthetic import FakeRedis, make_info
+
+
+def trace_scrape(collector: RedisCollector, interned: bool):
+    """(retained, peak) bytes allocated by one scrape"""
+    if not interned:
+        collector._metric_slots.clear()
+        collector._histogram_slots.clear()
+    tracemalloc.clear_traces()
+    collector.scrape()
+    return tracemalloc.get_traced_memory()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--dbs", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    collector = RedisCollector("redis://localhost:6379", Options())
+    client = FakeRedis(make_info(commands=args.commands, dbs=args.dbs))
+    collector._connect = lambda: client
+
+    tracemalloc.start()
+    try:
+        for interned in (False, True):
+            trace_scrape(collector, interned)
+            retained = peak = 0
+            for _ in range(args.iterations):
+                scrape_retained, scrape_peak = trace_scrape(collector, interned)
+                retained += scrape_retained
+                peak = max(peak, scrape_peak)
+            samples = sum(map(len, collector._current_metrics.values()))
+            print(f"{'interned' if interned else 'fresh':>8}: {samples} samples, "
+                  f"retained {retained / args.iterations / 1024:.1f} KiB/scrape, "
+                  f"peak {peak / 1024:.1f} KiB")
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
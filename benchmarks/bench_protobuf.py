@@ -0,0 +1,65 @@
+"""
+Protobuf benchmark: ProtobufRenderer vs ExpositionRenderer on histogram-heavy metrics
+
+Usage: python -m benchmarks.bench_protobuf [--commands 200] [--iterations 200]
+"""
+
+import argparse
+import gzip
+import random
+
+from exporter import Options, RedisCollector
+from exporter.exposition import ExpositionRenderer
+from exporter.protobuf import ProtobufRenderer
+
+from .bench_render import bench
+
+# Power-of-two bounds in seconds (2^-20s ~ 1us .. 2^9s), the layout sent as native histograms
+BUCKETS = tuple(2.0 ** i for i in range(-20, 10)) + (float("inf"),)
+
+
+def make_collector(commands: int) -> RedisCollector:
+    """Collector with power-of-two histograms (few populated buckets per command)"""
+    rng = random.Random(42)
+    collector = RedisCollector("redis://localhost:6379", Options())
+    collector._register_metric("up", 1.0)
+    for i in range(commands):
+        counts = [0] * (len(BUCKETS) - 1)
+        for _ in range(rng.randint(1, 5)):
+            counts[rng.randint(0, 12)] += rng.randint(1, 10000)
+        cumulative = []
+        total = 0
+        for count in counts:
+            total += count
+            cumulative.append(float(total))
+        buckets = list(zip(BUCKETS, cumulative + [float(total)]))
+        collector._register_histogram("command_latency_seconds", buckets, total * 2e-6,
+                                      labels={"cmd": f"command{i}"})
+    return collector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    collector = make_collector(args.commands)
+    text_renderer = ExpositionRenderer(collector.options.namespace)
+    protobuf_renderer = ProtobufRenderer(collector.options.namespace)
+    classic_renderer = ProtobufRenderer(collector.options.namespace, classic_histograms=True)
+
+    results = [
+        ("text", lambda: text_renderer.render(collector)),
+        ("protobuf native", lambda: protobuf_renderer.render(collector)),
+        ("protobuf native+classic", lambda: classic_renderer.render(collector)),
+    ]
+    for name, render in results:
+        body = render()
+        seconds = bench(render, args.iterations)
+        print(f"{name:24} {len(body):>9} bytes {len(gzip.compress(body)):>8} gzipped "
+              f"{seconds * 1000:8.3f} ms {len(body) / seconds / 1e6:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Render benchmark: ExpositionRenderer vs prometheus_client generate_latest
+
+Usage: python -m benchmarks.bench_render [--commands 200] [--iterations 200]
+"""
+
+import argparse
+import time
+
+from prometheus_client import CollectorRegistry, generate_latest
+
+from exporter import Options, RedisCollector
+from exporter.exposition import ExpositionRenderer
+
+
+class _Families:
+    """Registry adapter building MetricFamily objects from current accumulators"""
+
+    def __init__(self, collector: RedisCollector):
+        self.collector = collector
+
+    def collect(self):
+        return self.collector._metric_families()
+
+
+def make_collector(commands: int, dbs: int = 16) -> RedisCollector:
+    """Collector with accumulators shaped like a busy instance"""
+    collector = RedisCollector("redis://localhost:6379", Options())
+    for name in ("up", "uptime_in_seconds", "connected_clients", "memory_used_bytes"):
+        collector._register_metric(name, 12345.0)
+    for i in range(commands):
+        labels = {"cmd": f"command{i}"}
+        collector._register_metric("commands_total", float(i * 1000), is_counter=True, labels=labels)
+        collector._register_metric("commands_duration_seconds_total", i * 0.5, is_counter=True, labels=labels)
+        collector._register_metric("commands_rejected_calls_total", 0.0, is_counter=True, labels=labels)
+        collector._register_metric("commands_failed_calls_total", 0.0, is_counter=True, labels=labels)
+        buckets = [(2.0 ** b / 1e6, float(b * 10)) for b in range(20)] + [(float("inf"), 200.0)]
+        collector._register_histogram("latency_usec", buckets, 1234.5, labels=labels)
+    for db in range(dbs):
+        labels = {"db": f"db{db}"}
+        collector._register_metric("db_keys", 1e6, labels=labels)
+        collector._register_metric("db_keys_expiring", 1e3, labels=labels)
+        collector._register_metric("db_avg_ttl_seconds", 3600.0, labels=labels)
+    return collector
+
+
+def bench(func, iterations: int) -> float:
+    """Mean seconds per call"""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    collector = make_collector(args.commands)
+    registry = CollectorRegistry()
+    registry.register(_Families(collector))
+    renderer = ExpositionRenderer(collector.options.namespace)
+
+    size = len(renderer.render(collector))
+    baseline = bench(lambda: generate_latest(registry), args.iterations)
+    native = bench(lambda: renderer.render(collector), args.iterations)
+
+    print(f"payload: {size} bytes")
+    print(f"generate_latest:    {baseline * 1000:.3f} ms")
+    print(f"ExpositionRenderer: {native * 1000:.3f} ms ({baseline / native:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare two benchmarks.suite result files and flag regressions
+
+Exits with status 1 if any benchmark's median got slower than the threshold.
+
+Usage: python -m benchmarks.compare baseline.json current.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def load(path: str) -> Dict[str, dict]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(baseline: Dict[str, dict], current: Dict[str, dict],
+            threshold: float) -> List[Tuple[str, float, float, float, str]]:
+    """
+    Compare medians of benchmarks present in both runs
+
+    Returns:
+        List of (name, baseline ms, current ms, relative change, status)
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name]["median_ms"]
+        after = current[name]["median_ms"]
+        change = (after - before) / before if before else 0.0
+        if change > threshold:
+            status = "REGRESSION"
+        elif change < -threshold:
+            status = "improved"
+        else:
+            status = ""
+        rows.append((name, before, after, change, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown of the median reported as regression (default: 0.1)")
+    args = parser.parse_args()
+
+    baseline, current = load(args.baseline), load(args.current)
+    rows = compare(baseline, current, args.threshold)
+    for name, before, after, change, status in rows:
+        print(f"{name:<28} {before:10.3f} ms {after:10.3f} ms {change:+8.1%} {status}")
+    for name in sorted(set(baseline) ^ set(current)):
+        print(f"{name:<28} only in {'baseline' if name in baseline else 'current'}")
+
+    regressions = [row[0] for row in rows if row[4] == "REGRESSION"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark suite for the scrape hot paths: INFO parsing, key checks, collect and rendering
+
+Writes JSON results that benchmarks.compare checks for regressions.
+
+Usage: python -m benchmarks.suite [--output results.json] [--quick] [--filter info_]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from prometheus_client import CollectorRegistry
+
+from exporter import Options, RedisCollector
+from exporter.exposition import ExpositionRenderer
+from exporter.info import extract_info_metrics
+from exporter.keys import extract_check_key_metrics
+from exporter.protobuf import ProtobufRenderer
+
+from benchmarks.synthetic import FakeRedis, make_info, make_keyspace
+
+# (name, INFO generator arguments)
+INFO_SCENARIOS = (
+    ("small", dict(commands=20, errors=2, dbs=1, replicas=0)),
+    ("commands", dict(commands=400, errors=5, dbs=1, replicas=0)),
+    ("errors", dict(commands=50, errors=200, dbs=1, replicas=0)),
+    ("dbs", dict(commands=50, errors=5, dbs=256, replicas=0)),
+    ("replicas", dict(commands=50, errors=5, dbs=1, replicas=100)),
+)
+
+KEY_COUNTS = (100, 1000, 10000)
+
+
+def measure(func: Callable[[], None], iterations: int, repeat: int) -> Dict[str, float]:
+    """Median and min of repeat rounds, in milliseconds per call"""
+    func()
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        rounds.append((time.perf_counter() - start) / iterations * 1000)
+    return {
+        "median_ms": statistics.median(rounds),
+        "min_ms": min(rounds),
+        "iterations": iterations,
+        "repeat": repeat,
+    }
+
+
+def reset(collector: RedisCollector) -> None:
+    collector._current_metrics = {}
+    collector._current_histograms = {}
+
+
+def info_cases(scale: float) -> List[Tuple[str, Callable[[], None], int]]:
+    cases = []
+    for name, kwargs in INFO_SCENARIOS:
+        collector = RedisCollector("redis://localhost:6379", Options())
+        info = make_info(**kwargs)
+
+        def parse(collector=collector, info=info):
+            reset(collector)
+            extract_info_metrics(info, collector.metric_map_gauges, collector.metric_map_counters, collector)
+
+        cases.append((f"info_parse[{name}]", parse, max(1, int(200 * scale))))
+    return cases
+
+
+def key_cases(scale: float) -> List[Tuple[str, Callable[[], None], int]]:
+    cases = []
+    for count in KEY_COUNTS:
+        collector = RedisCollector("redis://localhost:6379", Options())
+        client = FakeRedis(keyspaces={0: make_keyspace(count)})
+
+        def check(collector=collector, client=client):
+            reset(collector)
+            extract_check_key_metrics(client, "db0=user:*", "", collector)
+
+        cases.append((f"check_keys[{count}]", check, max(1, int(200000 * scale / count))))
+    return cases
+
+
+def collect_cases(scale: float) -> List[Tuple[str, Callable[[], None], int]]:
+    options = Options(check_keys="db0=user:*")
+    collector = RedisCollector("redis://localhost:6379", options)
+    client = FakeRedis(make_info(commands=200, errors=10, dbs=16, replicas=2),
+                       keyspaces={0: make_keyspace(1000)})
+    collector._connect = lambda: client
+    collector.scrape()
+
+    registry = CollectorRegistry()
+    text = ExpositionRenderer(options.namespace)
+    protobuf = ProtobufRenderer(options.namespace)
+    iterations = max(1, int(100 * scale))
+    return [
+        ("collect", lambda: list(collector.collect()), iterations),
+        ("scrape", collector.scrape, iterations),
+        ("render_text", lambda: text.render(collector), iterations),
+        ("render_openmetrics", lambda: text.render(collector, openmetrics=True), iterations),
+        ("render_protobuf", lambda: protobuf.render(collector) + protobuf.render_registry(registry), iterations),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="", help="Write JSON results to this file")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations (smoke run)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Run only benchmarks whose name contains this")
+    args = parser.parse_args()
+
+    scale = 0.1 if args.quick else 1.0
+    repeat = 2 if args.quick else args.repeat
+
+    results = {}
+    for name, func, iterations in info_cases(scale) + key_cases(scale) + collect_cases(scale):
+        if args.filter not in name:
+            continue
+        results[name] = measure(func, iterations, repeat)
+        print(f"{name:<28} {results[name]['median_ms']:10.3f} ms (min {results[name]['min_ms']:.3f})")
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": sys.version.split()[0],
+                "implementation": platform.python_implementation(),
+                "machine": platform.machine(),
+                "quick": args.quick,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
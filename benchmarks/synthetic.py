@@ -0,0 +1,76 @@
+"""
+Synthetic Redis data for benchmarks: INFO replies and an in-process fake Redis
+"""
+
+import fnmatch
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+# INFO generator shared with the RESP stand-in server
+from exporter.resp_server import make_info
+
+# Key types cycled by make_keyspace, with the size reported for each
+KEY_TYPES = ("string", "hash", "list", "set", "zset")
+
+
+def make_keyspace(keys: int, prefix: str = "user:") -> Dict[str, Tuple[str, int, Optional[bytes]]]:
+    """Keys named prefix + index with types cycling through KEY_TYPES: {key: (type, size, value)}"""
+    keyspace = {}
+    for i in range(keys):
+        key_type = KEY_TYPES[i % len(KEY_TYPES)]
+        value = str(i).encode() if key_type == "string" else None
+        keyspace[f"{prefix}{i}"] = (key_type, len(value) if value else i % 100 + 1, value)
+    return keyspace
+
+
+class FakeRedis:
+    """
+    In-process stand-in for redis.Redis answering INFO, SELECT, SCAN and the key-check commands
+
+    Replies are bytes like a client created with decode_responses=False, so
+    timings include the exporter's decoding but no network or RESP parsing.
+    """
+
+    def __init__(self, info: str = "",
+                 keyspaces: Optional[Dict[int, Dict[str, Tuple[str, int, Optional[bytes]]]]] = None):
+        self.reply = info.encode()
+        self.keyspaces = keyspaces or {}
+        self.db = 0
+        self.connection_pool = SimpleNamespace(connection_kwargs={"db": 0})
+        self._sorted: Dict[int, List[str]] = {db: sorted(keys) for db, keys in self.keyspaces.items()}
+
+    def info(self, *sections):
+        return self.reply
+
+    def execute_command(self, *args):
+        if args[0].upper() == "SELECT":
+            self.db = int(args[1])
+            return b"OK"
+        raise redis.ResponseError(f"unknown command '{args[0]}'")
+
+    def scan(self, cursor: int = 0, match: Optional[str] = None, count: int = 10):
+        keys = self._sorted.get(self.db, [])
+        batch = keys[cursor:cursor + count]
+        if match is not None:
+            batch = [key for key in batch if fnmatch.fnmatchcase(key, match)]
+        cursor += count
+        return (cursor if cursor < len(keys) else 0), [key.encode() for key in batch]
+
+    def _key(self, key: str) -> Tuple[str, int, Optional[bytes]]:
+        return self.keyspaces.get(self.db, {}).get(key, ("none", 0, None))
+
+    def type(self, key: str) -> bytes:
+        return self._key(key)[0].encode()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._key(key)[2]
+
+    def pfcount(self, key: str) -> int:
+        raise redis.ResponseError("WRONGTYPE Key is not a valid HyperLogLog string value.")
+
+    def strlen(self, key: str) -> int:
+        return self._key(key)[1]
+
+    llen = scard = zcard = hlen = xlen = strlen
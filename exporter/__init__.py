@@ -27,7 +27,7 @@ try:
 except ImportError:
     __version__ = "0.0.0"
 
-from .config import Options, get_env, get_env_bool, get_env_float
+from .config import Options, get_env, get_env_bool, get_env_float, get_env_int
 from .exporter import RedisCollector
 from .redis_client import connect_to_redis, do_redis_cmd
 
@@ -39,4 +39,5 @@ __all__ = [
     "get_env",
     "get_env_bool",
     "get_env_float",
+    "get_env_int",
 ]
@@ -0,0 +1,332 @@
+"""
+Scrape load generator and capacity report
+
+Runs simulated Redis targets (resp_server) and an exporter process serving
+one /metrics endpoint per target, then drives concurrent simulated Prometheus
+scrapers against it in steps. Every step reports scrape latency percentiles,
+throughput and the exporter process CPU and RSS, giving a capacity curve per
+configuration.
+
+Usage: redis-exporter-bench --targets 10 --scrapers 1,10,50 --configs async-live,async-cached,sync-live
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, start_http_server
+
+from .config import Options
+from .exporter import RedisCollector
+from .http_server import MetricsServer
+from .resp_server import RespServer, VirtualKeyspace
+
+logger = logging.getLogger(__name__)
+
+# Exporter configurations: name -> (server, snapshot_ttl is used)
+CONFIGS = {
+    "async-live": ("async", False),
+    "async-cached": ("async", True),
+    "sync-live": ("sync", False),
+}
+
+# Accept header sent by Prometheus 2.x
+PROMETHEUS_ACCEPT = ("application/openmetrics-text;version=1.0.0,application/openmetrics-text;version=0.0.1;q=0.75,"
+                     "text/plain;version=0.0.4;q=0.5,*/*;q=0.1")
+
+# Seconds between CPU/RSS samples of the exporter process
+SAMPLE_INTERVAL = 1.0
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values (0 if empty)"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def process_usage(pid: int) -> Optional[Tuple[float, int]]:
+    """(CPU seconds, RSS bytes) of a process from /proc, None where unavailable"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    return cpu, rss_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _serve_targets(count: int, keys: int, conn) -> None:
+    """Child process: serve count synthetic Redis targets, send their ports"""
+    servers = [RespServer({0: VirtualKeyspace(keys)}) for _ in range(count)]
+
+    async def serve():
+        for server in servers:
+            await server.start("127.0.0.1", 0)
+        conn.send([server.port for server in servers])
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def _serve_exporter(server_type: str, snapshot_ttl: float, redis_ports: List[int],
+                    options: Dict[str, object], conn) -> None:
+    """Child process: serve /metrics for every target, send the HTTP ports"""
+    logging.basicConfig(level=logging.CRITICAL)
+    collectors = [RedisCollector(f"redis://127.0.0.1:{port}", Options(**options)) for port in redis_ports]
+
+    if server_type == "sync":
+        ports = []
+        for collector in collectors:
+            registry = CollectorRegistry()
+            registry.register(collector)
+            httpd, _ = start_http_server(0, "127.0.0.1", registry)
+            ports.append(httpd.server_port)
+        conn.send(ports)
+        threading.Event().wait()
+        return
+
+    async def serve():
+        ports = []
+        for collector in collectors:
+            server = MetricsServer(REGISTRY, snapshot_ttl=snapshot_ttl, collector=collector)
+            listener = await server.start("127.0.0.1", 0)
+            ports.append(listener.sockets[0].getsockname()[1])
+        conn.send(ports)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def _start_process(target, *args) -> Tuple[multiprocessing.Process, object]:
+    """Start a child process and wait for the ports it sends"""
+    parent_conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=target, args=args + (child_conn,), daemon=True)
+    process.start()
+    if not parent_conn.poll(30):
+        process.terminate()
+        raise RuntimeError(f"{target.__name__} didn't start")
+    return process, parent_conn.recv()
+
+
+class Scraper:
+    """HTTP client scraping /metrics like Prometheus (keep-alive when the server allows it)"""
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.request = (f"GET /metrics HTTP/1.1\r\nHost: {host}:{port}\r\nUser-Agent: redis-exporter-bench\r\n"
+                        f"Accept: {PROMETHEUS_ACCEPT}\r\nAccept-Encoding: gzip\r\n\r\n").encode()
+
+    async def scrape(self) -> int:
+        """Scrape once, returns body size"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(self.request)
+        await self.writer.drain()
+
+        status = (await self.reader.readline()).decode("latin-1")
+        if not status:
+            raise ConnectionError("Connection closed by server")
+        headers = {}
+        while True:
+            line = (await self.reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+        if status.startswith("HTTP/1.0") or headers.get("connection", "").lower() == "close" \
+                or "content-length" not in headers:
+            self.close()
+        if status.split(" ", 2)[1:2] != ["200"]:
+            raise ValueError(f"Unexpected response: {status.strip()}")
+        return len(body)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def run_step(ports: List[int], scrapers: int, duration: float, interval: float,
+                   timeout: float, pid: int) -> Dict[str, object]:
+    """Run scrapers concurrently for duration seconds, returns step results"""
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    errors = 0
+    body_bytes = 0
+    timeline = []
+    deadline = loop.time() + duration
+
+    async def worker(index: int):
+        nonlocal errors, body_bytes
+        scraper = Scraper(ports[index % len(ports)])
+        while loop.time() < deadline:
+            start = time.perf_counter()
+            try:
+                body_bytes += await asyncio.wait_for(scraper.scrape(), timeout)
+                latencies.append(time.perf_counter() - start)
+            except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                errors += 1
+                scraper.close()
+            if interval:
+                await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+        scraper.close()
+
+    async def sampler():
+        started = loop.time()
+        previous = process_usage(pid)
+        while True:
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            usage = process_usage(pid)
+            if usage is None or previous is None:
+                continue
+            timeline.append({
+                "t": round(loop.time() - started, 1),
+                "cpu_percent": round((usage[0] - previous[0]) / SAMPLE_INTERVAL * 100, 1),
+                "rss_mb": round(usage[1] / 1024 / 1024, 1),
+                "scrapes": len(latencies),
+            })
+            previous = usage
+
+    before = process_usage(pid)
+    started = time.perf_counter()
+    sampling = asyncio.ensure_future(sampler())
+    await asyncio.gather(*(worker(i) for i in range(scrapers)))
+    sampling.cancel()
+    elapsed = time.perf_counter() - started
+    after = process_usage(pid)
+
+    latencies.sort()
+    result = {
+        "scrapers": scrapers,
+        "scrapes": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "body_bytes": body_bytes // max(len(latencies), 1),
+        "cpu_percent": None,
+        "rss_mb": None,
+        "timeline": timeline,
+    }
+    if before is not None and after is not None:
+        result["cpu_percent"] = round((after[0] - before[0]) / elapsed * 100, 1)
+        result["rss_mb"] = round(after[1] / 1024 / 1024, 1)
+    return result
+
+
+def run_config(name: str, redis_ports: List[int], scrapers: List[int], duration: float,
+               interval: float, timeout: float, snapshot_ttl: float,
+               options: Dict[str, object]) -> List[Dict[str, object]]:
+    """Start an exporter process for a configuration and run every load step against it"""
+    server_type, cached = CONFIGS[name]
+    process, ports = _start_process(_serve_exporter, server_type, snapshot_ttl if cached else 0.0,
+                                    redis_ports, options)
+    try:
+        async def steps():
+            # Warm up connections and caches of every endpoint
+            for port in ports:
+                scraper = Scraper(port)
+                await asyncio.wait_for(scraper.scrape(), timeout)
+                scraper.close()
+            return [await run_step(ports, count, duration, interval, timeout, process.pid) for count in scrapers]
+
+        return asyncio.run(steps())
+    finally:
+        process.terminate()
+        process.join()
+
+
+def capacity(steps: List[Dict[str, object]], slo_ms: float) -> Optional[Dict[str, object]]:
+    """Step with the highest throughput whose p99 latency is within the SLO and without errors"""
+    within = [s for s in steps if s["p99_ms"] <= slo_ms and not s["errors"] and s["scrapes"]]
+    return max(within, key=lambda s: s["throughput"]) if within else None
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def parse_configs(value: str) -> List[str]:
+    configs = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [config for config in configs if config not in CONFIGS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown configs: {', '.join(unknown)} (known: {', '.join(CONFIGS)})")
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", type=int, default=10, help="Simulated Redis targets (one endpoint each)")
+    parser.add_argument("--scrapers", type=parse_int_list, default=[1, 10, 50, 100],
+                        help="Comma-separated concurrent scraper counts, one load step each")
+    parser.add_argument("--configs", type=parse_configs, default=list(CONFIGS),
+                        help=f"Comma-separated exporter configurations ({', '.join(CONFIGS)})")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per load step")
+    parser.add_argument("--interval", type=float, default=0.0,
+                        help="Scrape interval per scraper in seconds (0: back to back)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Scrape timeout in seconds")
+    parser.add_argument("--snapshot-ttl", type=float, default=5.0, help="--web.snapshot-ttl of cached configs")
+    parser.add_argument("--keys", type=int, default=1000, help="Virtual keys per target")
+    parser.add_argument("--check-keys", default="", help="--check-keys of the exporter, e.g. db0=key:1*")
+    parser.add_argument("--slo", type=float, default=1000.0, help="p99 latency in ms for the capacity summary")
+    parser.add_argument("--output", default="", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    options = {"check_keys": args.check_keys}
+    targets, redis_ports = _start_process(_serve_targets, args.targets, args.keys)
+    report = {
+        "targets": args.targets,
+        "duration": args.duration,
+        "interval": args.interval,
+        "keys": args.keys,
+        "check_keys": args.check_keys,
+        "configs": {},
+    }
+    try:
+        for name in args.configs:
+            print(f"{name}: {args.targets} targets")
+            print(f"{'scrapers':>9} {'scrapes/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} "
+                  f"{'cpu %':>7} {'rss MB':>7}")
+            steps = run_config(name, redis_ports, args.scrapers, args.duration, args.interval, args.timeout,
+                               args.snapshot_ttl, options)
+            for step in steps:
+                print(f"{step['scrapers']:>9} {step['throughput']:>10.1f} {step['p50_ms']:>9.2f} "
+                      f"{step['p99_ms']:>9.2f} {step['errors']:>7} {str(step['cpu_percent']):>7} "
+                      f"{str(step['rss_mb']):>7}")
+            best = capacity(steps, args.slo)
+            if best is None:
+                print(f"  no step within p99 <= {args.slo:.0f} ms")
+            else:
+                print(f"  capacity: {best['throughput']:.1f} scrapes/s with p99 <= {args.slo:.0f} ms "
+                      f"({best['scrapers']} scrapers)")
+            report["configs"][name] = {"steps": steps, "capacity": best and best["throughput"]}
+    finally:
+        targets.terminate()
+        targets.join()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
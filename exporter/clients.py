@@ -0,0 +1,258 @@
+"""Streaming CLIENT LIST analyzer"""
+
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import redis
+
+from .redis_client import decode_reply
+
+logger = logging.getLogger(__name__)
+
+# Label value for groups over the max_groups cap
+OTHER_GROUP = "other"
+
+# Aggregation dimensions: (metric label, CLIENT LIST field)
+CLIENT_LIST_DIMENSIONS = (
+    ("name", b"name"),
+    ("addr_prefix", b"addr"),
+    ("db", b"db"),
+    ("flags", b"flags"),
+    ("cmd", b"cmd"),
+)
+
+
+def iter_client_lines(reply: bytes) -> Iterator[bytes]:
+    """Iterate over lines of a raw CLIENT LIST reply without splitting it at once"""
+    start = 0
+    size = len(reply)
+    while start < size:
+        end = reply.find(b"\n", start)
+        if end == -1:
+            end = size
+        if end > start:
+            yield reply[start:end].rstrip(b"\r")
+        start = end + 1
+
+
+def client_field(line: bytes, field: bytes) -> bytes:
+    """
+    Get a field value from a CLIENT LIST line
+
+    Format: id=3 addr=127.0.0.1:5000 laddr=... fd=8 name=worker age=10 ...
+
+    Returns:
+        Raw value or b"" if the field is missing
+    """
+    if line.startswith(field + b"="):
+        start = len(field) + 1
+    else:
+        start = line.find(b" " + field + b"=")
+        if start == -1:
+            return b""
+        start += len(field) + 2
+    end = line.find(b" ", start)
+    return line[start:] if end == -1 else line[start:end]
+
+
+def addr_prefix(addr: bytes) -> bytes:
+    """Strip port from client address (10.0.0.1:5000 -> 10.0.0.1)"""
+    host, sep, _ = addr.rpartition(b":")
+    return host if sep else addr
+
+
+def _to_int(value: bytes) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+class ClientListStats:
+    """Aggregated CLIENT LIST snapshot"""
+
+    def __init__(self):
+        self.connections = 0
+        self.output_buffer_bytes = 0
+        self.query_buffer_bytes = 0
+        self.groups: Dict[str, Dict[bytes, int]] = {label: {} for label, _ in CLIENT_LIST_DIMENSIONS}
+        # Heaviest clients: (memory, name, ip, cmd), largest first
+        self.top_clients: List[Tuple[int, str, str, str]] = []
+        self.duration = 0.0
+        self.timestamp = 0.0
+
+
+def analyze_client_list(reply: bytes, top_k: int = 10) -> ClientListStats:
+    """
+    Aggregate a raw CLIENT LIST reply
+
+    Lines are scanned one at a time; only group counters, buffer totals
+    and a bounded heap of the top_k heaviest clients are kept.
+
+    Args:
+        reply: Raw CLIENT LIST reply
+        top_k: Number of heaviest clients to keep
+
+    Returns:
+        ClientListStats object
+    """
+    if isinstance(reply, str):
+        reply = reply.encode()
+
+    stats = ClientListStats()
+    heap: List[Tuple[int, bytes]] = []
+
+    for line in iter_client_lines(reply):
+        stats.connections += 1
+
+        for label, field in CLIENT_LIST_DIMENSIONS:
+            value = client_field(line, field)
+            if label == "addr_prefix":
+                value = addr_prefix(value)
+            groups = stats.groups[label]
+            groups[value] = groups.get(value, 0) + 1
+
+        omem = _to_int(client_field(line, b"omem"))
+        qbuf = _to_int(client_field(line, b"qbuf"))
+        stats.output_buffer_bytes += omem
+        stats.query_buffer_bytes += qbuf
+
+        if top_k <= 0:
+            continue
+        # tot-mem (Redis 6.0+) includes buffers and client struct
+        memory = _to_int(client_field(line, b"tot-mem")) or omem + qbuf
+        if len(heap) < top_k:
+            heapq.heappush(heap, (memory, line))
+        elif memory > heap[0][0]:
+            heapq.heapreplace(heap, (memory, line))
+
+    # Ports change on every reconnect, so clients are labeled by ip; heavy
+    # clients sharing name, ip and cmd are merged into one series
+    top: Dict[Tuple[str, str, str], int] = {}
+    for memory, line in heap:
+        key = (decode_reply(client_field(line, b"name")), decode_reply(addr_prefix(client_field(line, b"addr"))),
+               decode_reply(client_field(line, b"cmd")))
+        top[key] = top.get(key, 0) + memory
+    stats.top_clients = sorted(((memory, *key) for key, memory in top.items()), reverse=True)
+    return stats
+
+
+class ClientListCollector:
+    """
+    Exports aggregated CLIENT LIST on its own interval
+
+    CLIENT LIST is expensive with many connections, so it is fetched in a
+    background thread at most once per interval. Scrapes export the last
+    finished snapshot and never wait for a running refresh. The thread uses
+    its own single-connection client, so it never shares a pooled
+    connection with the scrape (key checks SELECT other databases on them).
+    """
+
+    def __init__(self, connect: Callable[[], redis.Redis], interval: float = 60.0,
+                 top_k: int = 10, max_groups: int = 50):
+        """
+        Args:
+            connect: Factory creating the dedicated CLIENT LIST client
+            interval: Min seconds between CLIENT LIST calls
+            top_k: Number of heaviest clients exported individually
+            max_groups: Max number of series per dimension, smaller
+                groups are exported as "other"
+        """
+        self.interval = interval
+        self.top_k = top_k
+        self.connect = connect
+        self.max_groups = max_groups
+
+        self.client: Optional[redis.Redis] = None
+        self.snapshot: Optional[ClientListStats] = None
+        self.errors = 0
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def refresh(self) -> None:
+        """Fetch and analyze CLIENT LIST synchronously"""
+        start_time = time.time()
+        try:
+            if self.client is None:
+                self.client = self.connect()
+            # Two-argument form returns the raw reply instead of a list of dicts
+            reply = self.client.execute_command("CLIENT", "LIST")
+            stats = analyze_client_list(reply, self.top_k)
+        except Exception as e:
+            logger.error(f"Error getting client list: {e}")
+            self.errors += 1
+            # Reconnected on next refresh
+            self.close()
+            return
+
+        stats.timestamp = time.time()
+        stats.duration = stats.timestamp - start_time
+        self.snapshot = stats
+
+    def _run_refresh(self) -> None:
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._worker = None
+
+    def close(self) -> None:
+        """Close the dedicated client (reconnected on next refresh)"""
+        client, self.client = self.client, None
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def maybe_refresh(self) -> None:
+        """Start a background refresh if the snapshot is older than interval"""
+        with self._lock:
+            now = time.time()
+            if self._worker is not None or now - self._last_refresh < self.interval:
+                return
+            self._last_refresh = now
+            self._worker = threading.Thread(target=self._run_refresh, name="client-list", daemon=True)
+            self._worker.start()
+
+    def _register_groups(self, collector: object, label: str, groups: Dict[bytes, int]) -> None:
+        ordered = sorted(groups.items(), key=lambda item: item[1], reverse=True)
+        for value, count in ordered[:self.max_groups]:
+            collector._register_metric(f"client_list_connections_by_{label}", float(count),
+                                       labels={label: decode_reply(value)})
+        other = sum(count for _, count in ordered[self.max_groups:])
+        if other:
+            collector._register_metric(f"client_list_connections_by_{label}", float(other),
+                                       labels={label: OTHER_GROUP})
+
+    def collect(self, collector: object) -> None:
+        """
+        Schedule a refresh if needed and register the last snapshot
+
+        Args:
+            collector: RedisExporter collector instance
+        """
+        self.maybe_refresh()
+
+        collector._register_metric("client_list_errors_total", float(self.errors), is_counter=True)
+
+        stats = self.snapshot
+        if stats is None:
+            return
+
+        collector._register_metric("client_list_connections", float(stats.connections))
+        collector._register_metric("client_list_output_buffer_bytes", float(stats.output_buffer_bytes))
+        collector._register_metric("client_list_query_buffer_bytes", float(stats.query_buffer_bytes))
+        collector._register_metric("client_list_duration_seconds", stats.duration)
+        collector._register_metric("client_list_timestamp_seconds", stats.timestamp)
+
+        for label, _ in CLIENT_LIST_DIMENSIONS:
+            self._register_groups(collector, label, stats.groups[label])
+
+        for memory, name, ip, cmd in stats.top_clients:
+            collector._register_metric("client_list_top_memory_bytes", float(memory),
+                                       labels={"name": name, "ip": ip, "cmd": cmd})
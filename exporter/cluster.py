@@ -0,0 +1,410 @@
+"""Redis Cluster topology discovery and per-node scraping"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import redis
+
+from .info import fetch_info
+from .redis_client import decode_reply, pairs_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Node flags that mean the node can't be scraped
+_SKIP_NODE_FLAGS = {"fail", "noaddr", "handshake"}
+
+
+# Number of hash slots in Redis Cluster
+CLUSTER_SLOTS = 16384
+
+
+def _make_crc16_table() -> List[int]:
+    """CRC16-CCITT (XMODEM) lookup table used by Redis Cluster"""
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_CRC16_TABLE = _make_crc16_table()
+
+
+def crc16(data: bytes) -> int:
+    """Compute CRC16 (XMODEM) of data"""
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC16_TABLE[((crc >> 8) ^ byte) & 0xFF]
+    return crc
+
+
+def key_hash_slot(key) -> int:
+    """
+    Get cluster hash slot of key
+
+    Only the part inside the first non-empty {hash tag} is hashed,
+    so "{user:1}:name" and "{user:1}:email" map to the same slot.
+    """
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+
+    start = key.find(b"{")
+    if start > -1:
+        end = key.find(b"}", start + 1)
+        if end > start + 1:
+            key = key[start + 1:end]
+
+    return crc16(key) % CLUSTER_SLOTS
+
+
+class ClusterNode:
+    """Cluster node address with its shard and role"""
+    def __init__(self, node_id: str, host: str, port: int, role: str, shard: str,
+                 slots: Optional[List[Tuple[int, int]]] = None):
+        self.node_id = node_id
+        self.host = host
+        self.port = port
+        self.role = role
+        self.shard = shard
+        self.slots = slots or []
+
+    @property
+    def addr(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def labels(self) -> Dict[str, str]:
+        """Labels attached to every metric scraped from this node"""
+        return {"addr": self.addr, "shard": self.shard, "role": self.role}
+
+    def __repr__(self) -> str:
+        return f"ClusterNode({self.addr}, role={self.role}, shard={self.shard})"
+
+
+def format_slot_ranges(ranges: List[Tuple[int, int]]) -> str:
+    """
+    Format slot ranges as shard label
+
+    Slot ranges survive failovers, so they identify a shard better than
+    the address or node ID of its current primary.
+
+    Format: "0-5460" or "0-100,200-300"
+    """
+    if not ranges:
+        return "none"
+    return ",".join(f"{start}-{end}" for start, end in sorted(ranges))
+
+
+def parse_cluster_shards(reply: object) -> List[ClusterNode]:
+    """
+    Parse CLUSTER SHARDS reply (Redis 7.0+)
+
+    Returns:
+        List of ClusterNode objects (unhealthy nodes are skipped)
+    """
+    nodes = []
+    for shard_reply in reply or []:
+        shard = pairs_to_dict(shard_reply)
+
+        slots = [int(s) for s in shard.get("slots", [])]
+        ranges = [(slots[i], slots[i + 1]) for i in range(0, len(slots) - 1, 2)]
+        shard_label = format_slot_ranges(ranges)
+
+        for node_reply in shard.get("nodes", []):
+            node = pairs_to_dict(node_reply)
+            if decode_reply(node.get("health", "online")) != "online":
+                continue
+
+            host = decode_reply(node.get("ip") or node.get("endpoint") or "")
+            port = node.get("port") or node.get("tls-port")
+            if not host or not port:
+                continue
+
+            role = "master" if decode_reply(node.get("role", "")) == "master" else "slave"
+            nodes.append(ClusterNode(decode_reply(node.get("id", "")), host, int(port), role,
+                                     shard_label, ranges))
+
+    return nodes
+
+
+def parse_cluster_nodes(reply: object) -> List[ClusterNode]:
+    """
+    Parse CLUSTER NODES reply (fallback for Redis < 7.0)
+
+    Format: <id> <ip:port@cport> <flags> <master> <ping> <pong> <epoch> <link> <slot> ...
+
+    Returns:
+        List of ClusterNode objects (failed nodes are skipped)
+    """
+    text = decode_reply(reply)
+
+    entries = []
+    ranges_by_master: Dict[str, List[Tuple[int, int]]] = {}
+
+    for line in text.split("\n"):
+        parts = line.strip().split(" ")
+        if len(parts) < 8:
+            continue
+
+        node_id, address, flags_str, master_id = parts[0], parts[1], parts[2], parts[3]
+        flags = set(flags_str.split(","))
+
+        if "master" in flags:
+            ranges = []
+            for slot in parts[8:]:
+                # Skip migrating/importing markers: [slot->-node]
+                if slot.startswith("["):
+                    continue
+                if "-" in slot:
+                    start, end = slot.split("-", 1)
+                    ranges.append((int(start), int(end)))
+                else:
+                    ranges.append((int(slot), int(slot)))
+            ranges_by_master[node_id] = ranges
+
+        if flags & _SKIP_NODE_FLAGS:
+            continue
+
+        # Address format: ip:port@cport[,hostname]
+        host_port = address.split("@", 1)[0]
+        if ":" not in host_port:
+            continue
+        host, port = host_port.rsplit(":", 1)
+        if not host or not port.isdigit() or port == "0":
+            continue
+
+        role = "master" if "master" in flags else "slave"
+        entries.append((node_id, host, int(port), role, master_id))
+
+    nodes = []
+    for node_id, host, port, role, master_id in entries:
+        shard_owner = node_id if role == "master" else master_id
+        ranges = ranges_by_master.get(shard_owner, [])
+        nodes.append(ClusterNode(node_id, host, port, role, format_slot_ranges(ranges), ranges))
+
+    return nodes
+
+
+def is_topology_error(exc: BaseException) -> bool:
+    """Check if error means the cached topology is outdated"""
+    if isinstance(exc, (redis.exceptions.MovedError, redis.exceptions.AskError,
+                        redis.exceptions.ClusterDownError, redis.exceptions.ConnectionError)):
+        return True
+    return isinstance(exc, redis.exceptions.ResponseError) and str(exc).startswith(("MOVED", "ASK"))
+
+
+class ClusterTopology:
+    """
+    Cached Redis Cluster topology with a pooled client per node
+
+    The topology is read with CLUSTER SHARDS (falling back to CLUSTER NODES)
+    and refreshed on a timer or after an error that indicates slots moved.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[str], redis.Redis],
+        refresh_interval: float = 60.0,
+        max_workers: int = 16,
+    ):
+        """
+        Args:
+            connect: Factory creating a client for "host:port"
+            refresh_interval: Seconds between topology refreshes
+            max_workers: Max number of nodes scraped concurrently
+        """
+        self.connect = connect
+        self.refresh_interval = refresh_interval
+        self.max_workers = max(1, max_workers)
+
+        self._nodes: List[ClusterNode] = []
+        self._slot_owners: List[Optional[ClusterNode]] = [None] * CLUSTER_SLOTS
+        self._clients: Dict[str, redis.Redis] = {}
+        self._refreshed_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def mark_stale(self) -> None:
+        """Force topology refresh before the next use"""
+        self._stale = True
+
+    def handle_error(self, exc: BaseException) -> None:
+        """Mark topology stale if error was caused by a topology change"""
+        if is_topology_error(exc):
+            logger.info(f"Cluster topology changed ({exc}), scheduling refresh")
+            self.mark_stale()
+
+    def needs_refresh(self) -> bool:
+        if self._stale or not self._nodes:
+            return True
+        return time.monotonic() - self._refreshed_at >= self.refresh_interval
+
+    def nodes(self, seed_client: Optional[redis.Redis] = None) -> List[ClusterNode]:
+        """
+        Get cluster nodes, refreshing the cached topology if needed
+
+        Args:
+            seed_client: Client used for discovery (falls back to known nodes)
+        """
+        if self.needs_refresh():
+            self.refresh(seed_client)
+        return self._nodes
+
+    def primaries(self, seed_client: Optional[redis.Redis] = None) -> List[ClusterNode]:
+        """Get primary nodes only"""
+        return [n for n in self.nodes(seed_client) if n.role == "master"]
+
+    def node_for_slot(self, slot: int) -> Optional[ClusterNode]:
+        """Get primary node owning slot from the cached slot map"""
+        return self._slot_owners[slot]
+
+    def node_for_key(self, key) -> Optional[ClusterNode]:
+        """Get primary node owning key from the cached slot map"""
+        return self._slot_owners[key_hash_slot(key)]
+
+    def refresh(self, seed_client: Optional[redis.Redis] = None) -> None:
+        """Reload topology from the seed client or any known node"""
+        candidates = []
+        if seed_client is not None:
+            candidates.append(seed_client)
+        candidates.extend(self._clients.values())
+
+        last_error: Optional[Exception] = None
+        for client in candidates:
+            try:
+                nodes = self._discover(client)
+            except Exception as e:
+                logger.warning(f"Cluster discovery failed: {e}")
+                last_error = e
+                continue
+            if nodes:
+                self._set_nodes(nodes)
+                return
+
+        if last_error is not None:
+            raise last_error
+        raise redis.exceptions.ConnectionError("No cluster nodes available for discovery")
+
+    def _discover(self, client: redis.Redis) -> List[ClusterNode]:
+        try:
+            return parse_cluster_shards(client.execute_command("CLUSTER", "SHARDS"))
+        except redis.exceptions.ResponseError as e:
+            # Unknown subcommand on Redis < 7.0
+            logger.debug(f"CLUSTER SHARDS not supported, falling back to CLUSTER NODES: {e}")
+        return parse_cluster_nodes(client.execute_command("CLUSTER", "NODES"))
+
+    def _set_nodes(self, nodes: List[ClusterNode]) -> None:
+        with self._lock:
+            addrs = {n.addr for n in nodes}
+            for addr in list(self._clients):
+                if addr not in addrs:
+                    client = self._clients.pop(addr)
+                    try:
+                        client.close()
+                    except Exception:
+                        pass
+            slot_owners: List[Optional[ClusterNode]] = [None] * CLUSTER_SLOTS
+            for node in nodes:
+                if node.role != "master":
+                    continue
+                for start, end in node.slots:
+                    slot_owners[start:end + 1] = [node] * (end - start + 1)
+            self._nodes = nodes
+            self._slot_owners = slot_owners
+            self._refreshed_at = time.monotonic()
+            self._stale = False
+        logger.debug(f"Cluster topology refreshed: {len(nodes)} nodes")
+
+    def client_for(self, node: ClusterNode) -> redis.Redis:
+        """Get cached client for node, connecting if needed"""
+        client = self._clients.get(node.addr)
+        if client is None:
+            client = self.connect(node.addr)
+            with self._lock:
+                self._clients[node.addr] = client
+        return client
+
+    def run_on_nodes(self, nodes: List[ClusterNode],
+                     func: Callable[[ClusterNode, redis.Redis], object]
+                     ) -> List[Tuple[ClusterNode, object, Optional[Exception]]]:
+        """
+        Run func(node, client) against every node concurrently
+
+        Returns:
+            List of (node, result, error) tuples in the order of nodes
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="redis-cluster")
+
+        def run(node: ClusterNode):
+            try:
+                return node, func(node, self.client_for(node)), None
+            except Exception as e:
+                self.handle_error(e)
+                # Drop the client so the next scrape reconnects
+                with self._lock:
+                    client = self._clients.pop(node.addr, None)
+                if client is not None:
+                    try:
+                        client.close()
+                    except Exception:
+                        pass
+                return node, None, e
+
+        return list(self._executor.map(run, nodes))
+
+    def fetch_info(self, seed_client: Optional[redis.Redis] = None, sections: Tuple[str, ...] = ()
+                   ) -> List[Tuple[ClusterNode, Optional[str], Optional[Exception]]]:
+        """
+        Fetch default INFO plus extra sections from every node concurrently
+        
+        Extra sections are pipelined as separate INFO calls, so nodes of any
+        version (also mixed during upgrades) answer them.
+        """
+        return self.run_on_nodes(self.nodes(seed_client),
+                                 lambda node, client: fetch_info(client, sections))
+
+    def close(self) -> None:
+        """Close node clients and worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        with self._lock:
+            for client in self._clients.values():
+                try:
+                    client.close()
+                except Exception:
+                    pass
+            self._clients = {}
+
+
+class NodeLabeledCollector:
+    """Collector proxy adding node labels to every registered metric"""
+
+    def __init__(self, collector: object, node_labels: Dict[str, str]):
+        self.collector = collector
+        self.node_labels = node_labels
+
+    def _create_metric_descr(self, metric_name: str, labels: Optional[list] = None):
+        self.collector._create_metric_descr(metric_name, labels=(labels or []) + list(self.node_labels))
+
+    def metric_allowed(self, metric_name: str) -> bool:
+        return self.collector.metric_allowed(metric_name)
+
+    def _register_metric(self, metric_name: str, value: float,
+                        is_counter: bool = False, labels: Optional[dict] = None):
+        merged = dict(labels) if labels else {}
+        merged.update(self.node_labels)
+        self.collector._register_metric(metric_name, value, is_counter=is_counter, labels=merged)
+
+    def _register_histogram(self, metric_name: str, buckets: List[Tuple[float, float]],
+                            sum_value: float, labels: Optional[dict] = None):
+        merged = dict(labels) if labels else {}
+        merged.update(self.node_labels)
+        self.collector._register_histogram(metric_name, buckets, sum_value, labels=merged)
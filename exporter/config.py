@@ -17,6 +17,17 @@ def get_env_bool(key: str, default: bool = False) -> bool:
     return val.lower() in ("true", "1", "yes", "on")
 
 
+def get_env_int(key: str, default: int = 0) -> int:
+    """Get integer environment variable"""
+    val = os.getenv(key)
+    if val is None:
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        return default
+
+
 def get_env_float(key: str, default: float = 0.0) -> float:
     """Get float environment variable"""
     val = os.getenv(key)
@@ -43,13 +54,68 @@ class Options:
     # Key checking
     check_keys: str = ""
     check_single_keys: str = ""
+    check_single_keys_tracking: bool = False
     
     # Connection settings
     connection_timeout: float = 15.0
     set_client_name: bool = True
     
+    # Cluster
+    is_cluster: bool = False
+    cluster_refresh_interval: float = 60.0
+    cluster_max_workers: int = 16
+    
+    # INFO keysizes
+    export_keysizes: bool = False
+    
+    # Keyspace notifications
+    export_keyspace_events: bool = False
+    keyspace_events_dbs: str = "0"
+    keyspace_events_max_prefixes: int = 100
+    
+    # Slowlog
+    export_slowlog: bool = False
+    slowlog_max_commands: int = 50
+    
+    # Latency
+    export_latency_histograms: bool = False
+    export_latency_events: bool = False
+    
+    # Client list
+    export_client_list: bool = False
+    client_list_interval: float = 60.0
+    client_list_top_k: int = 10
+    
+    # MEMORY STATS
+    export_memory_stats: bool = False
+    memory_stats_interval: float = 60.0
+    
+    # Lua scripts
+    script: str = ""
+    script_interval: float = 0.0
+    script_timeout: float = 0.0
+    
+    # CONFIG GET
+    config_patterns: str = ""
+    config_ttl: float = 300.0
+    config_command: str = "CONFIG"
+    
+    # Commandstats/errorstats cardinality
+    export_commandstats: bool = False
+    commandstats_top_n: int = 0
+    commandstats_top_by: str = "calls"
+    commandstats_allow: str = ""
+    errorstats_top_n: int = 0
+    errorstats_allow: str = ""
+    
+    # Metric filtering
+    include_metrics: str = ""
+    exclude_metrics: str = ""
+    
     # HTTP server
     web_listen_address: str = ":9121"
+    web_snapshot_ttl: float = 0.0
+    web_protobuf_classic_histograms: bool = False
     
     @classmethod
     def from_env(cls) -> "Options":
@@ -61,9 +127,42 @@ class Options:
             namespace=get_env("REDIS_EXPORTER_NAMESPACE", "redis"),
             check_keys=get_env("REDIS_EXPORTER_CHECK_KEYS", ""),
             check_single_keys=get_env("REDIS_EXPORTER_CHECK_SINGLE_KEYS", ""),
+            check_single_keys_tracking=get_env_bool("REDIS_EXPORTER_CHECK_SINGLE_KEYS_TRACKING", False),
             connection_timeout=get_env_float("REDIS_EXPORTER_CONNECTION_TIMEOUT", 15.0),
             set_client_name=get_env_bool("REDIS_EXPORTER_SET_CLIENT_NAME", True),
+            is_cluster=get_env_bool("REDIS_EXPORTER_IS_CLUSTER", False),
+            cluster_refresh_interval=get_env_float("REDIS_EXPORTER_CLUSTER_REFRESH_INTERVAL", 60.0),
+            cluster_max_workers=get_env_int("REDIS_EXPORTER_CLUSTER_MAX_WORKERS", 16),
+            export_keysizes=get_env_bool("REDIS_EXPORTER_EXPORT_KEYSIZES", False),
+            export_keyspace_events=get_env_bool("REDIS_EXPORTER_EXPORT_KEYSPACE_EVENTS", False),
+            keyspace_events_dbs=get_env("REDIS_EXPORTER_KEYSPACE_EVENTS_DBS", "0"),
+            keyspace_events_max_prefixes=get_env_int("REDIS_EXPORTER_KEYSPACE_EVENTS_MAX_PREFIXES", 100),
+            export_slowlog=get_env_bool("REDIS_EXPORTER_EXPORT_SLOWLOG", False),
+            slowlog_max_commands=get_env_int("REDIS_EXPORTER_SLOWLOG_MAX_COMMANDS", 50),
+            export_latency_histograms=get_env_bool("REDIS_EXPORTER_EXPORT_LATENCY_HISTOGRAMS", False),
+            export_latency_events=get_env_bool("REDIS_EXPORTER_EXPORT_LATENCY_EVENTS", False),
+            export_client_list=get_env_bool("REDIS_EXPORTER_EXPORT_CLIENT_LIST", False),
+            client_list_interval=get_env_float("REDIS_EXPORTER_CLIENT_LIST_INTERVAL", 60.0),
+            client_list_top_k=get_env_int("REDIS_EXPORTER_CLIENT_LIST_TOP_K", 10),
+            export_memory_stats=get_env_bool("REDIS_EXPORTER_EXPORT_MEMORY_STATS", False),
+            memory_stats_interval=get_env_float("REDIS_EXPORTER_MEMORY_STATS_INTERVAL", 60.0),
+            script=get_env("REDIS_EXPORTER_SCRIPT", ""),
+            script_interval=get_env_float("REDIS_EXPORTER_SCRIPT_INTERVAL", 0.0),
+            script_timeout=get_env_float("REDIS_EXPORTER_SCRIPT_TIMEOUT", 0.0),
+            config_patterns=get_env("REDIS_EXPORTER_CONFIG_PATTERNS", ""),
+            config_ttl=get_env_float("REDIS_EXPORTER_CONFIG_TTL", 300.0),
+            config_command=get_env("REDIS_EXPORTER_CONFIG_COMMAND", "CONFIG"),
+            export_commandstats=get_env_bool("REDIS_EXPORTER_EXPORT_COMMANDSTATS", False),
+            commandstats_top_n=get_env_int("REDIS_EXPORTER_COMMANDSTATS_TOP_N", 0),
+            commandstats_top_by=get_env("REDIS_EXPORTER_COMMANDSTATS_TOP_BY", "calls"),
+            commandstats_allow=get_env("REDIS_EXPORTER_COMMANDSTATS_ALLOW", ""),
+            errorstats_top_n=get_env_int("REDIS_EXPORTER_ERRORSTATS_TOP_N", 0),
+            errorstats_allow=get_env("REDIS_EXPORTER_ERRORSTATS_ALLOW", ""),
+            include_metrics=get_env("REDIS_EXPORTER_INCLUDE_METRICS", ""),
+            exclude_metrics=get_env("REDIS_EXPORTER_EXCLUDE_METRICS", ""),
             web_listen_address=get_env("REDIS_EXPORTER_WEB_LISTEN_ADDRESS", ":9121"),
+            web_snapshot_ttl=get_env_float("REDIS_EXPORTER_WEB_SNAPSHOT_TTL", 0.0),
+            web_protobuf_classic_histograms=get_env_bool("REDIS_EXPORTER_WEB_PROTOBUF_CLASSIC_HISTOGRAMS", False),
         )
     
     def merge_cli_args(self, **kwargs) -> None:
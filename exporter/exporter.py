@@ -2,18 +2,42 @@
 
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import redis
-from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
 
+from .clients import ClientListCollector
+from .cluster import ClusterTopology, NodeLabeledCollector
 from .config import Options
-from .info import extract_info_metrics
-from .keys import extract_check_key_metrics
-from .redis_client import connect_to_redis
+from .info import extract_info_metrics, fetch_info, supports_multi_section_info
+from .latency import LatencyEventCollector, LatencyHistogramCollector
+from .memory import MemoryStatsCollector
+from .keyspace_events import KeyspaceEventListener, parse_keyspace_dbs
+from .keys import extract_check_key_metrics, extract_cluster_check_key_metrics
+from .metrics import MetricFilter, TopNSelector, parse_metric_patterns, parse_name_list
+from .redis_client import RedisTraffic, connect_to_redis
+from .redis_config import ConfigCollector, parse_config_patterns
+from .slowlog import SlowlogCollector
+from .timing import ScrapeTimings
+from .tracking import KeyTrackingCache
+from .scripts import ScriptCollector, parse_script_arg
+from .sentinel import (
+    SentinelResolver,
+    extract_sentinel_metrics,
+    is_sentinel_addr,
+    parse_sentinel_addr,
+)
 
 logger = logging.getLogger(__name__)
 
+# Sub-collectors that can be selected per scrape (/metrics?collect[]=info&collect[]=keys)
+SUB_COLLECTORS = (
+    "info", "keys", "slowlog", "latency", "clients", "memory", "keyspace_events", "scripts", "config",
+    "sentinel",
+)
+
 
 class RedisCollector:
     """Prometheus collector for Redis metrics"""
@@ -68,27 +92,310 @@ class RedisCollector:
             "keyspace_misses": "keyspace_misses_total",
         }
         
+        # Metric allow/deny list, INFO fields of dropped metrics are not even parsed
+        self.metric_filter: Optional[MetricFilter] = None
+        if options.include_metrics or options.exclude_metrics:
+            self.metric_filter = MetricFilter(
+                options.namespace,
+                include=parse_metric_patterns(options.include_metrics),
+                exclude=parse_metric_patterns(options.exclude_metrics),
+            )
+            self.metric_map_gauges = {
+                k: v for k, v in self.metric_map_gauges.items() if self.metric_filter.allows(v)
+            }
+            self.metric_map_counters = {
+                k: v for k, v in self.metric_map_counters.items() if self.metric_filter.allows(v)
+            }
+        
+        # Commandstats/errorstats cardinality limits (per node in cluster mode)
+        self._command_selectors: Dict[str, TopNSelector] = {}
+        self._error_selectors: Dict[str, TopNSelector] = {}
+        
         # Storage for metrics in current collection
         self._current_metrics: Dict[str, List[Dict[str, Any]]] = {}
+        self._current_histograms: Dict[str, List[Dict[str, Any]]] = {}
+        
+        # Interned samples reused across scrapes: {metric_name: {label values: sample}}
+        # A scrape updates values in place instead of allocating new samples
+        self._metric_slots: Dict[str, Dict[Tuple[str, ...], Dict[str, Any]]] = {}
+        self._histogram_slots: Dict[str, Dict[Tuple[str, ...], Dict[str, Any]]] = {}
+        self._generation = 0
+        
+        # Scrape phase durations and Redis traffic of scrape clients
+        self.timings = ScrapeTimings()
+        self.traffic = RedisTraffic()
+        
+        # INFO sections requested in addition to the default ones (errorstats is one of them);
+        # commandstats is opt-in, it has a series per command (latency histograms take their sums from it)
+        extra_sections = []
+        wants_commandstats = (options.export_commandstats or options.commandstats_top_n > 0
+                              or bool(options.commandstats_allow) or options.export_latency_histograms)
+        if wants_commandstats and any(self.metric_allowed(name) for name in (
+                "commands_total", "commands_duration_seconds_total",
+                "commands_rejected_calls_total", "commands_failed_calls_total")):
+            extra_sections.append("commandstats")
+        if options.export_keysizes:
+            extra_sections.append("keysizes")
+        self.info_sections: Tuple[str, ...] = tuple(extra_sections)
+        # Learned from redis_version, until then sections are pipelined as separate calls
+        self._multi_section_info = False
+        
+        # Optional collectors keeping state between scrapes
+        self.slowlog: Optional[SlowlogCollector] = None
+        if options.export_slowlog:
+            self.slowlog = SlowlogCollector(max_commands=options.slowlog_max_commands)
+        self.latency_histograms: Optional[LatencyHistogramCollector] = None
+        if options.export_latency_histograms:
+            self.latency_histograms = LatencyHistogramCollector()
+        self.latency_events: Optional[LatencyEventCollector] = None
+        if options.export_latency_events:
+            self.latency_events = LatencyEventCollector()
+        self.client_list: Optional[ClientListCollector] = None
+        if options.export_client_list:
+            self.client_list = ClientListCollector(
+                self._connect_client_list,
+                interval=options.client_list_interval,
+                top_k=options.client_list_top_k,
+            )
+        self.memory_stats: Optional[MemoryStatsCollector] = None
+        if options.export_memory_stats:
+            self.memory_stats = MemoryStatsCollector(interval=options.memory_stats_interval)
+        self.config: Optional[ConfigCollector] = None
+        if options.config_patterns:
+            self.config = ConfigCollector(
+                parse_config_patterns(options.config_patterns),
+                ttl=options.config_ttl,
+                command=options.config_command,
+            )
+        
+        # Lua scripts are read at startup, missing files fail fast
+        self.scripts: Optional[ScriptCollector] = None
+        if options.script:
+            self.scripts = ScriptCollector(
+                parse_script_arg(options.script, options.script_interval, options.script_timeout or None),
+                self._connect_script,
+            )
+        
+        # Client-side cache of single keys (standalone only)
+        self.key_tracking: Optional[KeyTrackingCache] = None
+        if options.check_single_keys_tracking and not options.is_cluster:
+            self.key_tracking = KeyTrackingCache(self._connect_tracking)
+        
+        # Keyspace notification listener (standalone only)
+        self.keyspace_events: Optional[KeyspaceEventListener] = None
+        if options.export_keyspace_events and not options.is_cluster:
+            self.keyspace_events = KeyspaceEventListener(
+                self._connect_pubsub,
+                parse_keyspace_dbs(options.keyspace_events_dbs),
+                max_prefixes=options.keyspace_events_max_prefixes,
+            )
+        
+        # Cluster topology (cluster mode only)
+        self.cluster: Optional[ClusterTopology] = None
+        if options.is_cluster:
+            self.cluster = ClusterTopology(
+                self._connect_node,
+                refresh_interval=options.cluster_refresh_interval,
+                max_workers=options.cluster_max_workers,
+            )
+        
+        # Sentinel resolver (redis+sentinel:// addresses only)
+        self.sentinel: Optional[SentinelResolver] = None
+        self._client_addr = redis_addr
+        if is_sentinel_addr(redis_addr):
+            self.sentinel = SentinelResolver(parse_sentinel_addr(redis_addr), self._connect_sentinel)
+    
+    def _target_addr(self) -> str:
+        """Get address to scrape, resolving it through Sentinel if configured"""
+        if self.sentinel is None:
+            return self.redis_addr
+        self.sentinel.start()
+        host, port = self.sentinel.resolve()
+        scheme = "rediss" if self.sentinel.target.tls else "redis"
+        return f"{scheme}://{host}:{port}"
     
     def _connect(self) -> redis.Redis:
         """Connect to Redis"""
+        target_addr = self._target_addr()
+        
+        # Sentinel switched to another instance
+        if self.client is not None and target_addr != self._client_addr:
+            logger.info(f"Target changed from {self._client_addr} to {target_addr}, reconnecting")
+            try:
+                self.client.close()
+            except Exception:
+                pass
+            self.client = None
+            if self.key_tracking is not None:
+                self.key_tracking.close()
+            if self.keyspace_events is not None:
+                # Restarted against the new target on next collect
+                self.keyspace_events.stop()
+            if self.client_list is not None:
+                self.client_list.close()
+        
         if self.client is not None:
             try:
                 self.client.ping()
                 return self.client
             except:
-                pass
+                if self.sentinel is not None:
+                    # Failover event could have been missed, ask Sentinel again
+                    self.sentinel.invalidate()
+                    target_addr = self._target_addr()
         
+        self._client_addr = target_addr
         self.client = connect_to_redis(
-            self.redis_addr,
+            target_addr,
             password=self.options.password,
             user=self.options.user,
             connection_timeout=self.options.connection_timeout,
             set_client_name=self.options.set_client_name,
+            traffic=self.traffic,
         )
         return self.client
     
+    def _connect_tracking(self, on_connect) -> redis.Redis:
+        """Connect a single-connection RESP3 client for CLIENT TRACKING"""
+        return connect_to_redis(
+            self._client_addr,
+            password=self.options.password,
+            user=self.options.user,
+            connection_timeout=self.options.connection_timeout,
+            set_client_name=self.options.set_client_name,
+            protocol=3,
+            max_connections=1,
+            redis_connect_func=on_connect,
+        )
+    
+    def _connect_client_list(self) -> redis.Redis:
+        """Connect a single-connection client for the background CLIENT LIST refresh"""
+        return connect_to_redis(
+            self._client_addr,
+            password=self.options.password,
+            user=self.options.user,
+            connection_timeout=self.options.connection_timeout,
+            set_client_name=self.options.set_client_name,
+            max_connections=1,
+        )
+    
+    def _connect_pubsub(self) -> redis.Redis:
+        """Connect a client for the keyspace events listener"""
+        return connect_to_redis(
+            self._client_addr,
+            password=self.options.password,
+            user=self.options.user,
+            connection_timeout=self.options.connection_timeout,
+            set_client_name=self.options.set_client_name,
+        )
+    
+    def _connect_script(self, timeout: float) -> redis.Redis:
+        """Connect a client for Lua scripts with their own timeout"""
+        return connect_to_redis(
+            self._client_addr,
+            password=self.options.password,
+            user=self.options.user,
+            connection_timeout=timeout,
+            set_client_name=self.options.set_client_name,
+        )
+    
+    def _connect_node(self, node_addr: str) -> redis.Redis:
+        """Connect to a cluster node, reusing scheme and credentials of redis_addr"""
+        scheme = "rediss" if self.redis_addr.startswith("rediss://") else "redis"
+        return connect_to_redis(
+            f"{scheme}://{node_addr}",
+            password=self.options.password,
+            user=self.options.user,
+            connection_timeout=self.options.connection_timeout,
+            set_client_name=self.options.set_client_name,
+            traffic=self.traffic,
+        )
+    
+    def _connect_sentinel(self, host: str, port: int) -> redis.Redis:
+        """Connect to a sentinel using credentials from the sentinel address"""
+        return connect_to_redis(
+            f"redis://{host}:{port}",
+            password=self.sentinel.target.password,
+            user=self.sentinel.target.user,
+            connection_timeout=self.options.connection_timeout,
+            set_client_name=self.options.set_client_name,
+        )
+    
+    def _collect_sentinel(self) -> None:
+        """Export Sentinel view of monitored masters"""
+        try:
+            masters = self.sentinel.sentinel_client().execute_command("SENTINEL", "MASTERS")
+        except Exception as e:
+            logger.error(f"Error getting sentinel masters: {e}")
+            return
+        
+        extract_sentinel_metrics(masters, self)
+        self._register_metric("sentinel_switch_master_events_total",
+                              float(self.sentinel.switch_master_events), is_counter=True)
+    
+    def _selectors(self, node: str = "") -> Tuple[Optional[TopNSelector], Optional[TopNSelector]]:
+        """Command and error selectors of a node (None if not limited)"""
+        options = self.options
+        command_selector = None
+        if options.commandstats_top_n > 0 or options.commandstats_allow:
+            if node not in self._command_selectors:
+                self._command_selectors[node] = TopNSelector(
+                    options.commandstats_top_n, parse_name_list(options.commandstats_allow) or None,
+                )
+            command_selector = self._command_selectors[node]
+        error_selector = None
+        if options.errorstats_top_n > 0 or options.errorstats_allow:
+            if node not in self._error_selectors:
+                self._error_selectors[node] = TopNSelector(
+                    options.errorstats_top_n, parse_name_list(options.errorstats_allow) or None,
+                )
+            error_selector = self._error_selectors[node]
+        return command_selector, error_selector
+    
+    def _extract_info_metrics(self, info_string: str, collector: object, node: str = "") -> None:
+        command_selector, error_selector = self._selectors(node)
+        extract_info_metrics(
+            info_string,
+            self.metric_map_gauges,
+            self.metric_map_counters,
+            collector,
+            command_selector=command_selector,
+            command_top_by=self.options.commandstats_top_by,
+            error_selector=error_selector,
+        )
+    
+    def _collect_cluster(self, client: redis.Redis) -> None:
+        """
+        Scrape INFO from every cluster node concurrently
+        
+        Failed nodes are reported as cluster_node_up 0; if no node answers,
+        the scrape fails (up 0).
+        """
+        with self.timings.time("info_roundtrip"):
+            results = self.cluster.fetch_info(client, self.info_sections)
+        self._register_metric("cluster_nodes_discovered", float(len(results)))
+        
+        last_error: Optional[Exception] = None
+        with self.timings.time("info_parse"):
+            for node, info_string, error in results:
+                node_collector = NodeLabeledCollector(self, node.labels())
+                if error is not None:
+                    logger.error(f"Error scraping cluster node {node.addr}: {error}")
+                    node_collector._register_metric("cluster_node_up", 0.0)
+                    last_error = error
+                    continue
+                
+                self._extract_info_metrics(info_string, node_collector, node.addr)
+                node_collector._register_metric("cluster_node_up", 1.0)
+        
+        if all(error is not None for _, _, error in results):
+            raise redis.exceptions.ConnectionError(
+                f"No cluster node answered INFO: {last_error or 'no nodes discovered'}")
+    
+    def observe_phase(self, phase: str, seconds: float) -> None:
+        """Account the duration of a scrape phase (see timing.SCRAPE_PHASES)"""
+        self.timings.observe(phase, seconds)
+    
     def collect(self):
         """
         Collect metrics from Redis
@@ -96,58 +403,96 @@ class RedisCollector:
         Yields:
             MetricFamily objects
         """
-        # Reset metrics
+        self.scrape()
+        yield from self._metric_families()
+    
+    def scrape(self, collect: Optional[Set[str]] = None) -> None:
+        """
+        Collect metrics from Redis into the accumulators (_current_metrics, _current_histograms)
+        
+        Args:
+            collect: Names of sub-collectors to run (see SUB_COLLECTORS), None runs all
+        """
+        def selected(name: str) -> bool:
+            return collect is None or name in collect
+        
+        # Reset metrics (interned samples are kept)
         self._current_metrics = {}
+        self._current_histograms = {}
+        self._generation += 1
         
         start_time = time.time()
         error_msg = ""
         
         try:
-            client = self._connect()
-            
-            # Get INFO
-            info_result = client.info()
-            
-            # Convert to string if needed
-            if isinstance(info_result, dict):
-                # redis-py returns dict when decode_responses=False
-                # Convert to string format
-                info_string = ""
-                for key, value in info_result.items():
-                    if isinstance(key, bytes):
-                        key = key.decode('utf-8')
-                    
-                    # Handle special case: db0 is a dict
-                    if key.startswith('db') and isinstance(value, dict):
-                        # Format as db0:keys=1,expires=0,avg_ttl=0
-                        value_parts = [f"{k}={v}" for k, v in value.items()]
-                        value = ",".join(value_parts)
-                    
-                    if isinstance(value, bytes):
-                        value = value.decode('utf-8')
-                    
-                    info_string += f"{key}:{value}\n"
-            elif isinstance(info_result, bytes):
-                info_string = info_result.decode('utf-8')
-            else:
-                info_string = info_result
-            
-            # Extract INFO metrics
-            extract_info_metrics(
-                info_string,
-                self.metric_map_gauges,
-                self.metric_map_counters,
-                self,
-            )
+            # Sentinel view (before connecting, so it's kept while the target is down)
+            if self.sentinel is not None and selected("sentinel"):
+                self._collect_sentinel()
+            
+            with self.timings.time("connect"):
+                client = self._connect()
+            
+            if self.cluster is not None:
+                if selected("info"):
+                    self._collect_cluster(client)
+            elif selected("info"):
+                # Get INFO
+                with self.timings.time("info_roundtrip"):
+                    info_string = fetch_info(client, self.info_sections, self._multi_section_info)
+                
+                # Extract INFO metrics
+                with self.timings.time("info_parse"):
+                    self._multi_section_info = supports_multi_section_info(info_string)
+                    self._extract_info_metrics(info_string, self)
             
             # Extract key metrics if configured
-            if self.options.check_keys or self.options.check_single_keys:
-                extract_check_key_metrics(
-                    client,
-                    self.options.check_keys,
-                    self.options.check_single_keys,
-                    self,
-                )
+            if (self.options.check_keys or self.options.check_single_keys) and selected("keys"):
+                if self.cluster is not None:
+                    extract_cluster_check_key_metrics(
+                        self.cluster,
+                        client,
+                        self.options.check_keys,
+                        self.options.check_single_keys,
+                        self,
+                    )
+                else:
+                    extract_check_key_metrics(
+                        client,
+                        self.options.check_keys,
+                        self.options.check_single_keys,
+                        self,
+                        key_cache=self.key_tracking,
+                    )
+                    if self.key_tracking is not None:
+                        self.key_tracking.collect(self)
+            
+            # Slow commands and latency (not supported in cluster mode)
+            if self.slowlog is not None and self.cluster is None and selected("slowlog"):
+                self.slowlog.collect(client, self)
+            if self.latency_histograms is not None and self.cluster is None and selected("latency"):
+                self.latency_histograms.collect(client, self)
+            if self.latency_events is not None and self.cluster is None and selected("latency"):
+                self.latency_events.collect(client, self)
+            
+            # Connected clients (refreshed in background on its own interval)
+            if self.client_list is not None and self.cluster is None and selected("clients"):
+                self.client_list.collect(self)
+            
+            # Memory breakdown (refreshed on memory_stats_interval)
+            if self.memory_stats is not None and self.cluster is None and selected("memory"):
+                self.memory_stats.collect(client, self)
+            
+            # Keyspace events (counted by background listener)
+            if self.keyspace_events is not None and selected("keyspace_events"):
+                self.keyspace_events.collect(self)
+            
+            # Lua scripts (each on its own interval)
+            if self.scripts is not None and self.cluster is None and selected("scripts"):
+                self.scripts.collect(client, self)
+            
+            # Configuration (cached for config_ttl)
+            if self.config is not None and self.cluster is None and selected("config"):
+                self.config.collect(client, self)
             
             # Mark as up
             self._register_metric("up", 1.0)
@@ -161,11 +506,57 @@ class RedisCollector:
         duration = time.time() - start_time
         self._register_metric("exporter_scrape_duration_seconds", duration)
         
+        # Phase durations (render of this scrape is accounted on the next one)
+        self.timings.collect(self)
+        self._register_metric("exporter_redis_commands_total", float(self.traffic.commands),
+                             is_counter=True)
+        self._register_metric("exporter_redis_read_bytes_total", float(self.traffic.read_bytes),
+                             is_counter=True)
+        
         # Record error
         self._register_metric("exporter_last_scrape_error", 1.0 if error_msg else 0.0,
                              labels={"error": error_msg if error_msg else ""})
         
-        # Yield all collected metrics
+        self._prune_slots()
+    
+    def _prune_slots(self) -> None:
+        """
+        Drop interned samples whose label sets were not registered by this scrape
+        
+        Families not registered at all (failed INFO, sub-collector skipped or
+        disabled) are dropped entirely and re-created when registered again.
+        """
+        for slots_by_name, current in ((self._metric_slots, self._current_metrics),
+                                       (self._histogram_slots, self._current_histograms)):
+            for metric_name in [name for name in slots_by_name if name not in current]:
+                del slots_by_name[metric_name]
+            for slots in slots_by_name.values():
+                stale = [key for key, sample in slots.items() if sample['generation'] != self._generation]
+                for key in stale:
+                    del slots[key]
+    
+    def _slot(self, slots_by_name: Dict[str, Dict[Tuple[str, ...], Dict[str, Any]]],
+              metric_name: str, labels: dict) -> Dict[str, Any]:
+        """
+        Get the interned sample for (metric_name, label values) for this scrape
+        
+        Label names of a family are fixed, so label values identify the sample. A label set
+        registered twice in one scrape gets a separate sample, as before interning.
+        """
+        slots = slots_by_name.get(metric_name)
+        if slots is None:
+            slots = slots_by_name[metric_name] = {}
+        key = tuple(labels.values())
+        slot = slots.get(key)
+        if slot is None:
+            slot = slots[key] = {'labels': labels}
+        elif slot['generation'] == self._generation:
+            return {'labels': labels, 'generation': self._generation}
+        slot['generation'] = self._generation
+        return slot
+    
+    def _metric_families(self):
+        """Build MetricFamily objects from the accumulators"""
         for metric_name, metrics_list in self._current_metrics.items():
             if not metrics_list:
                 continue
@@ -197,22 +588,69 @@ class RedisCollector:
                 family.add_metric(label_values, metric['value'])
             
             yield family
+        
+        for metric_name, histograms_list in self._current_histograms.items():
+            family = HistogramMetricFamily(
+                f"{self.options.namespace}_{metric_name}",
+                metric_name,
+                labels=list(histograms_list[0]['labels'].keys())
+            )
+            for histogram in histograms_list:
+                family.add_metric(
+                    list(histogram['labels'].values()),
+                    [(floatToGoString(le), count) for le, count in histogram['buckets']],
+                    histogram['sum'],
+                )
+            yield family
     
     def _create_metric_descr(self, metric_name: str, labels: Optional[list] = None):
         """Create metric description if not exists (for compatibility)"""
         pass
     
+    def metric_allowed(self, metric_name: str) -> bool:
+        """Check if a metric passes --include-metrics/--exclude-metrics"""
+        return self.metric_filter is None or self.metric_filter.allows(metric_name)
+    
     def _register_metric(self, metric_name: str, value: float, 
                         is_counter: bool = False, labels: Optional[dict] = None):
         """Register a metric value"""
+        if self.metric_filter is not None and not self.metric_filter.allows(metric_name):
+            return
+        
         if labels is None:
             labels = {}
         
+        sample = self._slot(self._metric_slots, metric_name, labels)
+        sample['value'] = value
+        sample['is_counter'] = is_counter
+        
         if metric_name not in self._current_metrics:
             self._current_metrics[metric_name] = []
         
-        self._current_metrics[metric_name].append({
-            'labels': labels,
-            'value': value,
-            'is_counter': is_counter
-        })
+        self._current_metrics[metric_name].append(sample)
+    
+    def _register_histogram(self, metric_name: str, buckets: List[Tuple[float, float]],
+                            sum_value: Optional[float], labels: Optional[dict] = None):
+        """
+        Register a histogram value
+        
+        Args:
+            metric_name: Metric name
+            buckets: List of (upper_bound, cumulative_count), ending with +Inf
+            sum_value: Sum of observed values (None if unknown, then _sum and _count are omitted)
+            labels: Labels dict
+        """
+        if self.metric_filter is not None and not self.metric_filter.allows(metric_name):
+            return
+        
+        if labels is None:
+            labels = {}
+        
+        sample = self._slot(self._histogram_slots, metric_name, labels)
+        sample['buckets'] = buckets
+        sample['sum'] = sum_value
+        
+        if metric_name not in self._current_histograms:
+            self._current_histograms[metric_name] = []
+        
+        self._current_histograms[metric_name].append(sample)
@@ -0,0 +1,116 @@
+"""Prometheus text and OpenMetrics rendering straight from the collector accumulators"""
+
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client.utils import floatToGoString
+
+# Label fragment cache is cleared once it grows over this size (churning label values)
+MAX_CACHED_LABEL_SETS = 100000
+
+
+def escape_label_value(value: str) -> str:
+    """Escape label value for the exposition formats"""
+    if "\\" in value or "\n" in value or '"' in value:
+        return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+    return value
+
+
+def format_labels(labels: Dict[str, str], le: Optional[str] = None) -> str:
+    """Format labels as {a="1",b="2"} sorted by name like prometheus_client, le is the bucket bound"""
+    items = list(labels.items())
+    if le is not None:
+        items.append(("le", le))
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in sorted(items)) + "}"
+
+
+class ExpositionRenderer:
+    """
+    Renders RedisCollector accumulators without building MetricFamily objects
+
+    Output matches prometheus_client's generate_latest for the same
+    metrics. HELP/TYPE header lines and formatted label sets are cached
+    across scrapes, so a render mostly formats values and joins strings.
+    """
+
+    def __init__(self, namespace: str):
+        """
+        Args:
+            namespace: Metric namespace (prefix)
+        """
+        self.namespace = namespace
+
+        # (metric_name, kind, openmetrics) -> header lines
+        self._headers: Dict[Tuple[str, str, bool], str] = {}
+        # (label items, le) -> formatted label set
+        self._labels: Dict[Tuple, str] = {}
+        self._buffer: List[str] = []
+
+    def _header(self, metric_name: str, kind: str, openmetrics: bool) -> str:
+        key = (metric_name, kind, openmetrics)
+        header = self._headers.get(key)
+        if header is None:
+            name = f"{self.namespace}_{metric_name}"
+            if kind == "counter" and openmetrics:
+                # OpenMetrics counter family names have no _total suffix
+                name = name[:-len("_total")]
+            header = f"# HELP {name} {metric_name}\n# TYPE {name} {kind}\n"
+            self._headers[key] = header
+        return header
+
+    def _label_set(self, labels: Dict[str, str], le: Optional[str] = None) -> str:
+        key = (tuple(labels.items()), le)
+        label_set = self._labels.get(key)
+        if label_set is None:
+            if len(self._labels) >= MAX_CACHED_LABEL_SETS:
+                self._labels.clear()
+            label_set = format_labels(labels, le)
+            self._labels[key] = label_set
+        return label_set
+
+    def render(self, collector: object, openmetrics: bool = False, eof: bool = True) -> bytes:
+        """
+        Render metrics of the last scrape
+
+        Args:
+            collector: RedisCollector whose accumulators are rendered
+            openmetrics: Render OpenMetrics instead of Prometheus text 0.0.4
+            eof: Append the OpenMetrics "# EOF" terminator
+
+        Returns:
+            Encoded exposition body
+        """
+        out = self._buffer
+        out.clear()
+        append = out.append
+        label_set = self._label_set
+        namespace = self.namespace
+
+        for metric_name, metrics_list in collector._current_metrics.items():
+            if not metrics_list:
+                continue
+            kind = "counter" if metric_name.endswith("_total") else "gauge"
+            append(self._header(metric_name, kind, openmetrics))
+            prefix = f"{namespace}_{metric_name}"
+            for metric in metrics_list:
+                labels = metric["labels"]
+                append(f"{prefix}{label_set(labels) if labels else ''} {floatToGoString(metric['value'])}\n")
+
+        for metric_name, histograms_list in collector._current_histograms.items():
+            append(self._header(metric_name, "histogram", openmetrics))
+            prefix = f"{namespace}_{metric_name}"
+            for histogram in histograms_list:
+                labels = histogram["labels"]
+                for le, count in histogram["buckets"]:
+                    append(f"{prefix}_bucket{label_set(labels, floatToGoString(le))} {floatToGoString(count)}\n")
+                if histogram["sum"] is not None:
+                    labels_text = label_set(labels) if labels else ""
+                    append(f"{prefix}_count{labels_text} {floatToGoString(histogram['buckets'][-1][1])}\n")
+                    append(f"{prefix}_sum{labels_text} {floatToGoString(histogram['sum'])}\n")
+
+        if openmetrics and eof:
+            append("# EOF\n")
+        body = "".join(out).encode("utf-8")
+        out.clear()
+        return body
@@ -0,0 +1,311 @@
+"""Asyncio HTTP server for /metrics with keep-alive and cached gzip"""
+
+import asyncio
+import gzip
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from prometheus_client import REGISTRY
+from prometheus_client.exposition import choose_encoder
+
+from .exporter import SUB_COLLECTORS
+from .exposition import ExpositionRenderer
+from .protobuf import CONTENT_TYPE_PROTOBUF, ProtobufRenderer, accepts_protobuf
+
+logger = logging.getLogger(__name__)
+
+LANDING_PAGE = (b"<html><head><title>Redis Exporter</title></head>"
+                b"<body><h1>Redis Exporter</h1><p><a href='/metrics'>Metrics</a></p></body></html>")
+
+# Keep-alive connections idle for longer are closed
+KEEP_ALIVE_TIMEOUT = 60.0
+
+# Max size of request line and headers
+MAX_REQUEST_SIZE = 65536
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Check if the Accept-Encoding header accepts gzip
+
+    gzip (or x-gzip) has to be listed with a q-value above 0, "gzip;q=0"
+    refuses it. Without an explicit entry "*" decides.
+    """
+    gzip_q = None
+    any_q = None
+    for accepted in accept_encoding.split(","):
+        coding, *params = [token.strip() for token in accepted.split(";")]
+        values = dict(param.partition("=")[::2] for param in params)
+        try:
+            q = float(values.get("q", "1"))
+        except ValueError:
+            q = 0.0
+        coding = coding.lower()
+        if coding in ("gzip", "x-gzip"):
+            gzip_q = q if gzip_q is None else max(gzip_q, q)
+        elif coding == "*":
+            any_q = q
+    if gzip_q is None:
+        gzip_q = any_q
+    return gzip_q is not None and gzip_q > 0
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+
+class MetricsSnapshot:
+    """Rendered metrics payload, gzipped at most once"""
+
+    def __init__(self, body: bytes, content_type: str):
+        self.body = body
+        self.content_type = content_type
+        self.created = time.time()
+        self._gzipped: Optional[asyncio.Future] = None
+
+    async def gzipped(self, compress_level: int = 6) -> bytes:
+        """Get gzip-compressed body, compressing it on first use only"""
+        if self._gzipped is None:
+            loop = asyncio.get_running_loop()
+            self._gzipped = loop.run_in_executor(None, gzip.compress, self.body, compress_level)
+        return await self._gzipped
+
+
+class MetricsServer:
+    """
+    HTTP/1.1 server exposing a Prometheus registry
+
+    Scrapes arriving while a collection is running wait for it instead of
+    starting another one, and every scraper of a snapshot gets the same
+    rendered (and, if accepted, gzipped) bytes. With snapshot_ttl > 0 a
+    snapshot is also reused by scrapes within ttl seconds after it.
+    Collection runs in a worker thread, so the event loop keeps serving
+    other connections.
+
+    A RedisCollector passed as collector (and not registered in the
+    registry) is rendered by ExpositionRenderer straight from its
+    accumulators; the registry output is appended to it. Scrapers
+    preferring the protobuf format get it from ProtobufRenderer, with
+    native histograms where the bucket layout allows.
+
+    /metrics?collect[]=info&collect[]=keys runs only the listed
+    sub-collectors of the collector (see SUB_COLLECTORS), so scrape jobs
+    of different cost can run at their own intervals.
+    """
+
+    def __init__(self, registry=REGISTRY, snapshot_ttl: float = 0.0, compress_level: int = 6,
+                 collector: Optional[object] = None, classic_histograms: bool = False):
+        """
+        Args:
+            registry: Prometheus registry to expose
+            snapshot_ttl: Seconds a rendered snapshot is reused
+            compress_level: gzip compression level
+            collector: RedisCollector rendered without MetricFamily objects
+            classic_histograms: Also send classic buckets of native histograms (protobuf)
+        """
+        self.registry = registry
+        self.snapshot_ttl = snapshot_ttl
+        self.compress_level = compress_level
+        self.collector = collector
+        self.renderer: Optional[ExpositionRenderer] = None
+        namespace = ""
+        if collector is not None:
+            namespace = collector.options.namespace
+            self.renderer = ExpositionRenderer(namespace)
+        self.protobuf_renderer = ProtobufRenderer(namespace, classic_histograms=classic_histograms)
+
+        # Collections of different formats must not overlap on one collector
+        self._collect_lock = threading.Lock()
+
+        # (content type, selected sub-collectors) -> last snapshot / running render
+        self._snapshots: Dict[Tuple[str, Optional[FrozenSet[str]]], MetricsSnapshot] = {}
+        self._rendering: Dict[Tuple[str, Optional[FrozenSet[str]]], asyncio.Future] = {}
+
+    @staticmethod
+    def content_type(accept: str) -> str:
+        """Content type negotiated by Accept"""
+        if accepts_protobuf(accept):
+            return CONTENT_TYPE_PROTOBUF
+        return choose_encoder(accept)[1]
+
+    def _observe_render(self, start: float) -> None:
+        # Exported with the next scrape, this one is already rendered
+        observe_phase = getattr(self.collector, "observe_phase", None)
+        if observe_phase is not None:
+            observe_phase("render", time.perf_counter() - start)
+
+    def render(self, accept: str, collect: Optional[FrozenSet[str]] = None) -> MetricsSnapshot:
+        """Collect and render metrics in the format negotiated by Accept"""
+        if accepts_protobuf(accept):
+            with self._collect_lock:
+                body = b""
+                if self.collector is not None:
+                    self.collector.scrape(collect)
+                    start = time.perf_counter()
+                    body = self.protobuf_renderer.render(self.collector)
+                    self._observe_render(start)
+                return MetricsSnapshot(body + self.protobuf_renderer.render_registry(self.registry),
+                                       CONTENT_TYPE_PROTOBUF)
+
+        encoder, content_type = choose_encoder(accept)
+        with self._collect_lock:
+            if self.collector is None:
+                return MetricsSnapshot(encoder(self.registry), content_type)
+
+            openmetrics = content_type.startswith("application/openmetrics-text")
+            self.collector.scrape(collect)
+            start = time.perf_counter()
+            body = self.renderer.render(self.collector, openmetrics=openmetrics, eof=False)
+            self._observe_render(start)
+            return MetricsSnapshot(body + encoder(self.registry), content_type)
+
+    async def snapshot(self, accept: str, collect: Optional[FrozenSet[str]] = None) -> MetricsSnapshot:
+        """Get snapshot for the negotiated format and selection, sharing running renders"""
+        key = (self.content_type(accept), collect)
+
+        cached = self._snapshots.get(key)
+        if cached is not None and time.time() - cached.created < self.snapshot_ttl:
+            return cached
+
+        rendering = self._rendering.get(key)
+        if rendering is None:
+            loop = asyncio.get_running_loop()
+            rendering = loop.run_in_executor(None, self.render, accept, collect)
+            self._rendering[key] = rendering
+            try:
+                snapshot = await rendering
+            finally:
+                del self._rendering[key]
+            self._snapshots[key] = snapshot
+            return snapshot
+        return await rendering
+
+    async def handle_request(self, method: str, target: str, headers: Dict[str, str]
+                             ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Handle a parsed request
+
+        Returns:
+            Tuple (status, response headers, body)
+        """
+        if method not in ("GET", "HEAD"):
+            return 405, {"Content-Type": "text/plain; charset=utf-8", "Allow": "GET, HEAD"}, b"Method not allowed\n"
+
+        url = urlsplit(target)
+        if url.path == "/":
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, LANDING_PAGE
+        if url.path != "/metrics":
+            return 404, {"Content-Type": "text/plain; charset=utf-8"}, b"Not found\n"
+
+        collect = None
+        names = parse_qs(url.query).get("collect[]")
+        if names:
+            unknown = sorted(set(names) - set(SUB_COLLECTORS))
+            if unknown:
+                return 400, {"Content-Type": "text/plain; charset=utf-8"}, \
+                    f"Unknown collector: {', '.join(unknown)} (known: {', '.join(SUB_COLLECTORS)})\n".encode()
+            collect = frozenset(names)
+
+        snapshot = await self.snapshot(headers.get("accept", ""), collect)
+        # Format and encoding are negotiated, caches must key on both headers
+        response_headers = {"Content-Type": snapshot.content_type, "Vary": "Accept, Accept-Encoding"}
+        body = snapshot.body
+        if accepts_gzip(headers.get("accept-encoding", "")):
+            body = await snapshot.gzipped(self.compress_level)
+            response_headers["Content-Encoding"] = "gzip"
+        return 200, response_headers, body
+
+    async def _read_request(self, reader: asyncio.StreamReader
+                            ) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+        request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+        if not request_line:
+            return None
+        parts = request_line.decode("latin-1").strip().split(" ")
+        if len(parts) != 3:
+            raise ValueError(f"Invalid request line: {request_line!r}")
+        method, target, version = parts
+
+        headers = {}
+        size = len(request_line)
+        while True:
+            line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+            size += len(line)
+            if size > MAX_REQUEST_SIZE:
+                raise ValueError("Request headers too large")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        # Request bodies are not expected, but must be consumed to keep the connection usable
+        length = int(headers.get("content-length", "0") or 0)
+        if length:
+            await reader.readexactly(length)
+        return method, target, version, headers
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests of a connection until it is closed or idle"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except ValueError as e:
+                    logger.debug(f"Bad request: {e}")
+                    self._write_response(writer, 400, {"Content-Type": "text/plain; charset=utf-8"},
+                                         b"Bad request\n", keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                try:
+                    status, response_headers, body = await self.handle_request(method, target, headers)
+                except Exception as e:
+                    logger.error(f"Error serving {target}: {e}")
+                    status, response_headers, body = 500, {"Content-Type": "text/plain; charset=utf-8"}, \
+                        f"Error collecting metrics: {e}\n".encode()
+
+                self._write_response(writer, status, response_headers, body, keep_alive=keep_alive,
+                                     head=method == "HEAD")
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                        body: bytes, keep_alive: bool, head: bool = False) -> None:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+        for name, value in headers.items():
+            lines.append(f"{name}: {value}")
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head:
+            writer.write(body)
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Start listening, returns asyncio server"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve_forever(self, host: str, port: int, stop: Optional[asyncio.Event] = None) -> None:
+        """Serve until stop is set (or forever)"""
+        server = await self.start(host, port)
+        async with server:
+            if stop is None:
+                await server.serve_forever()
+            else:
+                await stop.wait()
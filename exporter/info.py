@@ -4,12 +4,24 @@ import logging
 import re
 from typing import Dict, List, Optional, Tuple
 
+import redis
+
+from .metrics import OTHER_LABEL_VALUE, TopNSelector
+
 logger = logging.getLogger(__name__)
 
 # Regex patterns for parsing
 RE_MASTER_HOST = re.compile(r"^master(_[0-9]+)?_host")
 RE_MASTER_PORT = re.compile(r"^master(_[0-9]+)?_port")
 RE_SLAVE = re.compile(r"^slave\d+")
+RE_KEYSIZES = re.compile(r"^db(\d+)_distrib_([a-z]+)_(sizes|items)$")
+
+# Binary suffixes of INFO keysizes bins (1K = 1024)
+_KEYSIZES_SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40, "P": 1 << 50}
+# Fixed bin layout (0, 1, 2, 4, ... 4G) so series of all dbs and types can be aggregated
+KEYSIZES_BINS: Tuple[int, ...] = (0,) + tuple(1 << i for i in range(33))
+KEYSIZES_BUCKETS: Tuple[float, ...] = tuple(float(max(2 * b - 1, 0)) for b in KEYSIZES_BINS) + (float("inf"),)
+_KEYSIZES_TYPES = {"strings": "string", "lists": "list", "sets": "set", "zsets": "zset", "hashes": "hash"}
 
 
 def parse_db_keyspace_string(field_key: str, field_value: str) -> Optional[Tuple[int, int, int, int]]:
@@ -114,11 +126,231 @@ def parse_error_stats(field_key: str, field_value: str) -> Optional[Tuple[str, f
     return (error_type, count)
 
 
+def parse_connected_slave_string(field_key: str, field_value: str) -> Optional[Tuple[str, str, str, float, float]]:
+    """
+    Parse connected replica info string
+    
+    Format: slave0:ip=10.0.0.2,port=6379,state=online,offset=1523,lag=0
+    Older Redis versions: slave0:10.0.0.2,6379,online
+    
+    Returns:
+        Tuple (ip, port, state, offset, lag) or None, lag is -1 if unknown
+    """
+    if not RE_SLAVE.match(field_key):
+        return None
+    
+    values = {}
+    items = field_value.split(",")
+    if "=" not in field_value:
+        if len(items) < 3:
+            return None
+        values = {"ip": items[0], "port": items[1], "state": items[2]}
+    else:
+        for item in items:
+            if "=" in item:
+                key, value = item.split("=", 1)
+                values[key] = value
+    
+    try:
+        offset = float(values.get("offset", 0))
+        lag = float(values.get("lag", -1))
+    except ValueError:
+        return None
+    
+    return (values.get("ip", ""), values.get("port", ""), values.get("state", ""), offset, lag)
+
+
+def _register_replication_metrics(
+    key_values: Dict[str, str],
+    replicas: List[Tuple[str, str, str, float, float]],
+    masters: Dict[str, Dict[str, str]],
+    collector: object,
+) -> None:
+    """Register replication metrics gathered while parsing INFO"""
+    # Master side: per-replica offset and lag
+    master_offset = _parse_metric_value(key_values.get("master_repl_offset", ""))
+    for ip, port, state, offset, lag in replicas:
+        labels = {"slave_ip": ip, "slave_port": port, "slave_state": state}
+        collector._register_metric("connected_slave_offset_bytes", offset, labels=labels)
+        if master_offset is not None:
+            collector._register_metric("connected_slave_lag_bytes", max(master_offset - offset, 0.0),
+                                       labels=labels)
+        if lag > -1:
+            collector._register_metric("connected_slave_lag_seconds", lag, labels=labels)
+    
+    # Replica side: link status and sync progress
+    if key_values.get("role") != "slave":
+        return
+    
+    read_only = key_values.get("slave_read_only", key_values.get("replica_read_only", ""))
+    for master in masters.values():
+        collector._register_metric("slave_info", 1.0, labels={
+            "master_host": master.get("host", ""),
+            "master_port": master.get("port", ""),
+            "read_only": read_only,
+        })
+    
+    if "master_link_status" in key_values:
+        collector._register_metric("master_link_up",
+                                   1.0 if key_values["master_link_status"] == "up" else 0.0)
+    
+    for field_key, metric_name in (
+        ("master_last_io_seconds_ago", "master_last_io_seconds_ago"),
+        ("master_sync_in_progress", "master_sync_in_progress"),
+        ("slave_repl_offset", "slave_repl_offset"),
+        ("master_sync_total_bytes", "master_sync_total_bytes"),
+        ("master_sync_read_bytes", "master_sync_read_bytes"),
+        ("master_sync_left_bytes", "master_sync_left_bytes"),
+        ("master_link_down_since_seconds", "master_link_down_since_seconds"),
+    ):
+        value = _parse_metric_value(key_values.get(field_key, ""))
+        if value is not None:
+            collector._register_metric(metric_name, value)
+    
+    sync_perc = _parse_metric_value(key_values.get("master_sync_perc", ""))
+    if sync_perc is not None:
+        collector._register_metric("master_sync_progress_ratio", sync_perc / 100)
+
+
+def _parse_keysizes_bin(value: str) -> int:
+    """Parse keysizes bin lower bound (e.g. 512, 1K, 4M)"""
+    multiplier = _KEYSIZES_SUFFIXES.get(value[-1:])
+    if multiplier:
+        return int(value[:-1]) * multiplier
+    return int(value)
+
+
+def parse_keysizes_distribution(field_key: str, field_value: str
+                                ) -> Optional[Tuple[str, str, List[Tuple[float, float]]]]:
+    """
+    Parse INFO keysizes line (Redis 8.0+ / Valkey)
+    
+    Format: db0_distrib_strings_sizes:2=1,4=3,1K=2
+    Each bin counts keys with size (bytes for strings, items for
+    collections) in [bin, 2 * bin).
+    
+    Returns:
+        Tuple (db, type, buckets) or None. Buckets are (upper_bound,
+        cumulative_count) aligned to KEYSIZES_BUCKETS, the upper bound
+        of bin b is 2b - 1.
+    """
+    match = RE_KEYSIZES.match(field_key)
+    if not match:
+        return None
+    
+    # Bins over the fixed layout only go to +Inf
+    counts = [0.0] * len(KEYSIZES_BUCKETS)
+    for item in field_value.split(","):
+        if "=" not in item:
+            continue
+        key, value = item.split("=", 1)
+        try:
+            lower = _parse_keysizes_bin(key)
+            count = float(value)
+        except ValueError:
+            logger.debug(f"Couldn't parse keysizes bin: {item}")
+            continue
+        index = lower.bit_length() if lower < (1 << 33) else len(KEYSIZES_BINS)
+        counts[index] += count
+    
+    buckets = []
+    cumulative = 0.0
+    for le, count in zip(KEYSIZES_BUCKETS, counts):
+        cumulative += count
+        buckets.append((le, cumulative))
+    
+    key_type = _KEYSIZES_TYPES.get(match.group(2), match.group(2))
+    return (f"db{match.group(1)}", key_type, buckets)
+
+
+def _format_info_value(value: object) -> str:
+    """Render a value parsed by redis-py back into INFO field format"""
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, dict):
+        # redis-py splits "k1=v1,k2=v2" fields into dicts
+        parts = []
+        for k, v in value.items():
+            if v is True:
+                parts.append(str(k))
+            else:
+                parts.append(f"{k}={_format_info_value(v)}")
+        return ",".join(parts)
+    if isinstance(value, list):
+        return ",".join(_format_info_value(v) for v in value)
+    return str(value)
+
+
+def format_info_result(info_result: object) -> str:
+    """
+    Convert INFO reply to the raw "key:value" text format
+    
+    redis-py parses INFO into a dict, while raw replies come back as bytes.
+    Both are normalized to the text format expected by extract_info_metrics.
+    
+    Args:
+        info_result: Reply of the INFO command (dict, bytes or str)
+    
+    Returns:
+        INFO output as string
+    """
+    if isinstance(info_result, bytes):
+        return info_result.decode("utf-8")
+    if not isinstance(info_result, dict):
+        return info_result
+    
+    lines = []
+    for key, value in info_result.items():
+        if isinstance(key, bytes):
+            key = key.decode("utf-8")
+        lines.append(f"{key}:{_format_info_value(value)}\n")
+    return "".join(lines)
+
+
+def supports_multi_section_info(info_string: str) -> bool:
+    """Check if the server (redis_version in INFO) accepts several INFO sections at once (7.0+)"""
+    for line in info_string.split("\n"):
+        if line.startswith("redis_version:"):
+            try:
+                return int(line[len("redis_version:"):].strip().split(".")[0]) >= 7
+            except ValueError:
+                return False
+    return False
+
+
+def fetch_info(client: redis.Redis, sections: Tuple[str, ...] = (), multi_section: bool = False) -> str:
+    """
+    Fetch default INFO plus extra sections in a single round trip
+    
+    Args:
+        client: Redis client
+        sections: Sections requested in addition to the default ones
+        multi_section: Server accepts several sections in one INFO call (Redis 7.0+),
+            otherwise every section is requested by its own pipelined INFO
+    
+    Returns:
+        INFO output as string
+    """
+    if not sections:
+        return format_info_result(client.info())
+    if multi_section:
+        return format_info_result(client.info("default", *sections))
+    
+    pipe = client.pipeline(transaction=False)
+    pipe.info()
+    for section in sections:
+        pipe.info(section)
+    return "\n".join(format_info_result(result) for result in pipe.execute())
+
+
 def extract_info_metrics(
     info_string: str,
     metric_map_gauges: Dict[str, str],
     metric_map_counters: Dict[str, str],
     collector: object,
+    command_selector: Optional[TopNSelector] = None,
+    command_top_by: str = "calls",
+    error_selector: Optional[TopNSelector] = None,
 ) -> str:
     """
     Extract metrics from Redis INFO command output
@@ -128,6 +360,9 @@ def extract_info_metrics(
         metric_map_gauges: Map of gauge metrics
         metric_map_counters: Map of counter metrics
         collector: RedisExporter collector instance
+        command_selector: Commands exported individually, the rest as "other"
+        command_top_by: Command score for top-N selection ("calls" or "usec")
+        error_selector: Error types exported individually, the rest as "other"
     
     Returns:
         Instance role (master/slave)
@@ -138,6 +373,20 @@ def extract_info_metrics(
     handled_dbs = {}
     cmd_stats = []
     error_stats = []
+    replicas = []
+    masters = {}
+    
+    # Sections whose metrics are all filtered out are not parsed
+    allowed = getattr(collector, "metric_allowed", None)
+    
+    def wanted(*metric_names: str) -> bool:
+        return allowed is None or any(allowed(name) for name in metric_names)
+    
+    want_keysizes = wanted("keysizes_string_bytes", "keysizes_items")
+    want_keyspace = wanted("db_keys", "db_keys_expiring", "db_keys_cached", "db_avg_ttl_seconds")
+    want_cmdstats = wanted("commands_total", "commands_duration_seconds_total",
+                           "commands_rejected_calls_total", "commands_failed_calls_total")
+    want_errorstats = wanted("errors_total")
     
     for line in lines:
         line = line.strip()
@@ -160,7 +409,23 @@ def extract_info_metrics(
         key_values[field_key] = field_value
         
         # Handle different sections
-        if field_class == "Keyspace" or field_key.startswith("db"):
+        if field_class == "Keysizes" or RE_KEYSIZES.match(field_key):
+            if not want_keysizes:
+                continue
+            result = parse_keysizes_distribution(field_key, field_value)
+            if result:
+                db, key_type, buckets = result
+                # Strings are distributed by length in bytes, collections by number of items
+                if key_type == "string":
+                    collector._register_histogram("keysizes_string_bytes", buckets, None, labels={"db": db})
+                else:
+                    collector._register_histogram("keysizes_items", buckets, None,
+                                                  labels={"db": db, "type": key_type})
+                continue
+        
+        elif field_class == "Keyspace" or field_key.startswith("db"):
+            if not want_keyspace:
+                continue
             result = parse_db_keyspace_string(field_key, field_value)
             if result:
                 keys, keys_expiring, avg_ttl, keys_cached = result
@@ -173,18 +438,35 @@ def extract_info_metrics(
                 handled_dbs[field_key] = True
                 continue
         
-        elif field_class == "Commandstats":
+        elif field_class == "Commandstats" or field_key.startswith("cmdstat_"):
+            if not want_cmdstats:
+                continue
             result = parse_command_stats(field_key, field_value)
             if result:
                 cmd_stats.append(result)
                 continue
         
-        elif field_class == "Errorstats":
+        elif field_class == "Errorstats" or field_key.startswith("errorstat_"):
+            if not want_errorstats:
+                continue
             result = parse_error_stats(field_key, field_value)
             if result:
                 error_stats.append(result)
                 continue
         
+        elif field_class == "Replication" or field_key.startswith(("slave", "master")):
+            # Matched without section too, INFO from redis-py dict has no headers
+            result = parse_connected_slave_string(field_key, field_value)
+            if result:
+                replicas.append(result)
+                continue
+            # master_host / master_1_host (multi-master replicas)
+            match = RE_MASTER_HOST.match(field_key) or RE_MASTER_PORT.match(field_key)
+            if match:
+                master = masters.setdefault(match.group(1) or "", {})
+                master["host" if field_key.endswith("_host") else "port"] = field_value
+                continue
+        
         # Check if metric should be included
         if not _should_include_metric(field_key, metric_map_gauges, metric_map_counters):
             continue
@@ -205,6 +487,11 @@ def extract_info_metrics(
             collector._create_metric_descr(metric_name)
             collector._register_metric(metric_name, value, is_counter=is_counter)
     
+    if command_selector is not None and cmd_stats:
+        cmd_stats = _select_command_stats(cmd_stats, command_selector, command_top_by)
+    if error_selector is not None and error_stats:
+        error_stats = _select_error_stats(error_stats, error_selector)
+    
     # Register command stats
     for cmd, calls, rejected_calls, failed_calls, usec_total, extended in cmd_stats:
         collector._create_metric_descr("commands_total", labels=["cmd"])
@@ -226,6 +513,9 @@ def extract_info_metrics(
         collector._create_metric_descr("errors_total", labels=["err"])
         collector._register_metric("errors_total", count, is_counter=True, labels={"err": error_type})
     
+    # Register replication metrics
+    _register_replication_metrics(key_values, replicas, masters, collector)
+    
     # Register instance info
     instance_role = key_values.get("role", "")
     instance_labels = {
@@ -247,6 +537,30 @@ def extract_info_metrics(
     return instance_role
 
 
+def _select_command_stats(cmd_stats: list, selector: TopNSelector, top_by: str) -> list:
+    """Keep selected commands, account the rest in a monotonic "other" command"""
+    score_index = 4 if top_by == "usec" else 1
+    selected = selector.select({stats[0]: stats[score_index] for stats in cmd_stats})
+    
+    result = [stats for stats in cmd_stats if stats[0] in selected]
+    other = selector.other_totals({cmd: (calls, rejected_calls, failed_calls, usec_total)
+                                   for cmd, calls, rejected_calls, failed_calls, usec_total, _ in cmd_stats})
+    if len(result) < len(cmd_stats):
+        other_extended = any(stats[5] for stats in cmd_stats if stats[0] not in selected)
+        result.append((OTHER_LABEL_VALUE, other[0], other[1], other[2], other[3], other_extended))
+    return result
+
+
+def _select_error_stats(error_stats: list, selector: TopNSelector) -> list:
+    """Keep selected error types, account the rest in a monotonic "other" error"""
+    selected = selector.select(dict(error_stats))
+    result = [stats for stats in error_stats if stats[0] in selected]
+    other = selector.other_totals({err: (count,) for err, count in error_stats})
+    if len(result) < len(error_stats):
+        result.append((OTHER_LABEL_VALUE, other[0]))
+    return result
+
+
 def _should_include_metric(field_key: str, metric_map_gauges: Dict[str, str], 
                           metric_map_counters: Dict[str, str]) -> bool:
     """Check if metric should be included"""
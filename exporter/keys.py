@@ -2,7 +2,8 @@
 
 import logging
 import re
-from typing import List, Optional, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import unquote
 
 import redis
@@ -12,6 +13,22 @@ logger = logging.getLogger(__name__)
 # Glob pattern detection
 _GLOB_PATTERN = re.compile(r"[\?\*\[\]\^]+")
 
+# Size command per key type (strings are handled separately)
+_SIZE_COMMANDS = {
+    "list": "LLEN",
+    "set": "SCARD",
+    "zset": "ZCARD",
+    "hash": "HLEN",
+    "stream": "XLEN",
+}
+
+
+def _observe(collector: object, phase: str, start: float) -> None:
+    """Account a scrape phase started at start (perf_counter) if the collector times phases"""
+    observe_phase = getattr(collector, "observe_phase", None)
+    if observe_phase is not None:
+        observe_phase(phase, time.perf_counter() - start)
+
 
 class DbKeyPair:
     """Database and key pair"""
@@ -209,11 +226,111 @@ def get_key_info(client: redis.Redis, key_name: str) -> Optional[Tuple[str, int,
         return None
 
 
+def get_keys_info_pipelined(
+    client: redis.Redis, key_names: List[str],
+) -> Tuple[Dict[str, Tuple[str, int, Optional[str]]], List[Exception]]:
+    """
+    Get type and size of many keys in two pipelined round trips
+    
+    The first round trip sends TYPE for every key, the second one sends
+    the matching size commands (and GET for strings).
+    
+    Returns:
+        Tuple of ({key_name: (key_type, size, string_value)}, errors)
+    """
+    results: Dict[str, Tuple[str, int, Optional[str]]] = {}
+    errors: List[Exception] = []
+    
+    pipe = client.pipeline(transaction=False)
+    for key_name in key_names:
+        pipe.type(key_name)
+    types = pipe.execute(raise_on_error=False)
+    
+    pipe = client.pipeline(transaction=False)
+    plan = []
+    for key_name, key_type in zip(key_names, types):
+        if isinstance(key_type, Exception):
+            logger.error(f"Error getting key type for {key_name}: {key_type}")
+            errors.append(key_type)
+            continue
+        if isinstance(key_type, bytes):
+            key_type = key_type.decode('utf-8')
+        
+        if key_type == "none":
+            logger.debug(f"Key '{key_name}' not found")
+            results[key_name] = ("none", 0, None)
+        elif key_type == "string":
+            # PFCOUNT fails for non-HyperLogLog strings, STRLEN is used then
+            pipe.get(key_name)
+            pipe.pfcount(key_name)
+            pipe.strlen(key_name)
+            plan.append((key_name, key_type))
+        elif key_type in _SIZE_COMMANDS:
+            pipe.execute_command(_SIZE_COMMANDS[key_type], key_name)
+            plan.append((key_name, key_type))
+        else:
+            logger.error(f"Unknown key type: {key_type}")
+    
+    if not plan:
+        return results, errors
+    
+    replies = iter(pipe.execute(raise_on_error=False))
+    for key_name, key_type in plan:
+        if key_type == "string":
+            str_val_bytes, pf_size, str_size = next(replies), next(replies), next(replies)
+            size = str_size if isinstance(pf_size, Exception) else pf_size
+            if isinstance(str_val_bytes, Exception) or isinstance(size, Exception):
+                error = str_val_bytes if isinstance(str_val_bytes, Exception) else size
+                logger.error(f"Error getting string info for {key_name}: {error}")
+                errors.append(error)
+                continue
+            str_val = None
+            if str_val_bytes:
+                if isinstance(str_val_bytes, bytes):
+                    str_val = str_val_bytes.decode('utf-8', errors='replace')
+                else:
+                    str_val = str(str_val_bytes)
+            results[key_name] = (key_type, size, str_val)
+        else:
+            size = next(replies)
+            if isinstance(size, Exception):
+                logger.error(f"Error getting key info for {key_name}: {size}")
+                errors.append(size)
+                continue
+            results[key_name] = (key_type, size, None)
+    
+    return results, errors
+
+
+def _register_key_info(collector: object, db_label: str, key_name: str,
+                       key_info: Tuple[str, int, Optional[str]]) -> None:
+    """Register key_size and key_value metrics for a checked key"""
+    key_type, size, str_val = key_info
+    
+    # Register key_size metric
+    collector._create_metric_descr("key_size", labels=["db", "key"])
+    collector._register_metric("key_size", float(size), labels={"db": db_label, "key": key_name})
+    
+    # Register key_value if string
+    if key_type == "string" and str_val:
+        try:
+            # Try to parse as float
+            val_float = float(str_val)
+            collector._create_metric_descr("key_value", labels=["db", "key"])
+            collector._register_metric("key_value", val_float, labels={"db": db_label, "key": key_name})
+        except (ValueError, TypeError):
+            # Not a float, register as string label
+            collector._create_metric_descr("key_value_as_string", labels=["db", "key", "value"])
+            collector._register_metric("key_value_as_string", 1.0, 
+                                     labels={"db": db_label, "key": key_name, "value": str_val})
+
+
 def extract_check_key_metrics(
     client: redis.Redis,
     check_keys: str,
     check_single_keys: str,
     collector: object,
+    key_cache: Optional[object] = None,
 ) -> None:
     """
     Extract metrics for checked keys
@@ -223,19 +340,35 @@ def extract_check_key_metrics(
         check_keys: Comma-separated key patterns (uses SCAN)
         check_single_keys: Comma-separated specific keys (direct lookup)
         collector: RedisExporter collector instance
+        key_cache: Optional KeyTrackingCache serving single keys
     """
     # Parse keys
     pattern_keys = parse_key_arg(check_keys)
     single_keys = parse_key_arg(check_single_keys)
     
+    # Single keys are served from the tracking cache if enabled
+    if key_cache is not None and single_keys:
+        try:
+            cached = key_cache.get_keys_info(single_keys)
+            for k in single_keys:
+                key_info = cached.get((k.db, k.key))
+                if key_info is not None:
+                    _register_key_info(collector, f"db{k.db}", k.key, key_info)
+            single_keys = []
+        except Exception as e:
+            logger.error(f"Error getting keys from tracking cache: {e}")
+            key_cache.close()
+    
     # Expand patterns if needed
     all_keys = single_keys.copy()
     if pattern_keys:
+        start = time.perf_counter()
         try:
             expanded_keys = get_keys_from_patterns(client, pattern_keys)
             all_keys.extend(expanded_keys)
         except Exception as e:
             logger.error(f"Error expanding key patterns: {e}")
+        _observe(collector, "pattern_expansion", start)
     
     logger.debug(f"Total keys to check: {len(all_keys)}")
     
@@ -247,6 +380,7 @@ def extract_check_key_metrics(
         keys_by_db[k.db].append(k.key)
     
     # Process each database
+    start = time.perf_counter()
     original_db = client.connection_pool.connection_kwargs.get('db', 0)
     
     for db_num, key_list in keys_by_db.items():
@@ -267,25 +401,102 @@ def extract_check_key_metrics(
             if key_info is None:
                 continue
             
-            key_type, size, str_val = key_info
-            
-            # Register key_size metric
-            collector._create_metric_descr("key_size", labels=["db", "key"])
-            collector._register_metric("key_size", float(size), labels={"db": db_label, "key": key_name})
-            
-            # Register key_value if string
-            if key_type == "string" and str_val:
-                try:
-                    # Try to parse as float
-                    val_float = float(str_val)
-                    collector._create_metric_descr("key_value", labels=["db", "key"])
-                    collector._register_metric("key_value", val_float, labels={"db": db_label, "key": key_name})
-                except (ValueError, TypeError):
-                    # Not a float, register as string label
-                    collector._create_metric_descr("key_value_as_string", labels=["db", "key", "value"])
-                    collector._register_metric("key_value_as_string", 1.0, 
-                                             labels={"db": db_label, "key": key_name, "value": str_val})
+            _register_key_info(collector, db_label, key_name, key_info)
     
     # Restore original database
     if original_db is not None:
         client.execute_command("SELECT", original_db)
+    _observe(collector, "key_inspection", start)
+
+
+def _scan_node_patterns(client: redis.Redis, patterns: List[str], count: int = 100) -> List[str]:
+    """SCAN all patterns on a single cluster node"""
+    found = []
+    for pattern in patterns:
+        for key_name in scan_keys(client, pattern, count):
+            found.append(key_name.decode('utf-8') if isinstance(key_name, bytes) else key_name)
+    return found
+
+
+def extract_cluster_check_key_metrics(
+    topology: object,
+    seed_client: Optional[redis.Redis],
+    check_keys: str,
+    check_single_keys: str,
+    collector: object,
+) -> None:
+    """
+    Extract metrics for checked keys on Redis Cluster
+    
+    Pattern SCANs fan out to every primary concurrently. Each key is then
+    routed to its owning primary by hash slot and checked with pipelines
+    per node, so the cost is per node, not per key.
+    
+    Args:
+        topology: ClusterTopology with cached slot map
+        seed_client: Client used for topology discovery
+        check_keys: Comma-separated key patterns (uses SCAN)
+        check_single_keys: Comma-separated specific keys (direct lookup)
+        collector: RedisExporter collector instance
+    """
+    pattern_keys = parse_key_arg(check_keys)
+    single_keys = parse_key_arg(check_single_keys)
+    
+    # Redis Cluster only supports db0
+    all_keys = set()
+    patterns = []
+    for k in pattern_keys + single_keys:
+        if k.db != "0":
+            logger.warning(f"Redis Cluster only supports db0, skipping key db{k.db}={k.key}")
+        elif _GLOB_PATTERN.search(k.key):
+            patterns.append(k.key)
+        else:
+            all_keys.add(k.key)
+    
+    primaries = topology.primaries(seed_client)
+    
+    if patterns:
+        start = time.perf_counter()
+        scans = topology.run_on_nodes(
+            primaries, lambda node, client: _scan_node_patterns(client, patterns),
+        )
+        for node, found, error in scans:
+            if error is not None:
+                logger.error(f"Error with SCAN on cluster node {node.addr}: {error}")
+                continue
+            all_keys.update(found)
+        _observe(collector, "pattern_expansion", start)
+    
+    logger.debug(f"Total keys to check: {len(all_keys)}")
+    
+    # Route keys to owning primaries using the cached slot map
+    start = time.perf_counter()
+    keys_by_node: Dict[str, List[str]] = {}
+    nodes_by_addr = {}
+    for key_name in sorted(all_keys):
+        node = topology.node_for_key(key_name)
+        if node is None:
+            logger.error(f"No cluster node owns the slot of key {key_name}")
+            topology.mark_stale()
+            continue
+        nodes_by_addr[node.addr] = node
+        keys_by_node.setdefault(node.addr, []).append(key_name)
+    
+    checks = topology.run_on_nodes(
+        list(nodes_by_addr.values()),
+        lambda node, client: get_keys_info_pipelined(client, keys_by_node[node.addr]),
+    )
+    
+    for node, result, error in checks:
+        if error is not None:
+            logger.error(f"Error checking keys on cluster node {node.addr}: {error}")
+            continue
+        key_infos, key_errors = result
+        for key_error in key_errors:
+            # MOVED/ASK means the cached slot map is outdated
+            topology.handle_error(key_error)
+        for key_name in keys_by_node[node.addr]:
+            key_info = key_infos.get(key_name)
+            if key_info is not None:
+                _register_key_info(collector, "db0", key_name, key_info)
+    _observe(collector, "key_inspection", start)
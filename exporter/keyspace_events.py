@@ -0,0 +1,203 @@
+"""Keyspace notification listener with per-prefix event counters"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import redis
+
+from .redis_client import decode_reply
+
+logger = logging.getLogger(__name__)
+
+# Key prefix is the part of the key before the first separator
+PREFIX_SEPARATOR = ":"
+
+# Label value for prefixes over the max_prefixes cap
+OTHER_PREFIX = "other"
+
+# notify-keyspace-events flag publishing each event of interest (E enables __keyevent@ channels)
+EVENT_FLAGS = {
+    "new": "n",
+    "expired": "x",
+    "evicted": "e",
+}
+
+# Recommended notify-keyspace-events setting covering EVENT_FLAGS
+NOTIFY_KEYSPACE_EVENTS = "Exen"
+
+# Flags of the "A" alias of notify-keyspace-events (it doesn't include "n")
+_ALL_EVENTS_ALIAS = "g$lshzxetd"
+
+
+def parse_keyspace_dbs(dbs: str) -> List[int]:
+    """Parse comma-separated db numbers ("0,1" or "db0,db1")"""
+    result = []
+    for db in dbs.split(","):
+        db = db.strip().replace("db", "")
+        if not db:
+            continue
+        try:
+            result.append(int(db))
+        except ValueError:
+            logger.error(f"Invalid database index: {db}")
+    return result
+
+
+def missing_events(notify_keyspace_events: str) -> List[str]:
+    """
+    Get counted events a notify-keyspace-events setting doesn't publish
+
+    Events are published on __keyevent@ channels only with the E flag.
+    """
+    if "E" not in notify_keyspace_events:
+        return list(EVENT_FLAGS)
+    flags = notify_keyspace_events.replace("A", _ALL_EVENTS_ALIAS)
+    return [event for event, flag in EVENT_FLAGS.items() if flag not in flags]
+
+
+def key_prefix(key: str) -> str:
+    """Get key prefix (job:42 -> job), keys without separator have an empty prefix"""
+    prefix, sep, _ = key.partition(PREFIX_SEPARATOR)
+    return prefix if sep else ""
+
+
+class KeyspaceEventListener:
+    """
+    Counts keyspace events (__keyevent@<db>__:<event>) per key prefix
+
+    A background thread holds a dedicated pub/sub connection, so counting
+    costs no polling. The prefix table is bounded: once max_prefixes
+    prefixes are known, events of new prefixes are counted as "other".
+
+    Redis has to be configured to publish events, e.g.
+    CONFIG SET notify-keyspace-events Exen (see NOTIFY_KEYSPACE_EVENTS)
+    """
+
+    def __init__(self, connect: Callable[[], redis.Redis], dbs: List[int],
+                 max_prefixes: int = 100):
+        """
+        Args:
+            connect: Factory creating the pub/sub client
+            dbs: Databases to listen to
+            max_prefixes: Max number of prefixes with own series
+        """
+        self.connect = connect
+        self.dbs = dbs
+        self.max_prefixes = max_prefixes
+
+        self.connected = False
+        self.reconnects = 0
+
+        # (db, prefix, event) -> count
+        self._counts: Dict[Tuple[str, str, str], int] = {}
+        self._prefixes = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+
+    def handle_event(self, channel: str, key: str) -> None:
+        """
+        Account a keyevent message
+
+        Channel format: __keyevent@<db>__:<event>, data is the key name
+        """
+        if not channel.startswith("__keyevent@"):
+            return
+        db, sep, event = channel[len("__keyevent@"):].partition("__:")
+        if not sep:
+            return
+
+        prefix = key_prefix(key)
+        with self._lock:
+            if prefix not in self._prefixes:
+                if len(self._prefixes) >= self.max_prefixes:
+                    prefix = OTHER_PREFIX
+                else:
+                    self._prefixes.add(prefix)
+            counter = (f"db{db}", prefix, event)
+            self._counts[counter] = self._counts.get(counter, 0) + 1
+
+    def start(self) -> None:
+        """Start background listener"""
+        if self._listener is not None:
+            return
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen, name="keyspace-events", daemon=True)
+        self._listener.start()
+
+    def stop(self) -> None:
+        """Stop background listener"""
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+            self._listener = None
+
+    def _listen(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            client = None
+            pubsub = None
+            try:
+                client = self.connect()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(*[f"__keyevent@{db}__:*" for db in self.dbs])
+                self.connected = True
+                backoff = 1.0
+                self._check_config(client)
+
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "pmessage":
+                        self.handle_event(decode_reply(message["channel"]), decode_reply(message["data"]))
+            except Exception as e:
+                self.connected = False
+                if self._stop.is_set():
+                    break
+                # Events published while disconnected are lost
+                logger.warning(f"Keyspace events listener error: {e}")
+                self.reconnects += 1
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                self.connected = False
+                for closable in (pubsub, client):
+                    if closable is not None:
+                        try:
+                            closable.close()
+                        except Exception:
+                            pass
+
+    def _check_config(self, client: redis.Redis) -> None:
+        """Warn if Redis doesn't publish some of the counted events"""
+        try:
+            reply = client.config_get("notify-keyspace-events")
+        except Exception as e:
+            # CONFIG may be renamed or forbidden for the exporter user
+            logger.debug(f"Can't check notify-keyspace-events: {e}")
+            return
+        setting = decode_reply(next(iter(reply.values()), ""))
+        missing = missing_events(setting)
+        if missing:
+            logger.warning(f"notify-keyspace-events is '{setting}', {', '.join(missing)} events are not "
+                           f"published; set it to {NOTIFY_KEYSPACE_EVENTS} "
+                           f"(CONFIG SET notify-keyspace-events {NOTIFY_KEYSPACE_EVENTS})")
+
+    def collect(self, collector: object) -> None:
+        """
+        Start listener if needed and register event counters
+
+        Args:
+            collector: RedisExporter collector instance
+        """
+        self.start()
+
+        collector._register_metric("keyspace_events_listener_up", 1.0 if self.connected else 0.0)
+        collector._register_metric("keyspace_events_listener_reconnects_total", float(self.reconnects),
+                                   is_counter=True)
+
+        with self._lock:
+            counts = list(self._counts.items())
+        for (db, prefix, event), count in counts:
+            collector._register_metric("keyspace_events_total", float(count), is_counter=True,
+                                       labels={"db": db, "prefix": prefix, "event": event})
@@ -0,0 +1,243 @@
+"""Latency histograms and latency monitor collectors"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+from .info import format_info_result
+from .redis_client import decode_reply, pairs_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Redis tracks per-command latency in power-of-two microsecond buckets
+# from 1us up to ~1s. The layout is fixed, so it is computed once and
+# shared by every command, which also makes the buckets mergeable.
+LATENCY_HISTOGRAM_MAX_POWER = 30
+LATENCY_BUCKETS_USEC: Tuple[int, ...] = tuple(1 << i for i in range(LATENCY_HISTOGRAM_MAX_POWER + 1))
+LATENCY_BUCKETS_SECONDS: Tuple[float, ...] = tuple(b / 1e6 for b in LATENCY_BUCKETS_USEC) + (float("inf"),)
+
+
+def latency_bucket_index(bucket: int) -> int:
+    """
+    Index in LATENCY_BUCKETS_USEC of a LATENCY HISTOGRAM bucket
+
+    Buckets are reported by their highest equivalent value in ns / 1000, so
+    only the first ones are exact powers of two: 1, 2, 4, 8, 16, 33, 66, 132...
+    """
+    return min(max(0, bucket.bit_length() - 1), LATENCY_HISTOGRAM_MAX_POWER)
+
+
+def parse_latency_histogram(reply: object) -> Dict[str, Tuple[int, List[int]]]:
+    """
+    Parse LATENCY HISTOGRAM reply (Redis 7.0+)
+
+    Format: [cmd, [calls, n, histogram_usec, [bucket, cumulative_count, ...]], ...]
+
+    Returns:
+        Dict {cmd: (calls, cumulative counts aligned to LATENCY_BUCKETS_USEC)}
+    """
+    result = {}
+    items = reply if isinstance(reply, dict) else pairs_to_dict(reply or [])
+
+    for cmd, details in items.items():
+        details = pairs_to_dict(details)
+        calls = int(details.get("calls", 0))
+        histogram = details.get("histogram_usec", [])
+        if isinstance(histogram, dict):
+            points = [(int(k), int(v)) for k, v in histogram.items()]
+        else:
+            points = [(int(histogram[i]), int(histogram[i + 1])) for i in range(0, len(histogram) - 1, 2)]
+
+        # Only non-empty buckets are reported, fill gaps with the previous count
+        counts = [0] * len(LATENCY_BUCKETS_USEC)
+        for bucket, cumulative in points:
+            index = latency_bucket_index(bucket)
+            counts[index] = max(counts[index], cumulative)
+        for i in range(1, len(counts)):
+            if counts[i] < counts[i - 1]:
+                counts[i] = counts[i - 1]
+
+        result[decode_reply(cmd).lower()] = (calls, counts)
+
+    return result
+
+
+def parse_latency_percentiles(field_key: str, field_value: str) -> Optional[Tuple[str, List[Tuple[str, float]]]]:
+    """
+    Parse INFO latencystats line
+
+    Format: latency_percentiles_usec_get:p50=1.003,p99=2.007,p99.9=4.015
+
+    Returns:
+        Tuple (cmd, [(quantile, seconds), ...]) or None
+    """
+    prefix = "latency_percentiles_usec_"
+    if not field_key.startswith(prefix):
+        return None
+
+    cmd = field_key[len(prefix):]
+    percentiles = []
+    for item in field_value.split(","):
+        if "=" not in item:
+            continue
+        key, value = item.split("=", 1)
+        if not key.startswith("p"):
+            continue
+        try:
+            quantile = float(key[1:]) / 100
+            seconds = float(value) / 1e6
+        except ValueError:
+            continue
+        percentiles.append((f"{quantile:g}", seconds))
+
+    return (cmd, percentiles)
+
+
+class LatencyHistogramCollector:
+    """
+    Exports LATENCY HISTOGRAM as Prometheus histograms
+
+    LATENCY HISTOGRAM and INFO latencystats are sent in one pipeline per
+    scrape. Histogram sums are taken from commands_duration_seconds_total
+    registered by the INFO commandstats of the same scrape.
+    """
+
+    def __init__(self):
+        self.supported = True
+
+    def collect(self, client: redis.Redis, collector: object) -> None:
+        """
+        Args:
+            client: Redis client
+            collector: RedisExporter collector instance
+        """
+        if not self.supported:
+            return
+
+        pipe = client.pipeline(transaction=False)
+        pipe.execute_command("LATENCY", "HISTOGRAM")
+        pipe.execute_command("INFO", "latencystats")
+        try:
+            histogram_reply, latencystats = pipe.execute(raise_on_error=False)
+        except Exception as e:
+            logger.error(f"Error getting latency histograms: {e}")
+            return
+
+        if isinstance(histogram_reply, redis.exceptions.ResponseError):
+            # Redis < 7.0 doesn't know LATENCY HISTOGRAM
+            if "unknown" in str(histogram_reply).lower():
+                logger.warning("LATENCY HISTOGRAM is not supported, disabling latency histograms")
+                self.supported = False
+            else:
+                logger.error(f"Error getting latency histograms: {histogram_reply}")
+            return
+
+        # Commands without commandstats (e.g. summed as "other") have no sum
+        durations = {sample["labels"]["cmd"]: sample["value"] for sample in
+                     getattr(collector, "_current_metrics", {}).get("commands_duration_seconds_total", [])}
+
+        for cmd, (calls, counts) in parse_latency_histogram(histogram_reply).items():
+            buckets = list(zip(LATENCY_BUCKETS_SECONDS, counts + [calls]))
+            collector._register_histogram("command_latency_seconds", buckets,
+                                          durations.get(cmd), labels={"cmd": cmd})
+
+        if isinstance(latencystats, Exception):
+            return
+        for line in format_info_result(latencystats).split("\n"):
+            if ":" not in line:
+                continue
+            parsed = parse_latency_percentiles(*line.strip().split(":", 1))
+            if not parsed:
+                continue
+            cmd, percentiles = parsed
+            for quantile, seconds in percentiles:
+                collector._register_metric("command_latency_percentiles_seconds", seconds,
+                                           labels={"cmd": cmd, "quantile": quantile})
+
+
+def parse_latency_latest(reply: object) -> Dict[str, Tuple[int, float, float]]:
+    """
+    Parse LATENCY LATEST reply
+
+    Format: [[event, timestamp, latest_ms, max_ms], ...]
+
+    Returns:
+        Dict {event: (timestamp, latest_seconds, max_seconds)}
+    """
+    result = {}
+    for item in reply or []:
+        try:
+            event = decode_reply(item[0])
+            result[event] = (int(item[1]), int(item[2]) / 1e3, int(item[3]) / 1e3)
+        except (IndexError, TypeError, ValueError):
+            logger.debug(f"Couldn't parse latency event: {item}")
+    return result
+
+
+class LatencyEventCollector:
+    """
+    Exports the Redis latency monitor (LATENCY LATEST / LATENCY HISTORY)
+
+    LATENCY LATEST is polled every scrape. LATENCY HISTORY is requested
+    (in one pipeline) only for events whose latest timestamp changed since
+    the previous scrape, and new history samples are added to spike counters.
+    """
+
+    def __init__(self):
+        self._last_timestamps: Dict[str, int] = {}
+        self._spikes: Dict[str, int] = {}
+
+    def _count_new_spikes(self, event: str, history: object) -> int:
+        last_seen = self._last_timestamps.get(event, -1)
+        new_spikes = 0
+        for sample in history or []:
+            try:
+                if int(sample[0]) > last_seen:
+                    new_spikes += 1
+            except (IndexError, TypeError, ValueError):
+                continue
+        return new_spikes
+
+    def collect(self, client: redis.Redis, collector: object) -> None:
+        """
+        Args:
+            client: Redis client
+            collector: RedisExporter collector instance
+        """
+        try:
+            latest = parse_latency_latest(client.execute_command("LATENCY", "LATEST"))
+
+            changed = [event for event, (timestamp, _, _) in latest.items()
+                       if self._last_timestamps.get(event) != timestamp]
+            if changed:
+                pipe = client.pipeline(transaction=False)
+                for event in changed:
+                    pipe.execute_command("LATENCY", "HISTORY", event)
+                histories = pipe.execute(raise_on_error=False)
+            else:
+                histories = []
+        except Exception as e:
+            logger.error(f"Error getting latency events: {e}")
+            return
+
+        for event, history in zip(changed, histories):
+            if isinstance(history, Exception):
+                logger.error(f"Error getting latency history of {event}: {history}")
+                # Count at least the latest spike
+                new_spikes = 1
+            else:
+                new_spikes = self._count_new_spikes(event, history)
+            self._spikes[event] = self._spikes.get(event, 0) + max(new_spikes, 1)
+            self._last_timestamps[event] = latest[event][0]
+
+        for event, (timestamp, latest_seconds, max_seconds) in latest.items():
+            labels = {"event_name": event}
+            collector._register_metric("latency_spike_last", float(timestamp), labels=labels)
+            collector._register_metric("latency_spike_duration_seconds", latest_seconds, labels=labels)
+            collector._register_metric("latency_spike_max_duration_seconds", max_seconds, labels=labels)
+
+        # Events are kept after LATENCY RESET, so counters never go away
+        for event, spikes in self._spikes.items():
+            collector._register_metric("latency_spikes_total", float(spikes),
+                                       is_counter=True, labels={"event_name": event})
@@ -0,0 +1,117 @@
+"""MEMORY STATS collector"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+from .metrics import sanitize_metric_name
+from .redis_client import decode_reply, pairs_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Fields that are not byte counts
+_UNITLESS_SUFFIXES = ("ratio", "percentage", "fragmentation", "count", "per_key", "bytes")
+
+
+def memory_stats_metric_name(key: str) -> str:
+    """
+    Metric name for a MEMORY STATS field
+
+    peak.allocated -> memory_stats_peak_allocated_bytes
+    allocator-fragmentation.ratio -> memory_stats_allocator_fragmentation_ratio
+    """
+    name = sanitize_metric_name(key.replace(".", "_").replace("-", "_"))
+    if not name.endswith(_UNITLESS_SUFFIXES):
+        name += "_bytes"
+    return f"memory_stats_{name}"
+
+
+class MemoryStatsCollector:
+    """
+    Exports MEMORY STATS on its own interval
+
+    The mapping of reply fields to metric names (including per-db
+    "db.N" sub-fields) is compiled the first time a field is seen and
+    reused afterwards, so a refresh only converts values.
+    """
+
+    def __init__(self, interval: float = 60.0):
+        """
+        Args:
+            interval: Min seconds between MEMORY STATS calls
+        """
+        self.interval = interval
+        self.supported = True
+        self.last_refresh: Optional[float] = None
+        self.samples: List[Tuple[str, float, Dict[str, str]]] = []
+
+        # Compiled flattening plan: field -> metric name
+        self._plan: Dict[str, str] = {}
+        self._db_plan: Dict[str, str] = {}
+
+    def _compile(self, plan: Dict[str, str], key: str, prefix: str = "") -> str:
+        name = plan.get(key)
+        if name is None:
+            name = memory_stats_metric_name(prefix + key)
+            plan[key] = name
+        return name
+
+    def flatten(self, reply: object) -> List[Tuple[str, float, Dict[str, str]]]:
+        """
+        Flatten MEMORY STATS reply into (metric_name, value, labels)
+
+        Args:
+            reply: Raw MEMORY STATS reply (flat list or RESP3 map)
+        """
+        samples = []
+        for key, value in pairs_to_dict(reply).items():
+            if isinstance(value, (list, dict)):
+                # db.0 -> [overhead.hashtable.main, N, overhead.hashtable.expires, N]
+                if not key.startswith("db."):
+                    continue
+                labels = {"db": "db" + key[3:]}
+                for sub_key, sub_value in pairs_to_dict(value).items():
+                    try:
+                        number = float(sub_value)
+                    except (TypeError, ValueError):
+                        continue
+                    samples.append((self._compile(self._db_plan, sub_key, "db."), number, labels))
+                continue
+
+            try:
+                number = float(decode_reply(value))
+            except ValueError:
+                continue
+            samples.append((self._compile(self._plan, key), number, {}))
+        return samples
+
+    def collect(self, client: redis.Redis, collector: object) -> None:
+        """
+        Refresh MEMORY STATS if the interval passed and register samples
+
+        Args:
+            client: Redis client
+            collector: RedisExporter collector instance
+        """
+        if not self.supported:
+            return
+
+        now = time.time()
+        if self.last_refresh is None or now - self.last_refresh >= self.interval:
+            self.last_refresh = now
+            try:
+                # Two-argument form returns the raw reply
+                self.samples = self.flatten(client.execute_command("MEMORY", "STATS"))
+            except redis.exceptions.ResponseError as e:
+                if "unknown" in str(e).lower():
+                    logger.warning("MEMORY STATS is not supported, disabling memory stats")
+                    self.supported = False
+                    return
+                logger.error(f"Error getting memory stats: {e}")
+            except Exception as e:
+                logger.error(f"Error getting memory stats: {e}")
+
+        for name, value, labels in self.samples:
+            collector._register_metric(name, value, labels=labels)
@@ -2,7 +2,7 @@
 
 import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -100,6 +100,175 @@ def format_latest_fork_usec(value: float) -> float:
     return value / 1e6
 
 
+def parse_metric_patterns(patterns: str) -> List[str]:
+    """
+    Parse comma-separated metric name regexes
+    
+    Raises:
+        ValueError: Invalid regex
+    """
+    result = []
+    for pattern in patterns.split(","):
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid metric pattern {pattern!r}: {e}") from e
+        result.append(pattern)
+    return result
+
+
+class MetricFilter:
+    """
+    Include/exclude metric name regexes compiled into one matcher
+    
+    Patterns match the full exported name (namespace included). A metric
+    is exported if it matches an include pattern (or there are none) and
+    no exclude pattern. Decisions are cached per metric name, so after the
+    first scrape a check is a dict lookup.
+    """
+    
+    def __init__(self, namespace: str, include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None):
+        """
+        Args:
+            namespace: Metric namespace (prefix)
+            include: Regexes of metrics to export
+            exclude: Regexes of metrics to drop
+        """
+        self.namespace = namespace
+        include_re = "|".join(f"(?:{p})" for p in include) if include else ".*"
+        exclude_re = "|".join(f"(?:{p})" for p in exclude) if exclude else ""
+        if exclude_re:
+            # Negative lookahead rejects names fully matching an exclude pattern
+            self._matcher = re.compile(f"(?!(?:{exclude_re})$)(?:{include_re})")
+        else:
+            self._matcher = re.compile(include_re)
+        self._cache: Dict[str, bool] = {}
+    
+    def allows(self, metric_name: str) -> bool:
+        """Check if a metric (name without namespace) is exported"""
+        allowed = self._cache.get(metric_name)
+        if allowed is None:
+            allowed = self._matcher.fullmatch(f"{self.namespace}_{metric_name}") is not None
+            self._cache[metric_name] = allowed
+        return allowed
+
+
+# Label value of series summing everything outside a top-N selection
+OTHER_LABEL_VALUE = "other"
+
+# A candidate replaces the weakest top-N member only if its score is this much higher
+TOP_N_HYSTERESIS = 1.2
+
+
+def parse_name_list(names: str) -> List[str]:
+    """Parse comma-separated list of names"""
+    return [name.strip() for name in names.split(",") if name.strip()]
+
+
+class TopNSelector:
+    """
+    Selects names (commands, error types) exported as own series
+    
+    With an allow-list only listed names are candidates. With top_n > 0
+    the top_n candidates by score are selected; membership is sticky: a
+    new name replaces the weakest member only if its score is
+    TOP_N_HYSTERESIS times higher, so series don't churn when scores are
+    close. Everything not selected is summed into an "other" series.
+    
+    "other" of counters is a running total of increases of the names outside
+    the selection (see other_totals), so it doesn't drop when a name is
+    promoted into the top-N, which Prometheus would take for a counter reset.
+    """
+    
+    def __init__(self, top_n: int = 0, allow: Optional[List[str]] = None,
+                 hysteresis: float = TOP_N_HYSTERESIS):
+        """
+        Args:
+            top_n: Max number of selected names (0 - no limit)
+            allow: Names that may be selected (None - any)
+            hysteresis: Score ratio needed to replace a member
+        """
+        self.top_n = top_n
+        self.allow = set(allow) if allow else None
+        self.hysteresis = hysteresis
+        self.members: Set[str] = set()
+        
+        # Counter values of every name and names outside the selection on last other_totals call
+        self._last_values: Dict[str, Sequence[float]] = {}
+        self._last_other: Set[str] = set()
+        self._other_totals: Optional[List[float]] = None
+    
+    def select(self, scores: Dict[str, float]) -> Set[str]:
+        """
+        Select names to export individually
+        
+        Args:
+            scores: Score (calls, usec, count) per name
+        """
+        candidates = scores if self.allow is None else {n: v for n, v in scores.items() if n in self.allow}
+        if self.top_n <= 0 or len(candidates) <= self.top_n:
+            self.members = set(candidates)
+            return self.members
+        
+        members = {name for name in self.members if name in candidates}
+        ranked = sorted(candidates, key=candidates.get, reverse=True)
+        for name in ranked:
+            if len(members) >= self.top_n:
+                break
+            members.add(name)
+        
+        # Replace weakest members by clearly stronger outsiders
+        for name in ranked:
+            if name in members:
+                continue
+            weakest = min(members, key=candidates.get)
+            if candidates[name] <= candidates[weakest] * self.hysteresis:
+                break
+            members.remove(weakest)
+            members.add(name)
+        
+        self.members = members
+        return members
+    
+    def other_totals(self, values: Dict[str, Sequence[float]]) -> Optional[List[float]]:
+        """
+        Monotonic totals of counters of names outside the last selection
+        
+        The first call starts from the plain sum. Later a name outside the
+        selection adds its increase since the previous call, counting from
+        zero if it is new or its counters went down (server restart); a name
+        just demoted from the selection only adds its future increases.
+        
+        Args:
+            values: Counter values per name (same length for every name)
+        
+        Returns:
+            Totals per counter, None if no name was ever outside the selection
+        """
+        totals = self._other_totals
+        other = {name for name in values if name not in self.members}
+        for name in other:
+            current = values[name]
+            if totals is None:
+                totals = [0.0] * len(current)
+            last = self._last_values.get(name)
+            if last is not None and name not in self._last_other:
+                # Demoted: increases up to now were exported in its own series
+                continue
+            for i, value in enumerate(current):
+                increase = value - last[i] if last is not None and value >= last[i] else value
+                totals[i] += increase
+        
+        self._last_values = dict(values)
+        self._last_other = other
+        self._other_totals = totals
+        return totals
+
+
 def should_include_metric(field_key: str, metric_map_gauges: Dict[str, str], 
                           metric_map_counters: Dict[str, str]) -> bool:
     """
@@ -0,0 +1,346 @@
+"""
+Prometheus protobuf exposition (io.prometheus.client.MetricFamily, delimited)
+
+Self-contained encoder for the subset of metrics.proto used by the exporter,
+so no generated code or protobuf runtime is needed.
+"""
+
+import math
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from .exposition import MAX_CACHED_LABEL_SETS
+
+CONTENT_TYPE_PROTOBUF = ("application/vnd.google.protobuf; proto=io.prometheus.client.MetricFamily; "
+                         "encoding=delimited")
+
+# MetricType enum
+COUNTER = 0
+GAUGE = 1
+SUMMARY = 2
+UNTYPED = 3
+HISTOGRAM = 4
+
+# Native histograms are emitted with schema 0 (bucket boundaries at powers of two)
+NATIVE_SCHEMA = 0
+
+_pack_double = struct.Struct("<d").pack
+
+
+def accepts_protobuf(accept: str) -> bool:
+    """
+    Check if the Accept header prefers the delimited MetricFamily protobuf format
+
+    Protobuf is chosen when it is accepted with a q-value not lower than
+    any other accepted format.
+    """
+    protobuf_q = 0.0
+    other_q = 0.0
+    for accepted in accept.split(","):
+        media_type, *params = [token.strip() for token in accepted.split(";")]
+        values = dict(param.partition("=")[::2] for param in params)
+        try:
+            q = float(values.get("q", "1"))
+        except ValueError:
+            q = 0.0
+        if (media_type == "application/vnd.google.protobuf"
+                and values.get("proto") == "io.prometheus.client.MetricFamily"
+                and values.get("encoding") == "delimited"):
+            protobuf_q = max(protobuf_q, q)
+        elif media_type:
+            other_q = max(other_q, q)
+    return protobuf_q > 0 and protobuf_q >= other_q
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode unsigned varint"""
+    if value < 0x80:
+        return bytes((value,))
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def encode_zigzag(value: int) -> bytes:
+    """Encode signed varint (sint32/sint64)"""
+    return encode_varint((value << 1) ^ (value >> 63))
+
+
+def _tag(field: int, wire_type: int) -> bytes:
+    return encode_varint((field << 3) | wire_type)
+
+
+def field_varint(field: int, value: int) -> bytes:
+    """Encode varint field"""
+    return _tag(field, 0) + encode_varint(value)
+
+
+def field_double(field: int, value: float) -> bytes:
+    """Encode double field"""
+    return _tag(field, 1) + _pack_double(value)
+
+
+def field_bytes(field: int, value: bytes) -> bytes:
+    """Encode length-delimited field"""
+    return _tag(field, 2) + encode_varint(len(value)) + value
+
+
+def field_string(field: int, value: str) -> bytes:
+    """Encode string field"""
+    return field_bytes(field, value.encode("utf-8"))
+
+
+def encode_label_pairs(labels: Dict[str, str]) -> bytes:
+    """Encode Metric.label (repeated LabelPair)"""
+    return b"".join(field_bytes(1, field_string(1, name) + field_string(2, value))
+                    for name, value in labels.items())
+
+
+def family_header(name: str, help_text: str, metric_type: int) -> bytes:
+    """Encode MetricFamily name, help and type fields"""
+    return field_string(1, name) + field_string(2, help_text) + field_varint(3, metric_type)
+
+
+def encode_family(header: bytes, metrics: List[bytes]) -> bytes:
+    """Encode a length-prefixed MetricFamily from its header and encoded Metric messages"""
+    body = header + b"".join(field_bytes(4, metric) for metric in metrics)
+    return encode_varint(len(body)) + body
+
+
+def _count(value: float) -> int:
+    return int(value) if math.isfinite(value) and value > 0 else 0
+
+
+def native_layout(bounds: Tuple[float, ...]) -> Optional[Tuple[bool, List[int]]]:
+    """
+    Map classic bucket bounds onto native (schema 0) bucket indexes
+
+    A layout qualifies if its finite bounds are consecutive exact powers of
+    two in the base unit (the upper bounds 2^i of native buckets), optionally
+    after a leading 0 bound that becomes the zero bucket. Other layouts,
+    including powers of two in a scaled unit (1e-6 * 2^i seconds), stay
+    classic so bucket boundaries are never moved.
+
+    Returns:
+        Tuple (has_zero_bucket, native index per positive bound) or None
+    """
+    finite = [b for b in bounds if math.isfinite(b)]
+    has_zero = bool(finite) and finite[0] == 0
+    if has_zero:
+        finite = finite[1:]
+    if not finite or any(b <= 0 for b in finite):
+        return None
+
+    indexes = []
+    for bound in finite:
+        mantissa, exponent = math.frexp(bound)
+        # frexp: bound = mantissa * 2^exponent, 0.5 <= mantissa < 1
+        if mantissa != 0.5:
+            return None
+        indexes.append(exponent - 1)
+    if any(b - a != 1 for a, b in zip(indexes, indexes[1:])):
+        return None
+    return has_zero, indexes
+
+
+def encode_classic_buckets(buckets: List[Tuple[float, float]]) -> bytes:
+    """Encode Histogram.bucket fields (cumulative, +Inf omitted)"""
+    return b"".join(field_bytes(3, field_varint(1, _count(count)) + field_double(2, le))
+                    for le, count in buckets if math.isfinite(le))
+
+
+def encode_native_buckets(buckets: List[Tuple[float, float]], layout: Tuple[bool, List[int]]) -> bytes:
+    """
+    Encode native histogram fields from cumulative classic buckets
+
+    Each classic bucket's observations go to the native bucket holding its
+    upper bound; observations above the last finite bound go to the next
+    native bucket. Only non-empty buckets are sent (spans + count deltas).
+    """
+    has_zero, indexes = layout
+    counts = []
+    previous = 0
+    for _, cumulative in buckets:
+        current = _count(cumulative)
+        counts.append(current - previous)
+        previous = current
+
+    zero_count = 0
+    if has_zero:
+        zero_count, counts = counts[0], counts[1:]
+    indexes = indexes + [indexes[-1] + 1]
+
+    populated = [(index, count) for index, count in zip(indexes, counts) if count > 0]
+
+    body = _tag(5, 0) + encode_zigzag(NATIVE_SCHEMA) + field_double(6, 0.0) + field_varint(7, zero_count)
+    if not populated:
+        # No-op span marks an empty histogram as native
+        return body + field_bytes(12, field_varint(1, 0) + field_varint(2, 0))
+
+    spans = []
+    deltas = bytearray()
+    span_start = previous_index = populated[0][0]
+    span_length = 0
+    span_offset = span_start
+    previous_count = 0
+    for index, count in populated:
+        if index != previous_index + 1 and span_length:
+            spans.append((span_offset, span_length))
+            span_offset = index - previous_index - 1
+            span_length = 0
+        span_length += 1
+        previous_index = index
+        deltas += encode_zigzag(count - previous_count)
+        previous_count = count
+    spans.append((span_offset, span_length))
+
+    for offset, length in spans:
+        body += field_bytes(12, _tag(1, 0) + encode_zigzag(offset) + field_varint(2, length))
+    return body + field_bytes(13, bytes(deltas))
+
+
+class ProtobufRenderer:
+    """
+    Encodes RedisCollector accumulators as delimited MetricFamily messages
+
+    Histograms with a power-of-two layout are sent as native sparse
+    histograms (optionally with their classic buckets too), the rest as
+    classic histograms. Family headers, label pairs and native layouts are
+    cached across scrapes.
+    """
+
+    def __init__(self, namespace: str, classic_histograms: bool = False):
+        """
+        Args:
+            namespace: Metric namespace (prefix)
+            classic_histograms: Also send classic buckets of native histograms
+        """
+        self.namespace = namespace
+        self.classic_histograms = classic_histograms
+
+        # (metric_name, type) -> encoded family header
+        self._headers: Dict[Tuple[str, int], bytes] = {}
+        # label items -> encoded label pairs
+        self._labels: Dict[Tuple, bytes] = {}
+        # bucket bounds -> native layout (None for classic)
+        self._layouts: Dict[Tuple[float, ...], Optional[Tuple[bool, List[int]]]] = {}
+
+    def _header(self, metric_name: str, metric_type: int) -> bytes:
+        key = (metric_name, metric_type)
+        header = self._headers.get(key)
+        if header is None:
+            header = family_header(f"{self.namespace}_{metric_name}", metric_name, metric_type)
+            self._headers[key] = header
+        return header
+
+    def _label_pairs(self, labels: Dict[str, str]) -> bytes:
+        key = tuple(labels.items())
+        encoded = self._labels.get(key)
+        if encoded is None:
+            if len(self._labels) >= MAX_CACHED_LABEL_SETS:
+                self._labels.clear()
+            encoded = encode_label_pairs(labels)
+            self._labels[key] = encoded
+        return encoded
+
+    def _layout(self, buckets: List[Tuple[float, float]]) -> Optional[Tuple[bool, List[int]]]:
+        bounds = tuple(le for le, _ in buckets)
+        if bounds not in self._layouts:
+            self._layouts[bounds] = native_layout(bounds)
+        return self._layouts[bounds]
+
+    def encode_histogram(self, buckets: List[Tuple[float, float]], sum_value: Optional[float]) -> bytes:
+        """Encode Histogram message"""
+        body = field_varint(1, _count(buckets[-1][1]) if buckets else 0)
+        if sum_value is not None:
+            body += field_double(2, sum_value)
+        layout = self._layout(buckets) if buckets else None
+        if layout is None or self.classic_histograms:
+            body += encode_classic_buckets(buckets)
+        if layout is not None:
+            body += encode_native_buckets(buckets, layout)
+        return body
+
+    def render(self, collector: object) -> bytes:
+        """Encode metrics of the last scrape"""
+        out = []
+        label_pairs = self._label_pairs
+
+        for metric_name, metrics_list in collector._current_metrics.items():
+            if not metrics_list:
+                continue
+            is_counter = metric_name.endswith("_total")
+            value_field = 3 if is_counter else 2
+            metrics = [label_pairs(m["labels"]) + field_bytes(value_field, field_double(1, m["value"]))
+                       for m in metrics_list]
+            out.append(encode_family(self._header(metric_name, COUNTER if is_counter else GAUGE), metrics))
+
+        for metric_name, histograms_list in collector._current_histograms.items():
+            metrics = [label_pairs(h["labels"]) + field_bytes(7, self.encode_histogram(h["buckets"], h["sum"]))
+                       for h in histograms_list]
+            out.append(encode_family(self._header(metric_name, HISTOGRAM), metrics))
+
+        return b"".join(out)
+
+    def render_registry(self, registry: object) -> bytes:
+        """Encode metrics of a prometheus_client registry (process, runtime and custom collectors)"""
+        out = []
+        for family in registry.collect():
+            if family.type == "histogram":
+                out.append(self._registry_histogram(family))
+            elif family.type == "summary":
+                out.append(self._registry_summary(family))
+            else:
+                out.extend(self._registry_simple(family))
+        return b"".join(out)
+
+    def _registry_simple(self, family) -> List[bytes]:
+        # Samples are grouped by name: counter _total values, gauges, info and stateset series
+        by_name: Dict[str, List[bytes]] = {}
+        for sample in family.samples:
+            if sample.name.endswith("_created"):
+                continue
+            if family.type == "counter":
+                metric = field_bytes(3, field_double(1, sample.value))
+            elif family.type in ("unknown", "untyped"):
+                metric = field_bytes(5, field_double(1, sample.value))
+            else:
+                metric = field_bytes(2, field_double(1, sample.value))
+            by_name.setdefault(sample.name, []).append(self._label_pairs(sample.labels) + metric)
+
+        metric_type = {"counter": COUNTER, "unknown": UNTYPED, "untyped": UNTYPED}.get(family.type, GAUGE)
+        return [encode_family(family_header(name, family.documentation, metric_type), metrics)
+                for name, metrics in by_name.items()]
+
+    def _registry_histogram(self, family) -> bytes:
+        series: Dict[Tuple, Dict] = {}
+        for sample in family.samples:
+            labels = {k: v for k, v in sample.labels.items() if k != "le"}
+            entry = series.setdefault(tuple(labels.items()), {"labels": labels, "buckets": [], "sum": None})
+            if sample.name.endswith("_bucket"):
+                entry["buckets"].append((float(sample.labels["le"]), sample.value))
+            elif sample.name.endswith("_sum"):
+                entry["sum"] = sample.value
+        metrics = [self._label_pairs(entry["labels"]) +
+                   field_bytes(7, self.encode_histogram(entry["buckets"], entry["sum"]))
+                   for entry in series.values()]
+        return encode_family(family_header(family.name, family.documentation, HISTOGRAM), metrics)
+
+    def _registry_summary(self, family) -> bytes:
+        series: Dict[Tuple, Dict] = {}
+        for sample in family.samples:
+            labels = {k: v for k, v in sample.labels.items() if k != "quantile"}
+            entry = series.setdefault(tuple(labels.items()), {"labels": labels, "body": b""})
+            if sample.name.endswith("_count"):
+                entry["body"] += field_varint(1, _count(sample.value))
+            elif sample.name.endswith("_sum"):
+                entry["body"] += field_double(2, sample.value)
+            elif "quantile" in sample.labels:
+                entry["body"] += field_bytes(3, field_double(1, float(sample.labels["quantile"])) +
+                                             field_double(2, sample.value))
+        metrics = [self._label_pairs(entry["labels"]) + field_bytes(4, entry["body"])
+                   for entry in series.values()]
+        return encode_family(family_header(family.name, family.documentation, SUMMARY), metrics)
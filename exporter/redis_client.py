@@ -1,7 +1,8 @@
 """Redis client connection module"""
 
 import logging
-from typing import Optional
+import threading
+from typing import Callable, Dict, Optional, Type
 from urllib.parse import urlparse
 
 import redis
@@ -9,12 +10,75 @@ import redis
 logger = logging.getLogger(__name__)
 
 
+class RedisTraffic:
+    """Commands sent and bytes read by connections counting into it (thread-safe)"""
+
+    def __init__(self):
+        self.commands = 0
+        self.read_bytes = 0
+        self._lock = threading.Lock()
+
+    def add_commands(self, count: int) -> None:
+        with self._lock:
+            self.commands += count
+
+    def add_read_bytes(self, count: int) -> None:
+        with self._lock:
+            self.read_bytes += count
+
+
+class _CountingSocket:
+    """Socket proxy counting received bytes"""
+
+    def __init__(self, sock, traffic: RedisTraffic):
+        self._sock = sock
+        self._traffic = traffic
+
+    def recv(self, *args, **kwargs):
+        data = self._sock.recv(*args, **kwargs)
+        self._traffic.add_read_bytes(len(data))
+        return data
+
+    def recv_into(self, *args, **kwargs):
+        count = self._sock.recv_into(*args, **kwargs)
+        self._traffic.add_read_bytes(count)
+        return count
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+def counting_connection_class(connection_class: Type, traffic: RedisTraffic) -> Type:
+    """Subclass of a redis-py connection class counting commands and bytes read into traffic"""
+
+    class CountingConnection(connection_class):
+        def send_command(self, *args, **kwargs):
+            traffic.add_commands(1)
+            return super().send_command(*args, **kwargs)
+
+        def pack_commands(self, commands):
+            # Pipelines are packed at once and sent with send_packed_command
+            commands = list(commands)
+            traffic.add_commands(len(commands))
+            return super().pack_commands(commands)
+
+        def _connect(self):
+            return _CountingSocket(super()._connect(), traffic)
+
+    CountingConnection.__name__ = f"Counting{connection_class.__name__}"
+    return CountingConnection
+
+
 def connect_to_redis(
     redis_addr: str,
     password: str = "",
     user: str = "",
     connection_timeout: float = 15.0,
     set_client_name: bool = True,
+    protocol: int = 2,
+    max_connections: Optional[int] = None,
+    redis_connect_func: Optional[Callable] = None,
+    traffic: Optional[RedisTraffic] = None,
 ) -> redis.Redis:
     """
     Connect to Redis instance
@@ -25,6 +89,11 @@ def connect_to_redis(
         user: Username for authentication (Redis 6.0+ ACL)
         connection_timeout: Connection timeout in seconds
         set_client_name: Whether to set client name to redis_exporter
+        protocol: RESP protocol version (3 is required for CLIENT TRACKING)
+        max_connections: Max number of pooled connections (unlimited if None)
+        redis_connect_func: Called with every new connection instead of
+            the default connection setup
+        traffic: Counts commands sent and bytes read by the client
     
     Returns:
         redis.Redis instance
@@ -67,6 +136,13 @@ def connect_to_redis(
     if url_user:
         conn_params["username"] = url_user
     
+    if protocol != 2:
+        conn_params["protocol"] = protocol
+    if max_connections is not None:
+        conn_params["max_connections"] = max_connections
+    if redis_connect_func is not None:
+        conn_params["redis_connect_func"] = redis_connect_func
+    
     if use_tls:
         conn_params["ssl"] = True
         # Skip SSL verification for basic use case
@@ -74,6 +150,9 @@ def connect_to_redis(
     
     # Create Redis client
     client = redis.Redis(**conn_params)
+    if traffic is not None:
+        pool = client.connection_pool
+        pool.connection_class = counting_connection_class(pool.connection_class, traffic)
     
     # Set client name if requested
     if set_client_name:
@@ -114,3 +193,23 @@ def do_redis_cmd(client: redis.Redis, cmd: str, *args) -> Optional[object]:
         logger.error(f"Command failed: {e}")
         raise
 
+
+
+def decode_reply(value: object) -> str:
+    """Convert a raw reply item (bytes, int, ...) to string"""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def pairs_to_dict(reply: object) -> Dict[str, object]:
+    """
+    Convert a flat [key, value, key, value, ...] reply to dict
+    
+    RESP3 maps (already dicts) are accepted too. Keys are decoded to str,
+    values are kept as-is.
+    """
+    if isinstance(reply, dict):
+        return {decode_reply(k): v for k, v in reply.items()}
+    items = list(reply)
+    return {decode_reply(items[i]): items[i + 1] for i in range(0, len(items) - 1, 2)}
@@ -0,0 +1,100 @@
+"""TTL-cached CONFIG GET collector"""
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+import redis
+
+from .metrics import parse_metric_value, sanitize_metric_name
+from .redis_client import decode_reply, pairs_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Error fragments meaning CONFIG can't be used at all
+_UNSUPPORTED_ERRORS = ("unknown command", "noperm", "no permissions")
+
+
+def parse_config_patterns(patterns: str) -> List[str]:
+    """Split comma-separated CONFIG GET patterns"""
+    return [p.strip() for p in patterns.split(",") if p.strip()]
+
+
+class ConfigCollector:
+    """
+    Exports CONFIG GET values cached for ttl seconds
+
+    All patterns are fetched in one pipeline once per TTL; scrapes in
+    between register cached values without talking to Redis. Numeric
+    settings are exported as config_<name> gauges, the rest as
+    config_key_value{key, value}.
+    """
+
+    def __init__(self, patterns: List[str], ttl: float = 300.0, command: str = "CONFIG"):
+        """
+        Args:
+            patterns: CONFIG GET glob patterns
+            ttl: Seconds between CONFIG GET calls
+            command: Name of the CONFIG command (it is often renamed)
+        """
+        self.patterns = patterns
+        self.ttl = ttl
+        self.command = command
+
+        self.supported = True
+        self.values: Dict[str, str] = {}
+        self.last_refresh: Optional[float] = None
+
+    def _is_unsupported(self, error: Exception) -> bool:
+        message = str(error).lower()
+        return any(fragment in message for fragment in _UNSUPPORTED_ERRORS)
+
+    def refresh(self, client: redis.Redis) -> None:
+        """Fetch all patterns with one pipeline and replace cached values"""
+        pipe = client.pipeline(transaction=False)
+        for pattern in self.patterns:
+            pipe.execute_command(self.command, "GET", pattern)
+        replies = pipe.execute(raise_on_error=False)
+
+        values = {}
+        for pattern, reply in zip(self.patterns, replies):
+            if isinstance(reply, Exception):
+                if self._is_unsupported(reply):
+                    logger.warning(f"{self.command} GET is not available ({reply}), disabling config metrics")
+                    self.supported = False
+                    return
+                logger.error(f"Error getting config {pattern}: {reply}")
+                continue
+            for key, value in pairs_to_dict(reply).items():
+                values[key] = decode_reply(value)
+
+        self.values = values
+
+    def collect(self, client: redis.Redis, collector: object) -> None:
+        """
+        Refresh values if the TTL expired and register cached values
+
+        Args:
+            client: Redis client
+            collector: RedisExporter collector instance
+        """
+        if not self.supported or not self.patterns:
+            return
+
+        now = time.time()
+        if self.last_refresh is None or now - self.last_refresh >= self.ttl:
+            # Errors are retried after TTL, cached values are served meanwhile
+            self.last_refresh = now
+            try:
+                self.refresh(client)
+            except Exception as e:
+                logger.error(f"Error getting config: {e}")
+            if not self.supported:
+                return
+
+        for key, value in self.values.items():
+            number = parse_metric_value(value) if value else None
+            if number is not None:
+                collector._register_metric(f"config_{sanitize_metric_name(key)}", number)
+            else:
+                collector._register_metric("config_key_value", 1.0, labels={"key": key, "value": value})
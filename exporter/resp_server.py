@@ -0,0 +1,571 @@
+"""
+Asyncio RESP server standing in for Redis in load and latency tests
+
+Answers INFO, SCAN, TYPE, the size commands, CONFIG GET, SLOWLOG and CLUSTER
+with synthetic data. Keys are virtual (computed from their index), so a
+keyspace of millions of keys costs no memory. Per-command latency, errors
+and stalls can be injected to reproduce slow or failing servers offline.
+
+Usage: python -m exporter.resp_server --port 6390 --keys 1000000 --latency INFO=0.05
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Key types of a virtual keyspace, cycled by key index
+KEY_TYPES = ("string", "hash", "list", "set", "zset", "stream")
+
+# Sections returned by INFO without arguments (as in Redis 7)
+DEFAULT_INFO_SECTIONS = ("server", "clients", "memory", "persistence", "stats", "replication",
+                         "cpu", "modules", "errorstats", "cluster", "keyspace")
+
+SLOWLOG_MAX_LEN = 128
+
+CLUSTER_SLOTS = 16384
+
+# Max size of a RESP request (bulk strings and array lengths are checked against it)
+MAX_REQUEST_SIZE = 512 * 1024 * 1024
+
+
+class RespError(Exception):
+    """Error sent to the client as a RESP error reply"""
+
+
+class Status(str):
+    """Reply sent as a RESP simple string"""
+
+
+OK = Status("OK")
+
+
+def encode(value: object, resp3: bool = False) -> bytes:
+    """Encode a reply value as RESP2 (or RESP3, which only differs for maps here)"""
+    if isinstance(value, Status):
+        return b"+" + value.encode() + b"\r\n"
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return b"-" + str(value).encode() + b"\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item, resp3) for item in value)
+    if isinstance(value, dict):
+        items = b"".join(encode(k, resp3) + encode(v, resp3) for k, v in value.items())
+        if resp3:
+            return b"%%%d\r\n" % len(value) + items
+        return b"*%d\r\n" % (len(value) * 2) + items
+    raise TypeError(f"Cannot encode {type(value).__name__} as RESP")
+
+
+def make_info(commands: int = 50, errors: int = 5, dbs: int = 1, replicas: int = 0,
+              keys: Optional[Dict[int, int]] = None, cluster: bool = False) -> str:
+    """
+    Raw INFO reply (all sections) of an instance with the given cardinalities
+
+    Args:
+        commands: Number of cmdstat_* lines
+        errors: Number of errorstat_* lines
+        dbs: Number of keyspace dbN lines (ignored if keys is given)
+        replicas: Number of connected replicas (slaveN lines)
+        keys: Key count per db for the Keyspace section
+        cluster: Value of cluster_enabled
+    """
+    if keys is None:
+        keys = {db: 1000 + db for db in range(dbs)}
+    lines = [
+        "# Server", "redis_version:7.2.0", f"redis_mode:{'cluster' if cluster else 'standalone'}",
+        "os:Linux 6.0.0", "arch_bits:64", "process_id:12345", "run_id:abcd1234efgh5678",
+        "tcp_port:6379", "uptime_in_seconds:86400", "uptime_in_days:1", "hz:10", "configured_hz:10",
+        "# Clients", "connected_clients:10", "maxclients:10000", "blocked_clients:0",
+        "tracking_clients:0", "clients_in_timeout_table:0",
+        "# Memory", "used_memory:1048576", "used_memory_rss:2097152", "used_memory_peak:2097152",
+        "used_memory_lua:32768", "maxmemory:0", "maxmemory_policy:noeviction",
+        "mem_fragmentation_ratio:2.00", "mem_allocator:jemalloc-5.3.0",
+        "# Persistence", "loading:0", "rdb_changes_since_last_save:0", "rdb_bgsave_in_progress:0",
+        "rdb_last_save_time:1234567890", "rdb_last_bgsave_status:ok", "aof_enabled:0",
+        "# Stats", "total_connections_received:1000", "total_commands_processed:50000",
+        "instantaneous_ops_per_sec:10", "total_net_input_bytes:100000", "total_net_output_bytes:500000",
+        "rejected_connections:5", "expired_keys:100", "evicted_keys:50", "keyspace_hits:20000",
+        "keyspace_misses:5000", "pubsub_channels:3", "pubsub_patterns:5", "latest_fork_usec:1500",
+        "total_forks:5",
+        "# Replication", "role:master", f"connected_slaves:{replicas}",
+    ]
+    lines += [f"slave{i}:ip=10.0.{i // 256}.{i % 256},port=6379,state=online,offset=1000,lag=0"
+              for i in range(replicas)]
+    lines += [
+        "master_failover_state:no-failover", "master_replid:abcd1234efgh5678",
+        "master_repl_offset:1000", "repl_backlog_active:1", "repl_backlog_size:1048576",
+        "# CPU", "used_cpu_sys:10.5", "used_cpu_user:20.3", "used_cpu_sys_children:5.0",
+        "used_cpu_user_children:15.0",
+        "# Modules",
+        "# Errorstats",
+    ]
+    lines += [f"errorstat_ERR{i}:count={i + 1}" for i in range(errors)]
+    lines += ["# Cluster", f"cluster_enabled:{int(cluster)}", "# Keyspace"]
+    lines += [f"db{db}:keys={count},expires=0,avg_ttl=0" for db, count in sorted(keys.items()) if count]
+    lines.append("# Commandstats")
+    lines += [f"cmdstat_command{i}:calls={i * 100},usec={i * 500},usec_per_call=5.00,"
+              f"rejected_calls=0,failed_calls=0" for i in range(commands)]
+    return "\r\n".join(lines) + "\r\n"
+
+
+def split_info_sections(info: str) -> Dict[str, str]:
+    """Split INFO text into {lowercase section name: text including header}"""
+    sections: Dict[str, str] = {}
+    name = ""
+    for block in re.split(r"(?m)^(?=# )", info):
+        if block.startswith("# "):
+            name = block[2:block.find("\r\n") if "\r\n" in block else len(block)].strip().lower()
+        if block.strip():
+            sections[name] = sections.get(name, "") + block
+    return sections
+
+
+class VirtualKeyspace:
+    """
+    Keys named prefix + index, computed on demand
+
+    The type cycles through KEY_TYPES and the size is derived from the index,
+    so nothing is stored per key.
+    """
+
+    def __init__(self, keys: int, prefix: str = "key:", max_size: int = 1000):
+        self.keys = keys
+        self.prefix = prefix
+        self.max_size = max_size
+        self._prefix_bytes = prefix.encode()
+        self._patterns: Dict[bytes, Pattern] = {}
+
+    def name(self, index: int) -> bytes:
+        return self._prefix_bytes + str(index).encode()
+
+    def index(self, key: bytes) -> Optional[int]:
+        """Index of key, None if it doesn't exist"""
+        suffix = key[len(self._prefix_bytes):]
+        if not key.startswith(self._prefix_bytes) or not suffix.isdigit() or suffix != str(int(suffix)).encode():
+            return None
+        index = int(suffix)
+        return index if index < self.keys else None
+
+    def type(self, index: int) -> str:
+        return KEY_TYPES[index % len(KEY_TYPES)]
+
+    def value(self, index: int) -> bytes:
+        """String value (numeric for even indexes)"""
+        return str(index).encode() if index % 2 == 0 else b"value-%d" % index
+
+    def size(self, index: int) -> int:
+        if self.type(index) == "string":
+            return len(self.value(index))
+        return (index * 2654435761) % self.max_size + 1
+
+    def scan(self, cursor: int, match: Optional[bytes], count: int,
+             key_type: Optional[str]) -> Tuple[int, List[bytes]]:
+        """SCAN over indexes [cursor, cursor + count)"""
+        end = min(cursor + count, self.keys)
+        regex = None
+        if match is not None and match != b"*":
+            regex = self._patterns.get(match)
+            if regex is None:
+                regex = self._patterns[match] = re.compile(fnmatch.translate(match.decode()).encode())
+        batch = []
+        for index in range(cursor, end):
+            if key_type is not None and self.type(index) != key_type:
+                continue
+            name = self.name(index)
+            if regex is None or regex.match(name):
+                batch.append(name)
+        return (end if end < self.keys else 0), batch
+
+
+@dataclass
+class Fault:
+    """Faults injected into replies of a command"""
+    latency: float = 0.0        # seconds added before every reply
+    error_rate: float = 0.0     # probability of an error reply
+    stall_rate: float = 0.0     # probability of a stall
+    stall_seconds: float = 30.0  # duration of a stall
+
+
+class RespServer:
+    """
+    Synthetic Redis server
+
+    Faults are looked up by upper-case command name, then "*", and can be
+    changed while the server is running. Random decisions use a seeded
+    generator, so runs are reproducible.
+    """
+
+    def __init__(self, keyspaces: Optional[Dict[int, VirtualKeyspace]] = None, commands: int = 50,
+                 errors: int = 5, replicas: int = 0, cluster: bool = False,
+                 config: Optional[Dict[str, str]] = None, slowlog_per_second: float = 1.0,
+                 faults: Optional[Dict[str, Fault]] = None, seed: int = 0):
+        self.keyspaces = keyspaces if keyspaces is not None else {0: VirtualKeyspace(1000)}
+        self.cluster = cluster
+        self.config = config if config is not None else {
+            "maxmemory": "0", "maxclients": "10000", "io-threads": "1", "hz": "10",
+            "save": "3600 1 300 100 60 10000", "appendonly": "no", "maxmemory-policy": "noeviction",
+        }
+        self.slowlog_per_second = slowlog_per_second
+        self.faults: Dict[str, Fault] = faults if faults is not None else {}
+        self.random = random.Random(seed)
+        self.started = time.time()
+        self.port = 0
+
+        # Counters for load tests
+        self.connections = 0
+        self.commands_processed = 0
+        self.bytes_read = 0
+
+        info = make_info(commands=commands, errors=errors, replicas=replicas, cluster=cluster,
+                         keys={db: keyspace.keys for db, keyspace in self.keyspaces.items()})
+        self._info_sections = split_info_sections(info)
+        self._handlers: Dict[str, Callable] = {
+            "PING": self._ping, "ECHO": lambda state, message: message,
+            "HELLO": self._hello, "AUTH": lambda state, *args: OK, "CLIENT": lambda state, *args: OK,
+            "SELECT": self._select, "QUIT": lambda state: OK, "COMMAND": lambda state, *args: [],
+            "INFO": self._info, "DBSIZE": lambda state: self._keyspace(state).keys,
+            "SCAN": self._scan, "TYPE": self._type, "GET": self._get, "PFCOUNT": self._pfcount,
+            "STRLEN": self._sized("string"), "LLEN": self._sized("list"), "SCARD": self._sized("set"),
+            "ZCARD": self._sized("zset"), "HLEN": self._sized("hash"), "XLEN": self._sized("stream"),
+            "CONFIG": self._config, "SLOWLOG": self._slowlog, "CLUSTER": self._cluster,
+        }
+
+    def fault(self, command: str) -> Optional[Fault]:
+        return self.faults.get(command) or self.faults.get("*")
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Start listening, returns asyncio server"""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        state = {"db": 0, "resp3": False}
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                reply = await self.execute(state, args)
+                writer.write(encode(reply, state["resp3"]))
+                await writer.drain()
+                if args[0].upper() == b"QUIT":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away or server is stopping
+            pass
+        except RespError as e:
+            # Protocol error, Redis closes the connection after replying
+            writer.write(encode(e))
+        finally:
+            writer.close()
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        self.bytes_read += len(line)
+        if not line.startswith(b"*"):
+            # Inline command
+            return line.split()
+        count = self._length(line)
+        args = []
+        for _ in range(count):
+            header = await reader.readline()
+            if not header.startswith(b"$"):
+                raise RespError("Protocol error: expected '$'")
+            data = await reader.readexactly(self._length(header) + 2)
+            self.bytes_read += len(header) + len(data)
+            args.append(data[:-2])
+        return args
+
+    @staticmethod
+    def _length(line: bytes) -> int:
+        try:
+            length = int(line[1:].strip())
+        except ValueError:
+            raise RespError("Protocol error: invalid length")
+        if not 0 <= length <= MAX_REQUEST_SIZE:
+            raise RespError("Protocol error: invalid length")
+        return length
+
+    async def execute(self, state: dict, args: List[bytes]) -> object:
+        """Run a command with its injected faults, returns reply value"""
+        self.commands_processed += 1
+        command = args[0].decode(errors="replace").upper()
+        fault = self.fault(command)
+        if fault is not None:
+            if fault.latency:
+                await asyncio.sleep(fault.latency)
+            if fault.stall_rate and self.random.random() < fault.stall_rate:
+                await asyncio.sleep(fault.stall_seconds)
+            if fault.error_rate and self.random.random() < fault.error_rate:
+                return RespError(f"ERR injected error for '{command}'")
+
+        handler = self._handlers.get(command)
+        if handler is None:
+            return RespError(f"ERR unknown command '{command}'")
+        try:
+            return handler(state, *args[1:])
+        except RespError as e:
+            return e
+        except (TypeError, ValueError):
+            return RespError(f"ERR wrong number of arguments or invalid argument for '{command}'")
+
+    # Commands (arguments are bytes)
+
+    def _keyspace(self, state: dict) -> VirtualKeyspace:
+        return self.keyspaces.get(state["db"]) or VirtualKeyspace(0)
+
+    def _ping(self, state: dict, *message: bytes) -> object:
+        return message[0] if message else Status("PONG")
+
+    def _hello(self, state: dict, *args: bytes) -> dict:
+        if args:
+            if args[0] not in (b"2", b"3"):
+                raise RespError("NOPROTO unsupported protocol version")
+            state["resp3"] = args[0] == b"3"
+        return {b"server": b"redis", b"version": b"7.2.0", b"proto": 3 if state["resp3"] else 2,
+                b"id": self.connections, b"mode": b"cluster" if self.cluster else b"standalone",
+                b"role": b"master", b"modules": []}
+
+    def _select(self, state: dict, db: bytes) -> Status:
+        state["db"] = int(db)
+        return OK
+
+    def _info(self, state: dict, *sections: bytes) -> bytes:
+        names = {s.decode().lower() for s in sections} or {"default"}
+        if names & {"all", "everything"}:
+            wanted = list(self._info_sections)
+        else:
+            if "default" in names:
+                names |= set(DEFAULT_INFO_SECTIONS)
+            wanted = [name for name in self._info_sections if name in names]
+        return "".join(self._info_sections[name] for name in wanted).encode()
+
+    def _scan(self, state: dict, cursor: bytes, *options: bytes) -> list:
+        match, count, key_type = None, 10, None
+        for name, value in zip(options[::2], options[1::2]):
+            name = name.upper()
+            if name == b"MATCH":
+                match = value
+            elif name == b"COUNT":
+                count = int(value)
+            elif name == b"TYPE":
+                key_type = value.decode().lower()
+            else:
+                raise RespError("ERR syntax error")
+        next_cursor, keys = self._keyspace(state).scan(int(cursor), match, count, key_type)
+        return [str(next_cursor).encode(), keys]
+
+    def _lookup(self, state: dict, key: bytes) -> Tuple[VirtualKeyspace, Optional[int]]:
+        keyspace = self._keyspace(state)
+        return keyspace, keyspace.index(key)
+
+    def _type(self, state: dict, key: bytes) -> Status:
+        keyspace, index = self._lookup(state, key)
+        return Status("none" if index is None else keyspace.type(index))
+
+    def _get(self, state: dict, key: bytes) -> Optional[bytes]:
+        keyspace, index = self._lookup(state, key)
+        if index is None:
+            return None
+        if keyspace.type(index) != "string":
+            raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return keyspace.value(index)
+
+    def _pfcount(self, state: dict, key: bytes) -> int:
+        keyspace, index = self._lookup(state, key)
+        if index is None:
+            return 0
+        raise RespError("WRONGTYPE Key is not a valid HyperLogLog string value.")
+
+    def _sized(self, key_type: str) -> Callable:
+        def size(state: dict, key: bytes) -> int:
+            keyspace, index = self._lookup(state, key)
+            if index is None:
+                return 0
+            if keyspace.type(index) != key_type:
+                raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+            return keyspace.size(index)
+        return size
+
+    def _config(self, state: dict, subcommand: bytes, *args: bytes) -> dict:
+        if subcommand.upper() != b"GET":
+            raise RespError(f"ERR unknown subcommand '{subcommand.decode()}'")
+        reply = {}
+        for pattern in args:
+            for name, value in self.config.items():
+                if fnmatch.fnmatchcase(name, pattern.decode()):
+                    reply[name.encode()] = value.encode()
+        return reply
+
+    def _slowlog_last_id(self) -> int:
+        return int((time.time() - self.started) * self.slowlog_per_second)
+
+    def _slowlog(self, state: dict, subcommand: bytes, *args: bytes) -> object:
+        subcommand = subcommand.upper()
+        last_id = self._slowlog_last_id()
+        length = min(last_id, SLOWLOG_MAX_LEN)
+        if subcommand == b"LEN":
+            return length
+        if subcommand == b"RESET":
+            return OK
+        if subcommand != b"GET":
+            raise RespError(f"ERR unknown subcommand '{subcommand.decode()}'")
+        count = min(int(args[0]) if args else 10, length)
+        return [self._slowlog_entry(entry_id) for entry_id in range(last_id - 1, last_id - 1 - count, -1)]
+
+    def _slowlog_entry(self, entry_id: int) -> list:
+        keyspace = self.keyspaces.get(0) or VirtualKeyspace(1)
+        command = (b"GET", b"HGETALL", b"LRANGE", b"SMEMBERS", b"ZRANGE")[entry_id % 5]
+        return [entry_id, int(self.started) + entry_id, 10000 + (entry_id * 7919) % 100000,
+                [command, keyspace.name(entry_id % max(keyspace.keys, 1))], b"127.0.0.1:50000", b""]
+
+    def _cluster(self, state: dict, subcommand: bytes, *args: bytes) -> object:
+        if not self.cluster:
+            raise RespError("ERR This instance has cluster support disabled")
+        subcommand = subcommand.upper()
+        node_id = b"%040x" % self.port
+        if subcommand == b"INFO":
+            return (f"cluster_enabled:1\r\ncluster_state:ok\r\ncluster_slots_assigned:{CLUSTER_SLOTS}\r\n"
+                    f"cluster_slots_ok:{CLUSTER_SLOTS}\r\ncluster_known_nodes:1\r\ncluster_size:1\r\n").encode()
+        if subcommand == b"NODES":
+            return (b"%s 127.0.0.1:%d@%d myself,master - 0 0 1 connected 0-%d\n"
+                    % (node_id, self.port, self.port + 10000, CLUSTER_SLOTS - 1))
+        if subcommand == b"SHARDS":
+            node = [b"id", node_id, b"port", self.port, b"ip", b"127.0.0.1", b"endpoint", b"127.0.0.1",
+                    b"role", b"master", b"replication-offset", 0, b"health", b"online"]
+            return [[b"slots", [0, CLUSTER_SLOTS - 1], b"nodes", [node]]]
+        if subcommand == b"SLOTS":
+            return [[0, CLUSTER_SLOTS - 1, [b"127.0.0.1", self.port, node_id]]]
+        raise RespError(f"ERR unknown subcommand '{subcommand.decode()}'")
+
+
+class ServerThread:
+    """Runs RespServers on an event loop in a daemon thread, for synchronous clients"""
+
+    def __init__(self, servers: List[RespServer], host: str = "127.0.0.1"):
+        self.servers = servers
+        self.host = host
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="resp-server", daemon=True)
+        self._listeners: List[asyncio.AbstractServer] = []
+
+    def start(self) -> List[int]:
+        """Start all servers on free ports, returns the ports"""
+        self._thread.start()
+        for server in self.servers:
+            future = asyncio.run_coroutine_threadsafe(server.start(self.host, 0), self.loop)
+            self._listeners.append(future.result())
+        return [server.port for server in self.servers]
+
+    def stop(self) -> None:
+        async def close():
+            for listener in self._listeners:
+                listener.close()
+            # Drop open connections, including ones stalled by injected faults
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def __enter__(self) -> "ServerThread":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def parse_faults(latency: List[str], error_rate: List[str], stall: List[str]) -> Dict[str, Fault]:
+    """
+    Parse fault specs: latency CMD=seconds, error rate CMD=probability, stall CMD=probability:seconds
+
+    CMD "*" applies to every command without its own fault.
+    """
+    faults: Dict[str, Fault] = {}
+
+    def fault(spec: str) -> Tuple[Fault, str]:
+        command, sep, value = spec.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid fault spec '{spec}', expected CMD=value")
+        return faults.setdefault(command.upper(), Fault()), value
+
+    for spec in latency:
+        f, value = fault(spec)
+        f.latency = float(value)
+    for spec in error_rate:
+        f, value = fault(spec)
+        f.error_rate = float(value)
+    for spec in stall:
+        f, value = fault(spec)
+        rate, _, seconds = value.partition(":")
+        f.stall_rate = float(rate)
+        if seconds:
+            f.stall_seconds = float(seconds)
+    return faults
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    parser.add_argument("--keys", type=int, default=1000, help="Virtual keys in db0")
+    parser.add_argument("--dbs", type=int, default=1, help="Databases with --keys keys each")
+    parser.add_argument("--key-prefix", default="key:")
+    parser.add_argument("--commands", type=int, default=50, help="cmdstat_* lines in INFO")
+    parser.add_argument("--errors", type=int, default=5, help="errorstat_* lines in INFO")
+    parser.add_argument("--replicas", type=int, default=0, help="Connected replicas in INFO")
+    parser.add_argument("--cluster", action="store_true", help="Answer CLUSTER as a single-node cluster")
+    parser.add_argument("--latency", action="append", default=[], metavar="CMD=SECONDS")
+    parser.add_argument("--error-rate", action="append", default=[], metavar="CMD=PROBABILITY")
+    parser.add_argument("--stall", action="append", default=[], metavar="CMD=PROBABILITY[:SECONDS]")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = RespServer(
+        keyspaces={db: VirtualKeyspace(args.keys, args.key_prefix) for db in range(args.dbs)},
+        commands=args.commands, errors=args.errors, replicas=args.replicas, cluster=args.cluster,
+        faults=parse_faults(args.latency, args.error_rate, args.stall), seed=args.seed,
+    )
+
+    async def serve():
+        listener = await server.start(args.host, args.port)
+        logger.info(f"Serving synthetic Redis on {args.host}:{server.port}")
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Custom metrics from Lua scripts (--script)"""
+
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import redis
+
+from .redis_client import decode_reply
+
+logger = logging.getLogger(__name__)
+
+
+class LuaScript:
+    """Lua script file with its own interval, timeout and cached result"""
+
+    def __init__(self, path: str, source: str, interval: float = 0.0, timeout: Optional[float] = None):
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.source = source
+        self.interval = interval
+        self.timeout = timeout
+
+        self.sha: Optional[str] = None
+        self.last_run: Optional[float] = None
+        self.values: List[Tuple[str, float]] = []
+        self.ok = False
+        self.duration = 0.0
+        self.errors = 0
+
+
+def parse_script_arg(scripts: str, interval: float = 0.0, timeout: Optional[float] = None) -> List[LuaScript]:
+    """
+    Parse --script argument and read script files
+
+    Format: /path/a.lua,/path/b.lua?interval=60&timeout=5
+    interval and timeout override the defaults for a single script.
+
+    Raises:
+        OSError: Script file can't be read
+        ValueError: Invalid interval or timeout
+    """
+    result = []
+    for item in scripts.split(","):
+        item = item.strip()
+        if not item:
+            continue
+
+        path, _, query = item.partition("?")
+        params = parse_qs(query)
+        script_interval = float(params["interval"][0]) if "interval" in params else interval
+        script_timeout = float(params["timeout"][0]) if "timeout" in params else timeout
+
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        result.append(LuaScript(path, source, interval=script_interval, timeout=script_timeout))
+    return result
+
+
+def parse_script_result(reply: object) -> List[Tuple[str, float]]:
+    """
+    Parse script reply
+
+    Format: {name1, value1, name2, value2, ...}
+
+    Returns:
+        List of (name, value), values that aren't numbers are skipped
+    """
+    if not isinstance(reply, (list, tuple)):
+        raise ValueError(f"Script must return an array of name/value pairs, got {reply!r}")
+
+    values = []
+    for i in range(0, len(reply) - 1, 2):
+        name = decode_reply(reply[i])
+        try:
+            values.append((name, float(decode_reply(reply[i + 1]))))
+        except ValueError:
+            logger.debug(f"Couldn't parse script value {name}: {reply[i + 1]}")
+    return values
+
+
+class ScriptCollector:
+    """
+    Runs Lua scripts with EVALSHA and exports their name/value results
+
+    Scripts are registered with SCRIPT LOAD on first use and reloaded if
+    Redis answers NOSCRIPT (restart, SCRIPT FLUSH, failover). A script
+    runs at most once per its interval; cached results are exported in
+    between. Scripts with a timeout run on their own client whose socket
+    timeout is the script timeout.
+    """
+
+    def __init__(self, scripts: List[LuaScript], connect: Callable[[float], redis.Redis]):
+        """
+        Args:
+            scripts: Scripts to run
+            connect: Factory creating a client with the given socket timeout
+        """
+        self.scripts = scripts
+        self.connect = connect
+        self._clients: Dict[float, redis.Redis] = {}
+
+    def _client_for(self, script: LuaScript, client: redis.Redis) -> redis.Redis:
+        if script.timeout is None:
+            return client
+        if script.timeout not in self._clients:
+            self._clients[script.timeout] = self.connect(script.timeout)
+        return self._clients[script.timeout]
+
+    def _drop_client(self, script: LuaScript) -> None:
+        client = self._clients.pop(script.timeout, None)
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def _evalsha(self, script: LuaScript, client: redis.Redis) -> object:
+        if script.sha is None:
+            script.sha = decode_reply(client.script_load(script.source))
+        try:
+            return client.evalsha(script.sha, 0)
+        except redis.exceptions.NoScriptError:
+            logger.info(f"Script {script.filename} isn't cached by Redis, loading it again")
+            script.sha = decode_reply(client.script_load(script.source))
+            return client.evalsha(script.sha, 0)
+
+    def run(self, script: LuaScript, client: redis.Redis) -> None:
+        """Run a script and store its result"""
+        start_time = time.time()
+        try:
+            reply = self._evalsha(script, self._client_for(script, client))
+            script.values = parse_script_result(reply)
+            script.ok = True
+        except Exception as e:
+            logger.error(f"Error running script {script.filename}: {e}")
+            script.values = []
+            script.ok = False
+            script.errors += 1
+            if isinstance(e, redis.exceptions.TimeoutError):
+                # Connection state is unknown after a timeout
+                self._drop_client(script)
+                try:
+                    # The script may still be running and blocking Redis
+                    client.execute_command("SCRIPT", "KILL")
+                except Exception:
+                    pass
+        script.duration = time.time() - start_time
+
+    def collect(self, client: redis.Redis, collector: object) -> None:
+        """
+        Run scripts whose interval passed and register results
+
+        Args:
+            client: Redis client
+            collector: RedisExporter collector instance
+        """
+        now = time.time()
+        for script in self.scripts:
+            if script.last_run is None or now - script.last_run >= script.interval:
+                script.last_run = now
+                self.run(script, client)
+
+            labels = {"filename": script.filename}
+            collector._register_metric("script_result", 1.0 if script.ok else 0.0, labels=labels)
+            collector._register_metric("script_duration_seconds", script.duration, labels=labels)
+            collector._register_metric("script_errors_total", float(script.errors), is_counter=True,
+                                       labels=labels)
+            for name, value in script.values:
+                collector._register_metric("script_values", value,
+                                           labels={"filename": script.filename, "key": name})
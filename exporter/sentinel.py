@@ -0,0 +1,343 @@
+"""Redis Sentinel target resolution and metrics"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+
+import redis
+
+from .redis_client import decode_reply, pairs_to_dict
+
+logger = logging.getLogger(__name__)
+
+SENTINEL_SCHEMES = ("redis+sentinel://", "rediss+sentinel://")
+
+# Sentinel events invalidating the cached address
+_SWITCH_MASTER_CHANNEL = "+switch-master"
+_REPLICA_DOWN_CHANNEL = "+sdown"
+
+# Replica flags that mean the replica can't be used as target
+_BAD_REPLICA_FLAGS = {"s_down", "o_down", "disconnected"}
+
+
+def is_sentinel_addr(redis_addr: str) -> bool:
+    """Check if address uses the redis+sentinel:// form"""
+    return redis_addr.startswith(SENTINEL_SCHEMES)
+
+
+class SentinelTarget:
+    """Parsed redis+sentinel:// address"""
+    def __init__(self, sentinels: List[Tuple[str, int]], master_name: str,
+                 role: str = "master", user: str = "", password: str = "", tls: bool = False):
+        self.sentinels = sentinels
+        self.master_name = master_name
+        self.role = role
+        self.user = user
+        self.password = password
+        self.tls = tls
+
+
+def parse_sentinel_addr(redis_addr: str) -> SentinelTarget:
+    """
+    Parse Sentinel address
+
+    Format: redis+sentinel://[user:password@]host1:26379[,host2:26379]/master_name[?role=replica]
+
+    Credentials in the address are used for Sentinel itself; the Redis
+    password and user options are used for the resolved instance.
+    Use rediss+sentinel:// to connect to the resolved instance with TLS.
+
+    Returns:
+        SentinelTarget object
+    """
+    if not is_sentinel_addr(redis_addr):
+        raise ValueError(f"Not a sentinel address: {redis_addr}")
+
+    tls = redis_addr.startswith("rediss+")
+    rest = redis_addr.split("://", 1)[1]
+
+    query = ""
+    if "?" in rest:
+        rest, query = rest.split("?", 1)
+
+    if "/" not in rest:
+        raise ValueError(f"Sentinel address must include master name: {redis_addr}")
+    netloc, master_name = rest.split("/", 1)
+    master_name = unquote(master_name.strip("/"))
+    if not master_name:
+        raise ValueError(f"Sentinel address must include master name: {redis_addr}")
+
+    user = ""
+    password = ""
+    if "@" in netloc:
+        credentials, netloc = netloc.rsplit("@", 1)
+        if ":" in credentials:
+            user, password = credentials.split(":", 1)
+        else:
+            password = credentials
+        user, password = unquote(user), unquote(password)
+
+    sentinels = []
+    for host_port in netloc.split(","):
+        host_port = host_port.strip()
+        if not host_port:
+            continue
+        if ":" in host_port:
+            host, port = host_port.rsplit(":", 1)
+            sentinels.append((host, int(port)))
+        else:
+            sentinels.append((host_port, 26379))
+    if not sentinels:
+        raise ValueError(f"Sentinel address must include at least one sentinel: {redis_addr}")
+
+    role = parse_qs(query).get("role", ["master"])[0]
+    if role == "slave":
+        role = "replica"
+    if role not in ("master", "replica"):
+        raise ValueError(f"Invalid sentinel role: {role}")
+
+    return SentinelTarget(sentinels, master_name, role, user, password, tls)
+
+
+class SentinelResolver:
+    """
+    Resolves the current master (or a replica) through Sentinel
+
+    The resolved address is cached. A background watcher subscribed to
+    +switch-master (and +sdown for replicas) updates or invalidates it,
+    so Sentinel isn't queried on every scrape.
+    """
+
+    def __init__(self, target: SentinelTarget, connect: Callable[[str, int], redis.Redis]):
+        """
+        Args:
+            target: Parsed sentinel address
+            connect: Factory creating a client for a sentinel (host, port)
+        """
+        self.target = target
+        self.connect = connect
+
+        self.switch_master_events = 0
+        self._address: Optional[Tuple[str, int]] = None
+        self._sentinel_client: Optional[redis.Redis] = None
+        self._lock = threading.Lock()
+        # Guards the shared sentinel client and the sentinel order, used by
+        # scrapes and the exporter's Sentinel metrics concurrently
+        self._sentinel_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def cached_address(self) -> Optional[Tuple[str, int]]:
+        return self._address
+
+    def invalidate(self) -> None:
+        """Drop cached address, it'll be re-resolved on next use"""
+        with self._lock:
+            self._address = None
+
+    def resolve(self) -> Tuple[str, int]:
+        """Get address of the target instance, querying Sentinel only if not cached"""
+        address = self._address
+        if address is not None:
+            return address
+
+        address = self._query_sentinels()
+        with self._lock:
+            self._address = address
+        logger.info(f"Sentinel resolved {self.target.role} of "
+                    f"'{self.target.master_name}' to {address[0]}:{address[1]}")
+        return address
+
+    def sentinel_client(self) -> redis.Redis:
+        """Get shared client of the first reachable sentinel"""
+        with self._sentinel_lock:
+            if self._sentinel_client is None:
+                self._sentinel_client = self._connect_sentinel(self.target.sentinels)
+            return self._sentinel_client
+
+    def _connect_sentinel(self, sentinels: List[Tuple[str, int]]) -> redis.Redis:
+        """Connect a new client to the first reachable of sentinels"""
+        last_error: Optional[Exception] = None
+        for host, port in sentinels:
+            try:
+                return self.connect(host, port)
+            except Exception as e:
+                logger.warning(f"Sentinel {host}:{port} unavailable: {e}")
+                last_error = e
+        raise last_error or redis.exceptions.ConnectionError("No sentinels configured")
+
+    def _query_sentinels(self) -> Tuple[str, int]:
+        last_error: Optional[Exception] = None
+        # Try the current sentinel first, then all others
+        for attempt in range(len(self.target.sentinels)):
+            client = None
+            try:
+                client = self.sentinel_client()
+                if self.target.role == "replica":
+                    return self._query_replica(client)
+                return self._query_master(client)
+            except Exception as e:
+                logger.warning(f"Sentinel query failed: {e}")
+                last_error = e
+                with self._sentinel_lock:
+                    # Another thread may have already replaced the failed client
+                    if client is None or client is self._sentinel_client:
+                        self._close_sentinel_client()
+                        # Rotate so the next attempt starts with another sentinel
+                        self.target.sentinels.append(self.target.sentinels.pop(0))
+        raise last_error or redis.exceptions.ConnectionError("No sentinels configured")
+
+    def _query_master(self, client: redis.Redis) -> Tuple[str, int]:
+        reply = client.execute_command("SENTINEL", "GET-MASTER-ADDR-BY-NAME", self.target.master_name)
+        if not reply:
+            raise redis.exceptions.ResponseError(f"Unknown sentinel master: {self.target.master_name}")
+        return decode_reply(reply[0]), int(reply[1])
+
+    def _query_replica(self, client: redis.Redis) -> Tuple[str, int]:
+        reply = client.execute_command("SENTINEL", "REPLICAS", self.target.master_name)
+        for item in reply or []:
+            replica = pairs_to_dict(item)
+            flags = set(decode_reply(replica.get("flags", "")).split(","))
+            if flags & _BAD_REPLICA_FLAGS:
+                continue
+            return decode_reply(replica["ip"]), int(decode_reply(replica["port"]))
+        raise redis.exceptions.ResponseError(
+            f"No healthy replicas for sentinel master: {self.target.master_name}")
+
+    def _close_sentinel_client(self) -> None:
+        """Close the shared sentinel client (caller holds _sentinel_lock)"""
+        client, self._sentinel_client = self._sentinel_client, None
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def handle_event(self, channel: str, data: str) -> None:
+        """
+        Handle a Sentinel pub/sub event
+
+        +switch-master format: <master-name> <old-ip> <old-port> <new-ip> <new-port>
+        +sdown format: <instance-type> <name> <ip> <port> @ <master-name> <master-ip> <master-port>
+        """
+        parts = data.split(" ")
+
+        if channel == _SWITCH_MASTER_CHANNEL:
+            if len(parts) < 5 or parts[0] != self.target.master_name:
+                return
+            self.switch_master_events += 1
+            logger.info(f"Sentinel: master '{parts[0]}' switched from "
+                        f"{parts[1]}:{parts[2]} to {parts[3]}:{parts[4]}")
+            with self._lock:
+                if self.target.role == "master":
+                    # The event carries the new address, no need to query Sentinel
+                    self._address = (parts[3], int(parts[4]))
+                else:
+                    self._address = None
+
+        elif channel == _REPLICA_DOWN_CHANNEL and self.target.role == "replica":
+            if len(parts) < 4 or parts[0] != "slave" or self._address is None:
+                return
+            if (parts[2], int(parts[3])) == self._address:
+                logger.info(f"Sentinel: replica {parts[2]}:{parts[3]} is down")
+                self.invalidate()
+
+    def start(self) -> None:
+        """Start background watcher of Sentinel events"""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="sentinel-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """Stop background watcher and close sentinel connection"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+        with self._sentinel_lock:
+            self._close_sentinel_client()
+
+    def _watch(self) -> None:
+        # The watcher has its own connection, so it never closes or rotates
+        # the shared client used by scrapes
+        backoff = 1.0
+        while not self._stop.is_set():
+            client = None
+            pubsub = None
+            try:
+                with self._sentinel_lock:
+                    sentinels = list(self.target.sentinels)
+                client = self._connect_sentinel(sentinels)
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                channels = [_SWITCH_MASTER_CHANNEL]
+                if self.target.role == "replica":
+                    channels.append(_REPLICA_DOWN_CHANNEL)
+                pubsub.subscribe(*channels)
+                backoff = 1.0
+
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle_event(decode_reply(message["channel"]), decode_reply(message["data"]))
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                # Events could have been missed, re-resolve on next use
+                logger.warning(f"Sentinel watcher error: {e}")
+                self.invalidate()
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                for closeable in (pubsub, client):
+                    if closeable is not None:
+                        try:
+                            closeable.close()
+                        except Exception:
+                            pass
+
+
+def extract_sentinel_metrics(masters_reply: object, collector: object) -> None:
+    """
+    Extract metrics from SENTINEL MASTERS reply
+
+    Args:
+        masters_reply: Raw SENTINEL MASTERS reply (list of flat key/value lists)
+        collector: RedisExporter collector instance
+    """
+    masters: List[Dict[str, object]] = [pairs_to_dict(item) for item in masters_reply or []]
+
+    collector._register_metric("sentinel_masters", float(len(masters)))
+
+    for master in masters:
+        name = decode_reply(master.get("name", ""))
+        labels = {"master_name": name}
+
+        flags = set(decode_reply(master.get("flags", "")).split(","))
+        status = "odown" if "o_down" in flags else "sdown" if "s_down" in flags else "ok"
+        address = f"{decode_reply(master.get('ip', ''))}:{decode_reply(master.get('port', ''))}"
+
+        collector._register_metric("sentinel_master_status", 1.0 if status == "ok" else 0.0,
+                                   labels={"master_name": name, "master_address": address,
+                                           "master_status": status})
+
+        for field, metric_name in (
+            ("quorum", "sentinel_master_quorum"),
+            ("num-slaves", "sentinel_master_slaves"),
+        ):
+            try:
+                value = float(decode_reply(master.get(field, "")))
+            except ValueError:
+                continue
+            collector._register_metric(metric_name, value, labels=labels)
+
+        # Sentinel reports other sentinels, the replying one is added
+        try:
+            other_sentinels = float(decode_reply(master.get("num-other-sentinels", "")))
+            collector._register_metric("sentinel_master_sentinels", other_sentinels + 1, labels=labels)
+        except ValueError:
+            pass
+
@@ -0,0 +1,211 @@
+"""Incremental SLOWLOG ingestion"""
+
+import bisect
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+from .metrics import TopNSelector
+from .redis_client import decode_reply
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of slow command duration buckets
+SLOWLOG_DURATION_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Command label for commands outside the top max_commands
+OTHER_COMMAND = "other"
+
+# Max number of commands accumulated separately, bounds memory on unexpected names
+MAX_TRACKED_COMMANDS = 1000
+
+
+class _CommandStats:
+    """Accumulated durations of a single command"""
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self, num_buckets: int):
+        # Last bucket is +Inf
+        self.bucket_counts = [0] * (num_buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+def parse_slowlog_entry(entry: list) -> Optional[Tuple[int, float, str]]:
+    """
+    Parse raw SLOWLOG GET entry
+
+    Format: [id, timestamp, duration_usec, [cmd, args...], client_addr, client_name]
+
+    Returns:
+        Tuple (entry_id, duration_seconds, command) or None
+    """
+    try:
+        entry_id = int(entry[0])
+        duration = int(entry[2]) / 1e6
+        args = entry[3]
+    except (IndexError, TypeError, ValueError):
+        logger.debug(f"Couldn't parse slowlog entry: {entry}")
+        return None
+
+    cmd = decode_reply(args[0]).lower() if args else ""
+    return entry_id, duration, cmd
+
+
+class SlowlogCollector:
+    """
+    Accumulates SLOWLOG entries into per-command histograms
+
+    The ID of the last ingested entry is remembered, so each scrape fetches
+    only entries added since the previous one: SLOWLOG LEN and SLOWLOG GET 1
+    tell how many entries are new, then SLOWLOG GET n fetches just those.
+
+    Every command is accumulated, but only the top max_commands by number
+    of slow entries get own series (re-ranked each scrape with the same
+    hysteresis as commandstats top-N), the rest is summed as "other", which
+    never decreases when a command moves into the top.
+    """
+
+    def __init__(self, max_commands: int = 50,
+                 buckets: Tuple[float, ...] = SLOWLOG_DURATION_BUCKETS):
+        """
+        Args:
+            max_commands: Max number of commands with their own series,
+                the top ones by slow entries, the rest is summed as "other"
+            buckets: Upper bounds of duration buckets in seconds
+        """
+        self.max_commands = max_commands
+        self.buckets = buckets
+
+        self.length = 0
+        self.last_id: Optional[int] = None
+        self.last_duration = 0.0
+        self.missed_entries = 0
+        self._commands: Dict[str, _CommandStats] = {}
+        self._selector = TopNSelector(top_n=max_commands)
+
+    def _command_stats(self, cmd: str) -> _CommandStats:
+        stats = self._commands.get(cmd)
+        if stats is None:
+            if len(self._commands) >= MAX_TRACKED_COMMANDS:
+                cmd = OTHER_COMMAND
+                stats = self._commands.get(cmd)
+            if stats is None:
+                stats = _CommandStats(len(self.buckets))
+                self._commands[cmd] = stats
+        return stats
+
+    def ingest(self, entries: List[list]) -> int:
+        """
+        Account entries newer than the last seen ID
+
+        Args:
+            entries: Raw SLOWLOG GET entries (newest first)
+
+        Returns:
+            Number of ingested entries
+        """
+        parsed = [e for e in (parse_slowlog_entry(entry) for entry in entries) if e is not None]
+        if self.last_id is not None:
+            parsed = [e for e in parsed if e[0] > self.last_id]
+        if not parsed:
+            return 0
+
+        # Oldest first, so last_duration ends up with the newest entry
+        for entry_id, duration, cmd in sorted(parsed):
+            stats = self._command_stats(cmd)
+            stats.bucket_counts[bisect.bisect_left(self.buckets, duration)] += 1
+            stats.count += 1
+            stats.sum += duration
+            self.last_id = entry_id
+            self.last_duration = duration
+
+        return len(parsed)
+
+    def _entries_to_fetch(self, length: int, newest_id: int) -> int:
+        if self.last_id is None or newest_id < self.last_id:
+            # First scrape or server restarted: take everything available
+            self.last_id = None
+            return length
+
+        new_entries = newest_id - self.last_id
+        if new_entries > length:
+            # Entries rotated out of the slowlog between scrapes
+            self.missed_entries += new_entries - length
+        return min(new_entries, length)
+
+    def fetch(self, client: redis.Redis) -> None:
+        """Fetch and ingest slowlog entries added since the last call"""
+        pipe = client.pipeline(transaction=False)
+        pipe.execute_command("SLOWLOG", "LEN")
+        pipe.execute_command("SLOWLOG", "GET", 1)
+        length, newest = pipe.execute()
+
+        self.length = int(length)
+        if not newest:
+            return
+
+        newest_id = int(newest[0][0])
+        if newest_id == self.last_id:
+            return
+
+        count = self._entries_to_fetch(self.length, newest_id)
+        if count <= 1:
+            entries = newest
+        else:
+            entries = client.execute_command("SLOWLOG", "GET", count)
+        self.ingest(entries)
+
+    def _selected_commands(self) -> List[Tuple[str, _CommandStats]]:
+        """Top max_commands commands by slow entries, the rest accounted in a monotonic other"""
+        selected = self._selector.select({cmd: stats.count for cmd, stats in self._commands.items()
+                                          if cmd != OTHER_COMMAND})
+
+        result = [(cmd, stats) for cmd, stats in self._commands.items() if cmd in selected]
+        if len(result) < len(self._commands):
+            totals = self._selector.other_totals({
+                cmd: (*stats.bucket_counts, stats.count, stats.sum) for cmd, stats in self._commands.items()
+            })
+            other = _CommandStats(len(self.buckets))
+            other.bucket_counts = [int(count) for count in totals[:-2]]
+            other.count = int(totals[-2])
+            other.sum = totals[-1]
+            result.append((OTHER_COMMAND, other))
+        return result
+
+    def collect(self, client: redis.Redis, collector: object) -> None:
+        """
+        Fetch new slowlog entries and register accumulated metrics
+
+        Args:
+            client: Redis client
+            collector: RedisExporter collector instance
+        """
+        try:
+            self.fetch(client)
+        except Exception as e:
+            logger.error(f"Error getting slowlog: {e}")
+            return
+
+        collector._register_metric("slowlog_length", float(self.length))
+        if self.last_id is not None:
+            collector._register_metric("slowlog_last_id", float(self.last_id))
+            collector._register_metric("last_slow_execution_duration_seconds", self.last_duration)
+        collector._register_metric("slowlog_missed_entries_total", float(self.missed_entries),
+                                   is_counter=True)
+
+        for cmd, stats in self._selected_commands():
+            labels = {"cmd": cmd}
+            collector._register_metric("slowlog_commands_total", float(stats.count),
+                                       is_counter=True, labels=labels)
+
+            cumulative = 0
+            buckets = []
+            for le, bucket_count in zip(self.buckets + (float("inf"),), stats.bucket_counts):
+                cumulative += bucket_count
+                buckets.append((le, float(cumulative)))
+            collector._register_histogram("slowlog_command_duration_seconds", buckets,
+                                          stats.sum, labels=labels)
@@ -0,0 +1,84 @@
+"""Per-phase scrape timing"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+# Phases of a scrape, in the order they run
+SCRAPE_PHASES = (
+    "connect", "info_roundtrip", "info_parse", "pattern_expansion", "key_inspection", "render",
+)
+
+# Upper bounds (seconds) of phase duration buckets
+SCRAPE_PHASE_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _PhaseStats:
+    """Accumulated durations of a single phase"""
+    __slots__ = ("bucket_counts", "sum")
+
+    def __init__(self, num_buckets: int):
+        # Last bucket is +Inf
+        self.bucket_counts = [0] * (num_buckets + 1)
+        self.sum = 0.0
+
+
+class ScrapeTimings:
+    """
+    Accumulates scrape phase durations into per-phase histograms
+
+    Phases are observed from the scrape thread and, for render, from the
+    HTTP server after the scrape, so observations are taken under a lock.
+    A phase shows up once it has been observed at least once.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = SCRAPE_PHASE_BUCKETS):
+        """
+        Args:
+            buckets: Upper bounds of duration buckets in seconds
+        """
+        self.buckets = buckets
+        self._phases: Dict[str, _PhaseStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Account one duration of phase"""
+        with self._lock:
+            stats = self._phases.get(phase)
+            if stats is None:
+                stats = self._phases[phase] = _PhaseStats(len(self.buckets))
+            stats.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            stats.sum += seconds
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Observe the duration of the with block as phase (also if it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def collect(self, collector: object) -> None:
+        """
+        Register accumulated phase histograms
+
+        Args:
+            collector: RedisExporter collector instance
+        """
+        with self._lock:
+            phases = [(phase, list(stats.bucket_counts), stats.sum)
+                      for phase, stats in self._phases.items()]
+
+        for phase, bucket_counts, total in phases:
+            cumulative = 0
+            buckets = []
+            for le, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                buckets.append((le, float(cumulative)))
+            collector._register_histogram("exporter_scrape_phase_duration_seconds", buckets,
+                                          total, labels={"phase": phase})
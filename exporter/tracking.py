@@ -0,0 +1,180 @@
+"""Client-side cache of checked single keys (CLIENT TRACKING, RESP3)"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import redis
+
+from .keys import DbKeyPair, get_keys_info_pipelined
+from .redis_client import decode_reply
+
+logger = logging.getLogger(__name__)
+
+KeyInfo = Tuple[str, int, Optional[str]]
+
+# redis-py before 5.3 requires a command name in ConnectionPool.get_connection,
+# later versions deprecate it
+_GET_CONNECTION_ARGS: Tuple[str, ...] = (
+    ("CLIENT",) if tuple(int(part) for part in redis.__version__.split(".")[:2]) < (5, 3) else ()
+)
+
+
+class KeyTrackingCache:
+    """
+    Caches type, size and value of checked keys until Redis invalidates them
+
+    A dedicated single-connection RESP3 client enables CLIENT TRACKING on
+    connect, so every key read through it is tracked by Redis. Invalidation
+    push messages drop cached entries; they are drained before each scrape
+    and handled inline while commands are running. Invalidation messages
+    carry no db number, so a key is dropped in every db.
+    """
+
+    def __init__(self, connect: Callable[[Callable], redis.Redis]):
+        """
+        Args:
+            connect: Factory creating the tracking client, called with a
+                connect callback that has to run on every new connection
+        """
+        self.connect = connect
+        self.client: Optional[redis.Redis] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        # key -> {db: key info}
+        self._entries: Dict[str, Dict[str, KeyInfo]] = {}
+        self._lock = threading.Lock()
+        # Keys invalidated while their values were being fetched
+        self._fetching: Optional[Set[str]] = None
+
+    @property
+    def entries(self) -> int:
+        """Number of cached (db, key) entries"""
+        with self._lock:
+            return sum(len(by_db) for by_db in self._entries.values())
+
+    def flush(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def on_connect(self, connection: redis.connection.Connection) -> None:
+        """Enable tracking on a new connection (used as redis_connect_func)"""
+        connection.on_connect()
+        connection.send_command("CLIENT", "TRACKING", "ON")
+        connection.read_response()
+        # Push handlers are not public API of redis-py, check they are available
+        set_handler = getattr(connection._parser, "set_invalidation_push_handler", None)
+        if set_handler is None:
+            raise redis.exceptions.ConnectionError(
+                f"{type(connection._parser).__name__} does not support invalidation push handlers, "
+                f"key tracking needs a RESP3 connection (redis-py {redis.__version__})"
+            )
+        set_handler(self.handle_invalidation)
+        # Invalidations could have been missed while disconnected
+        self.flush()
+
+    def handle_invalidation(self, message: List[object]) -> None:
+        """
+        Handle invalidation push message
+
+        Format: ["invalidate", [key, ...]] or ["invalidate", None] on FLUSHALL
+        """
+        keys = message[1] if len(message) > 1 else None
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+                self.invalidations += 1
+                if self._fetching is not None:
+                    self._fetching.add("*")
+                return
+            for key in keys:
+                key_name = decode_reply(key)
+                self._entries.pop(key_name, None)
+                self.invalidations += 1
+                if self._fetching is not None:
+                    self._fetching.add(key_name)
+
+    def _process_invalidations(self) -> None:
+        pool = self.client.connection_pool
+        connection = pool.get_connection(*_GET_CONNECTION_ARGS)
+        try:
+            while connection.can_read():
+                try:
+                    connection.read_response(push_request=True, timeout=0, disconnect_on_error=False)
+                except redis.exceptions.TimeoutError:
+                    break
+        finally:
+            pool.release(connection)
+
+    def _fetch(self, db: str, key_names: List[str]) -> Dict[str, KeyInfo]:
+        if db != "0":
+            self.client.execute_command("SELECT", int(db))
+        try:
+            key_infos, _ = get_keys_info_pipelined(self.client, key_names)
+        finally:
+            if db != "0":
+                self.client.execute_command("SELECT", 0)
+        return key_infos
+
+    def get_keys_info(self, keys: List[DbKeyPair]) -> Dict[Tuple[str, str], KeyInfo]:
+        """
+        Get info of keys, reading Redis only for keys missing in the cache
+
+        Returns:
+            Dict {(db, key): (key_type, size, string_value)}
+        """
+        if self.client is None:
+            self.client = self.connect(self.on_connect)
+        self._process_invalidations()
+
+        results: Dict[Tuple[str, str], KeyInfo] = {}
+        misses: Dict[str, List[str]] = {}
+        with self._lock:
+            for k in keys:
+                key_info = self._entries.get(k.key, {}).get(k.db)
+                if key_info is not None:
+                    self.hits += 1
+                    results[(k.db, k.key)] = key_info
+                else:
+                    self.misses += 1
+                    misses.setdefault(k.db, []).append(k.key)
+
+        for db, key_names in misses.items():
+            with self._lock:
+                self._fetching = set()
+            try:
+                key_infos = self._fetch(db, key_names)
+            finally:
+                with self._lock:
+                    invalidated, self._fetching = self._fetching, None
+
+            with self._lock:
+                for key_name, key_info in key_infos.items():
+                    results[(db, key_name)] = key_info
+                    # Value may be stale if it changed while being fetched
+                    if key_name not in invalidated and "*" not in invalidated:
+                        self._entries.setdefault(key_name, {})[db] = key_info
+
+        return results
+
+    def close(self) -> None:
+        """Close tracking connection and drop cached entries"""
+        if self.client is not None:
+            try:
+                self.client.close()
+            except Exception:
+                pass
+            self.client = None
+        self.flush()
+
+    def collect(self, collector: object) -> None:
+        """Register cache metrics"""
+        collector._register_metric("key_tracking_cache_hits_total", float(self.hits), is_counter=True)
+        collector._register_metric("key_tracking_cache_misses_total", float(self.misses), is_counter=True)
+        collector._register_metric("key_tracking_invalidations_total", float(self.invalidations),
+                                   is_counter=True)
+        collector._register_metric("key_tracking_cache_entries", float(self.entries))
@@ -1,18 +1,16 @@
 """Redis Exporter for Prometheus - Main entry point"""
 
 import argparse
+import asyncio
 import logging
 import signal
 import sys
-import time
-from http.server import HTTPServer
-from threading import Thread
-from typing import Optional
 
-from prometheus_client import REGISTRY, start_http_server
+from prometheus_client import REGISTRY
 
 from exporter.config import Options
 from exporter.exporter import RedisCollector
+from exporter.http_server import MetricsServer
 
 
 # Build info
@@ -53,7 +51,8 @@ def parse_args():
         "--redis.addr",
         dest="redis_addr",
         default=Options.from_env().redis_addr,
-        help="Address of the Redis instance to scrape",
+        help="Address of the Redis instance to scrape "
+             "(redis+sentinel://host:26379[,host:26379]/master_name to resolve it through Sentinel)",
     )
     parser.add_argument(
         "--redis.user",
@@ -89,6 +88,13 @@ def parse_args():
         default=Options.from_env().check_single_keys,
         help="Comma separated list of single keys to export value and length/size",
     )
+    parser.add_argument(
+        "--check-single-keys-tracking",
+        dest="check_single_keys_tracking",
+        action="store_true",
+        default=Options.from_env().check_single_keys_tracking,
+        help="Whether to cache single keys locally using CLIENT TRACKING (RESP3, Redis 6.0+)",
+    )
     
     # Connection settings
     parser.add_argument(
@@ -112,6 +118,232 @@ def parse_args():
         help="Disable setting client name",
     )
     
+    # Cluster
+    parser.add_argument(
+        "--is-cluster",
+        dest="is_cluster",
+        action="store_true",
+        default=Options.from_env().is_cluster,
+        help="Whether this is a Redis Cluster (scrape all nodes discovered from --redis.addr)",
+    )
+    parser.add_argument(
+        "--cluster.refresh-interval",
+        dest="cluster_refresh_interval",
+        type=float,
+        default=Options.from_env().cluster_refresh_interval,
+        help="Seconds between cluster topology refreshes",
+    )
+    parser.add_argument(
+        "--cluster.max-workers",
+        dest="cluster_max_workers",
+        type=int,
+        default=Options.from_env().cluster_max_workers,
+        help="Max number of cluster nodes scraped concurrently",
+    )
+    
+    # INFO keysizes
+    parser.add_argument(
+        "--export-keysizes",
+        dest="export_keysizes",
+        action="store_true",
+        default=Options.from_env().export_keysizes,
+        help="Whether to export INFO keysizes distributions as histograms (Redis 8.0+)",
+    )
+    
+    # Keyspace notifications
+    parser.add_argument(
+        "--export-keyspace-events",
+        dest="export_keyspace_events",
+        action="store_true",
+        default=Options.from_env().export_keyspace_events,
+        help="Whether to count keyspace notifications (__keyevent@N__:*) per key prefix",
+    )
+    parser.add_argument(
+        "--keyspace-events.dbs",
+        dest="keyspace_events_dbs",
+        default=Options.from_env().keyspace_events_dbs,
+        help="Comma separated list of databases to listen to",
+    )
+    parser.add_argument(
+        "--keyspace-events.max-prefixes",
+        dest="keyspace_events_max_prefixes",
+        type=int,
+        default=Options.from_env().keyspace_events_max_prefixes,
+        help="Max number of key prefixes with own series, the rest is exported as 'other'",
+    )
+    
+    # Slowlog
+    parser.add_argument(
+        "--export-slowlog",
+        dest="export_slowlog",
+        action="store_true",
+        default=Options.from_env().export_slowlog,
+        help="Whether to ingest SLOWLOG incrementally into per-command duration histograms",
+    )
+    parser.add_argument(
+        "--slowlog.max-commands",
+        dest="slowlog_max_commands",
+        type=int,
+        default=Options.from_env().slowlog_max_commands,
+        help="Number of commands with most slow entries that get own slowlog series, the rest is summed as 'other'",
+    )
+    
+    # Latency
+    parser.add_argument(
+        "--export-latency-histograms",
+        dest="export_latency_histograms",
+        action="store_true",
+        default=Options.from_env().export_latency_histograms,
+        help="Whether to export LATENCY HISTOGRAM and latencystats percentiles (Redis 7.0+)",
+    )
+    parser.add_argument(
+        "--export-latency-events",
+        dest="export_latency_events",
+        action="store_true",
+        default=Options.from_env().export_latency_events,
+        help="Whether to export latency monitor events (LATENCY LATEST / LATENCY HISTORY)",
+    )
+    
+    # Client list
+    parser.add_argument(
+        "--export-client-list",
+        dest="export_client_list",
+        action="store_true",
+        default=Options.from_env().export_client_list,
+        help="Whether to export aggregated CLIENT LIST metrics",
+    )
+    parser.add_argument(
+        "--client-list.interval",
+        dest="client_list_interval",
+        type=float,
+        default=Options.from_env().client_list_interval,
+        help="Min interval between CLIENT LIST calls in seconds",
+    )
+    parser.add_argument(
+        "--client-list.top-k",
+        dest="client_list_top_k",
+        type=int,
+        default=Options.from_env().client_list_top_k,
+        help="Number of clients with the largest memory usage exported individually",
+    )
+    
+    # MEMORY STATS
+    parser.add_argument(
+        "--export-memory-stats",
+        dest="export_memory_stats",
+        action="store_true",
+        default=Options.from_env().export_memory_stats,
+        help="Whether to export MEMORY STATS (overhead, allocator fragmentation and RSS)",
+    )
+    parser.add_argument(
+        "--memory-stats.interval",
+        dest="memory_stats_interval",
+        type=float,
+        default=Options.from_env().memory_stats_interval,
+        help="Min interval between MEMORY STATS calls in seconds",
+    )
+    
+    # Lua scripts
+    parser.add_argument(
+        "--script",
+        dest="script",
+        default=Options.from_env().script,
+        help="Comma separated list of Lua script paths returning name/value pairs, "
+             "per-script settings as path?interval=60&timeout=5",
+    )
+    parser.add_argument(
+        "--script.interval",
+        dest="script_interval",
+        type=float,
+        default=Options.from_env().script_interval,
+        help="Default min interval between script runs in seconds (0 - every scrape)",
+    )
+    parser.add_argument(
+        "--script.timeout",
+        dest="script_timeout",
+        type=float,
+        default=Options.from_env().script_timeout,
+        help="Default script timeout in seconds (0 - connection timeout)",
+    )
+    
+    # CONFIG GET
+    parser.add_argument(
+        "--config.patterns",
+        dest="config_patterns",
+        default=Options.from_env().config_patterns,
+        help="Comma separated list of CONFIG GET patterns to export, e.g. maxmemory,maxclients,io-threads",
+    )
+    parser.add_argument(
+        "--config.ttl",
+        dest="config_ttl",
+        type=float,
+        default=Options.from_env().config_ttl,
+        help="How long CONFIG GET values are cached in seconds",
+    )
+    parser.add_argument(
+        "--config.command",
+        dest="config_command",
+        default=Options.from_env().config_command,
+        help="Name of the CONFIG command if it is renamed",
+    )
+    
+    # Commandstats/errorstats cardinality
+    parser.add_argument(
+        "--export-commandstats",
+        dest="export_commandstats",
+        action="store_true",
+        default=Options.from_env().export_commandstats,
+        help="Whether to request INFO commandstats and export per-command series "
+             "(implied by --commandstats.top-n and --commandstats.allow)",
+    )
+    parser.add_argument(
+        "--commandstats.top-n",
+        dest="commandstats_top_n",
+        type=int,
+        default=Options.from_env().commandstats_top_n,
+        help="Number of commands with own commandstats series, the rest is summed as 'other' (0 - all)",
+    )
+    parser.add_argument(
+        "--commandstats.top-by",
+        dest="commandstats_top_by",
+        choices=["calls", "usec"],
+        default=Options.from_env().commandstats_top_by,
+        help="Rank commands for --commandstats.top-n by number of calls or total time",
+    )
+    parser.add_argument(
+        "--commandstats.allow",
+        dest="commandstats_allow",
+        default=Options.from_env().commandstats_allow,
+        help="Comma separated list of commands with own commandstats series, the rest is summed as 'other'",
+    )
+    parser.add_argument(
+        "--errorstats.top-n",
+        dest="errorstats_top_n",
+        type=int,
+        default=Options.from_env().errorstats_top_n,
+        help="Number of error types with own errorstats series, the rest is summed as 'other' (0 - all)",
+    )
+    parser.add_argument(
+        "--errorstats.allow",
+        dest="errorstats_allow",
+        default=Options.from_env().errorstats_allow,
+        help="Comma separated list of error types with own errorstats series, the rest is summed as 'other'",
+    )
+    
+    # Metric filtering
+    parser.add_argument(
+        "--include-metrics",
+        dest="include_metrics",
+        default=Options.from_env().include_metrics,
+        help="Comma separated list of regexes of metric names to export (default: all)",
+    )
+    parser.add_argument(
+        "--exclude-metrics",
+        dest="exclude_metrics",
+        default=Options.from_env().exclude_metrics,
+        help="Comma separated list of regexes of metric names not to export",
+    )
+    
     # HTTP server
     parser.add_argument(
         "--web.listen-address",
@@ -119,6 +351,20 @@ def parse_args():
         default=Options.from_env().web_listen_address,
         help="Address to listen on for web interface and telemetry",
     )
+    parser.add_argument(
+        "--web.snapshot-ttl",
+        dest="web_snapshot_ttl",
+        type=float,
+        default=Options.from_env().web_snapshot_ttl,
+        help="Seconds a rendered metrics snapshot is reused by other scrapes (0 - only concurrent scrapes)",
+    )
+    parser.add_argument(
+        "--web.protobuf-classic-histograms",
+        dest="web_protobuf_classic_histograms",
+        action="store_true",
+        default=Options.from_env().web_protobuf_classic_histograms,
+        help="Whether to send classic buckets along with native histograms in the protobuf format",
+    )
     
     # Logging
     parser.add_argument(
@@ -191,19 +437,53 @@ def main():
         namespace=args.namespace,
         check_keys=args.check_keys,
         check_single_keys=args.check_single_keys,
+        check_single_keys_tracking=args.check_single_keys_tracking,
         connection_timeout=args.connection_timeout,
         set_client_name=args.set_client_name,
+        is_cluster=args.is_cluster,
+        cluster_refresh_interval=args.cluster_refresh_interval,
+        cluster_max_workers=args.cluster_max_workers,
+        export_keysizes=args.export_keysizes,
+        export_keyspace_events=args.export_keyspace_events,
+        keyspace_events_dbs=args.keyspace_events_dbs,
+        keyspace_events_max_prefixes=args.keyspace_events_max_prefixes,
+        export_slowlog=args.export_slowlog,
+        slowlog_max_commands=args.slowlog_max_commands,
+        export_latency_histograms=args.export_latency_histograms,
+        export_latency_events=args.export_latency_events,
+        export_client_list=args.export_client_list,
+        client_list_interval=args.client_list_interval,
+        client_list_top_k=args.client_list_top_k,
+        export_memory_stats=args.export_memory_stats,
+        memory_stats_interval=args.memory_stats_interval,
+        script=args.script,
+        script_interval=args.script_interval,
+        script_timeout=args.script_timeout,
+        config_patterns=args.config_patterns,
+        config_ttl=args.config_ttl,
+        config_command=args.config_command,
+        export_commandstats=args.export_commandstats,
+        commandstats_top_n=args.commandstats_top_n,
+        commandstats_top_by=args.commandstats_top_by,
+        commandstats_allow=args.commandstats_allow,
+        errorstats_top_n=args.errorstats_top_n,
+        errorstats_allow=args.errorstats_allow,
+        include_metrics=args.include_metrics,
+        exclude_metrics=args.exclude_metrics,
         web_listen_address=args.web_listen_address,
+        web_snapshot_ttl=args.web_snapshot_ttl,
+        web_protobuf_classic_histograms=args.web_protobuf_classic_histograms,
     )
     
     logger.debug(f"Options: {options}")
     logger.info(f"Configured redis addr: {options.redis_addr}")
     
     # Create exporter
-    collector = RedisCollector(options.redis_addr, options)
-    
-    # Register collector with Prometheus
-    REGISTRY.register(collector)
+    try:
+        collector = RedisCollector(options.redis_addr, options)
+    except (OSError, ValueError) as e:
+        logger.error(f"Couldn't create exporter: {e}")
+        return 1
     
     # Parse listen address
     listen_addr = options.web_listen_address
@@ -222,16 +502,27 @@ def main():
     
     # Start HTTP server
     logger.info(f"Providing metrics at http://{host}:{port}/metrics")
-    start_http_server(port, addr=host)
+    # Collector is rendered natively, REGISTRY adds process and runtime metrics
+    server = MetricsServer(
+        REGISTRY,
+        snapshot_ttl=options.web_snapshot_ttl,
+        collector=collector,
+        classic_histograms=options.web_protobuf_classic_histograms,
+    )
+    
+    async def serve():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await server.serve_forever(host, port, stop)
     
-    # Wait for interrupt signal
+    # Serve until interrupt signal
     try:
-        while True:
-            signal.pause()
+        asyncio.run(serve())
+        logger.info("Received signal, exiting")
     except KeyboardInterrupt:
         logger.info("Received SIGINT, exiting")
-    except SystemExit:
-        logger.info("Received SIGTERM, exiting")
     finally:
         logger.info("Server shut down gracefully")
     
@@ -67,16 +67,24 @@ def mock_collector():
     """Mock collector for testing parsers"""
     collector = MagicMock()
     collector._current_metrics = {}
+    collector._current_histograms = {}
     
     def mock_register_metric(metric_name, value, **kwargs):
         if metric_name not in collector._current_metrics:
             collector._current_metrics[metric_name] = []
         collector._current_metrics[metric_name].append({"value": value, **kwargs})
     
+    def mock_register_histogram(metric_name, buckets, sum_value, **kwargs):
+        if metric_name not in collector._current_histograms:
+            collector._current_histograms[metric_name] = []
+        collector._current_histograms[metric_name].append(
+            {"buckets": buckets, "sum": sum_value, **kwargs})
+    
     def mock_create_metric_descr(metric_name, **kwargs):
         pass
     
     collector._register_metric = mock_register_metric
+    collector._register_histogram = mock_register_histogram
     collector._create_metric_descr = mock_create_metric_descr
     
     return collector
@@ -92,9 +100,42 @@ def clear_env():
         "REDIS_EXPORTER_NAMESPACE",
         "REDIS_EXPORTER_CHECK_KEYS",
         "REDIS_EXPORTER_CHECK_SINGLE_KEYS",
+        "REDIS_EXPORTER_CHECK_SINGLE_KEYS_TRACKING",
         "REDIS_EXPORTER_CONNECTION_TIMEOUT",
         "REDIS_EXPORTER_SET_CLIENT_NAME",
         "REDIS_EXPORTER_WEB_LISTEN_ADDRESS",
+        "REDIS_EXPORTER_EXPORT_COMMANDSTATS",
+        "REDIS_EXPORTER_COMMANDSTATS_TOP_N",
+        "REDIS_EXPORTER_COMMANDSTATS_TOP_BY",
+        "REDIS_EXPORTER_COMMANDSTATS_ALLOW",
+        "REDIS_EXPORTER_ERRORSTATS_TOP_N",
+        "REDIS_EXPORTER_ERRORSTATS_ALLOW",
+        "REDIS_EXPORTER_INCLUDE_METRICS",
+        "REDIS_EXPORTER_EXCLUDE_METRICS",
+        "REDIS_EXPORTER_WEB_SNAPSHOT_TTL",
+        "REDIS_EXPORTER_WEB_PROTOBUF_CLASSIC_HISTOGRAMS",
+        "REDIS_EXPORTER_IS_CLUSTER",
+        "REDIS_EXPORTER_CLUSTER_REFRESH_INTERVAL",
+        "REDIS_EXPORTER_CLUSTER_MAX_WORKERS",
+        "REDIS_EXPORTER_EXPORT_KEYSIZES",
+        "REDIS_EXPORTER_EXPORT_KEYSPACE_EVENTS",
+        "REDIS_EXPORTER_KEYSPACE_EVENTS_DBS",
+        "REDIS_EXPORTER_KEYSPACE_EVENTS_MAX_PREFIXES",
+        "REDIS_EXPORTER_EXPORT_SLOWLOG",
+        "REDIS_EXPORTER_SLOWLOG_MAX_COMMANDS",
+        "REDIS_EXPORTER_EXPORT_LATENCY_HISTOGRAMS",
+        "REDIS_EXPORTER_EXPORT_LATENCY_EVENTS",
+        "REDIS_EXPORTER_EXPORT_CLIENT_LIST",
+        "REDIS_EXPORTER_CLIENT_LIST_INTERVAL",
+        "REDIS_EXPORTER_CLIENT_LIST_TOP_K",
+        "REDIS_EXPORTER_EXPORT_MEMORY_STATS",
+        "REDIS_EXPORTER_MEMORY_STATS_INTERVAL",
+        "REDIS_EXPORTER_SCRIPT",
+        "REDIS_EXPORTER_SCRIPT_INTERVAL",
+        "REDIS_EXPORTER_SCRIPT_TIMEOUT",
+        "REDIS_EXPORTER_CONFIG_PATTERNS",
+        "REDIS_EXPORTER_CONFIG_TTL",
+        "REDIS_EXPORTER_CONFIG_COMMAND",
     ]
     
     # Save original values
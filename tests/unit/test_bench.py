@@ -0,0 +1,53 @@
+"""Unit tests for bench.py"""
+
+import argparse
+
+import pytest
+
+from exporter.bench import _serve_targets, _start_process, capacity, parse_configs, percentile, run_config
+
+
+class TestHelpers:
+    """Tests for report helpers"""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 0.5) == 51.0
+        assert percentile(values, 0.99) == 100.0
+        assert percentile([], 0.5) == 0.0
+
+    def test_capacity(self):
+        """Test best step within the SLO"""
+        steps = [
+            {"scrapers": 1, "scrapes": 10, "throughput": 10.0, "p99_ms": 5.0, "errors": 0},
+            {"scrapers": 10, "scrapes": 50, "throughput": 50.0, "p99_ms": 50.0, "errors": 0},
+            {"scrapers": 100, "scrapes": 60, "throughput": 60.0, "p99_ms": 2000.0, "errors": 0},
+        ]
+        assert capacity(steps, 100.0)["scrapers"] == 10
+        assert capacity(steps, 1.0) is None
+
+    def test_parse_configs(self):
+        """Test configuration names are validated"""
+        assert parse_configs("async-live, sync-live") == ["async-live", "sync-live"]
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_configs("async-live,threaded")
+
+
+class TestRunConfig:
+    """Tests for run_config function"""
+
+    @pytest.mark.parametrize("config", ["async-cached", "sync-live"])
+    def test_run_config(self, config):
+        """Test load steps against exporter and target processes"""
+        targets, redis_ports = _start_process(_serve_targets, 2, 100)
+        try:
+            steps = run_config(config, redis_ports, [1, 2], duration=0.3, interval=0.0, timeout=5.0,
+                               snapshot_ttl=5.0, options={"check_keys": "db0=key:1*"})
+        finally:
+            targets.terminate()
+            targets.join()
+
+        assert [s["scrapers"] for s in steps] == [1, 2]
+        assert all(s["scrapes"] > 0 and s["errors"] == 0 for s in steps)
+        assert steps[0]["p99_ms"] >= steps[0]["p50_ms"] > 0
@@ -0,0 +1,134 @@
+"""Unit tests for clients.py"""
+
+from unittest.mock import MagicMock
+
+from exporter.clients import (
+    ClientListCollector,
+    analyze_client_list,
+    client_field,
+    iter_client_lines,
+)
+
+
+def make_line(client_id, addr, name="", db=0, flags="N", cmd="get", qbuf=0, omem=0, tot_mem=0):
+    return (f"id={client_id} addr={addr} laddr=127.0.0.1:6379 fd=8 name={name} age=1 idle=0 "
+            f"flags={flags} db={db} sub=0 psub=0 multi=-1 qbuf={qbuf} qbuf-free=0 obl=0 oll=0 "
+            f"omem={omem} tot-mem={tot_mem} events=r cmd={cmd} user=default").encode()
+
+
+CLIENT_LIST_REPLY = b"\n".join([
+    make_line(1, "10.0.0.1:5000", name="worker", cmd="get", qbuf=10, omem=0, tot_mem=100),
+    make_line(2, "10.0.0.1:5001", name="worker", cmd="set", qbuf=0, omem=500, tot_mem=1000),
+    make_line(3, "10.0.0.2:6000", name="", db=1, flags="S", cmd="psync", omem=2000, tot_mem=5000),
+]) + b"\n"
+
+
+class TestClientListParsing:
+    """Tests for CLIENT LIST parsing helpers"""
+
+    def test_iter_lines(self):
+        """Test lines are iterated without empty trailing line"""
+        assert len(list(iter_client_lines(CLIENT_LIST_REPLY))) == 3
+        assert list(iter_client_lines(b"a\r\nb")) == [b"a", b"b"]
+
+    def test_client_field(self):
+        """Test field lookup by name"""
+        line = make_line(7, "10.0.0.1:5000", name="worker", qbuf=10)
+        assert client_field(line, b"id") == b"7"
+        assert client_field(line, b"name") == b"worker"
+        # qbuf must not match qbuf-free
+        assert client_field(line, b"qbuf") == b"10"
+        assert client_field(line, b"user") == b"default"
+        assert client_field(line, b"missing") == b""
+
+
+class TestAnalyzeClientList:
+    """Tests for analyze_client_list function"""
+
+    def test_aggregation(self):
+        """Test group counts and buffer totals"""
+        stats = analyze_client_list(CLIENT_LIST_REPLY)
+        assert stats.connections == 3
+        assert stats.output_buffer_bytes == 2500
+        assert stats.query_buffer_bytes == 10
+        assert stats.groups["name"] == {b"worker": 2, b"": 1}
+        assert stats.groups["addr_prefix"] == {b"10.0.0.1": 2, b"10.0.0.2": 1}
+        assert stats.groups["db"] == {b"0": 2, b"1": 1}
+        assert stats.groups["cmd"] == {b"get": 1, b"set": 1, b"psync": 1}
+
+    def test_top_clients(self):
+        """Test only top_k heaviest clients are kept"""
+        stats = analyze_client_list(CLIENT_LIST_REPLY, top_k=2)
+        assert stats.top_clients == [
+            (5000, "", "10.0.0.2", "psync"),
+            (1000, "worker", "10.0.0.1", "set"),
+        ]
+
+    def test_top_clients_merged_by_ip(self):
+        """Test heavy clients differing only in port share one series"""
+        reply = b"\n".join(make_line(i, f"10.0.0.1:{5000 + i}", name="worker", tot_mem=100 * i)
+                           for i in range(1, 4))
+        stats = analyze_client_list(reply, top_k=2)
+        assert stats.top_clients == [(500, "worker", "10.0.0.1", "get")]
+
+
+class TestClientListCollector:
+    """Tests for ClientListCollector class"""
+
+    def test_collect_registers_snapshot(self, mock_collector):
+        """Test metrics are registered from the last snapshot"""
+        client = MagicMock()
+        client.execute_command.return_value = CLIENT_LIST_REPLY
+
+        clients = ClientListCollector(lambda: client, max_groups=1)
+        clients.refresh()
+        clients._last_refresh = float("inf")
+        clients.collect(mock_collector)
+
+        metrics = mock_collector._current_metrics
+        assert metrics["client_list_connections"][0]["value"] == 3.0
+        by_name = {m["labels"]["name"]: m["value"] for m in metrics["client_list_connections_by_name"]}
+        assert by_name == {"worker": 2.0, "other": 1.0}
+        top = metrics["client_list_top_memory_bytes"][0]
+        assert top["value"] == 5000.0
+        assert top["labels"]["cmd"] == "psync"
+
+    def test_refresh_runs_in_background_once_per_interval(self, mock_collector):
+        """Test scrapes don't wait for CLIENT LIST and respect the interval"""
+        client = MagicMock()
+        client.execute_command.return_value = CLIENT_LIST_REPLY
+
+        clients = ClientListCollector(lambda: client, interval=3600)
+        clients.collect(mock_collector)
+        worker = clients._worker
+        if worker is not None:
+            worker.join()
+        clients.collect(mock_collector)
+
+        assert client.execute_command.call_count == 1
+        assert clients.snapshot.connections == 3
+
+    def test_refresh_error(self, mock_collector):
+        """Test errors are counted and the old snapshot is kept"""
+        client = MagicMock()
+        client.execute_command.side_effect = Exception("NOPERM")
+
+        clients = ClientListCollector(lambda: client)
+        clients.refresh()
+        assert clients.errors == 1
+        assert clients.snapshot is None
+        # Dedicated client is dropped and reconnected on next refresh
+        assert clients.client is None
+        client.close.assert_called_once()
+
+    def test_dedicated_client_reused(self):
+        """Test the refresher connects once and keeps its own client"""
+        client = MagicMock()
+        client.execute_command.return_value = CLIENT_LIST_REPLY
+        connect = MagicMock(return_value=client)
+
+        clients = ClientListCollector(connect)
+        clients.refresh()
+        clients.refresh()
+        connect.assert_called_once()
+        assert client.execute_command.call_count == 2
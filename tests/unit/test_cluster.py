@@ -0,0 +1,352 @@
+"""Unit tests for cluster.py"""
+
+import redis
+from unittest.mock import MagicMock
+
+from exporter import Options, RedisCollector
+from exporter.cluster import (
+    ClusterNode,
+    ClusterTopology,
+    NodeLabeledCollector,
+    crc16,
+    format_slot_ranges,
+    is_topology_error,
+    key_hash_slot,
+    parse_cluster_nodes,
+    parse_cluster_shards,
+)
+from tests.utils import create_sample_info
+
+
+CLUSTER_NODES_REPLY = (
+    b"07c37dfeb235213a872192d90877d0cd55635b91 127.0.0.1:30004@31004 slave "
+    b"e7d1eecce10fd6bb5eb35b9f99a514335d9ba9ca 0 1426238317239 4 connected\n"
+    b"67ed2db8d677e59ec4a4cefb06858cf2a1a89fa1 127.0.0.1:30002@31002 master "
+    b"- 0 1426238316232 2 connected 5461-10922\n"
+    b"e7d1eecce10fd6bb5eb35b9f99a514335d9ba9ca 127.0.0.1:30001@31001 myself,master "
+    b"- 0 0 1 connected 0-5460\n"
+    b"6ec23923021cf3ffec47632106199cb7f496ce01 127.0.0.1:30005@31005 slave,fail "
+    b"67ed2db8d677e59ec4a4cefb06858cf2a1a89fa1 0 1426238316232 5 connected\n"
+)
+
+CLUSTER_SHARDS_REPLY = [
+    [
+        b"slots", [0, 5460],
+        b"nodes", [
+            [b"id", b"aaa", b"port", 30001, b"ip", b"127.0.0.1", b"endpoint", b"127.0.0.1",
+             b"role", b"master", b"replication-offset", 72156, b"health", b"online"],
+            [b"id", b"bbb", b"port", 30004, b"ip", b"127.0.0.1", b"endpoint", b"127.0.0.1",
+             b"role", b"replica", b"replication-offset", 72156, b"health", b"online"],
+        ],
+    ],
+    [
+        b"slots", [5461, 10922],
+        b"nodes", [
+            [b"id", b"ccc", b"port", 30002, b"ip", b"127.0.0.1", b"endpoint", b"127.0.0.1",
+             b"role", b"master", b"replication-offset", 100, b"health", b"online"],
+            [b"id", b"ddd", b"port", 30005, b"ip", b"127.0.0.1", b"endpoint", b"127.0.0.1",
+             b"role", b"replica", b"replication-offset", 0, b"health", b"loading"],
+        ],
+    ],
+]
+
+
+class TestKeyHashSlot:
+    """Tests for crc16 and key_hash_slot functions"""
+
+    def test_crc16_reference_value(self):
+        """Test CRC16 XMODEM check value"""
+        assert crc16(b"123456789") == 0x31C3
+
+    def test_key_slot(self):
+        """Test known key slots"""
+        assert key_hash_slot("foo") == 12182
+        assert key_hash_slot(b"bar") == 5061
+
+    def test_hash_tag(self):
+        """Test only hash tag content is hashed"""
+        assert key_hash_slot("{user1000}.following") == key_hash_slot("{user1000}.followers")
+        assert key_hash_slot("{bar}zap") == key_hash_slot("bar")
+
+    def test_empty_hash_tag(self):
+        """Test empty hash tag hashes whole key"""
+        assert key_hash_slot("foo{}{bar}") == crc16(b"foo{}{bar}") % 16384
+        assert key_hash_slot("foo{{bar}}zap") == key_hash_slot("{bar")
+
+
+class TestFormatSlotRanges:
+    """Tests for format_slot_ranges function"""
+
+    def test_single_range(self):
+        """Test formatting single slot range"""
+        assert format_slot_ranges([(0, 5460)]) == "0-5460"
+
+    def test_multiple_ranges_sorted(self):
+        """Test ranges are sorted"""
+        assert format_slot_ranges([(200, 300), (0, 100)]) == "0-100,200-300"
+
+    def test_no_ranges(self):
+        """Test shard without slots"""
+        assert format_slot_ranges([]) == "none"
+
+
+class TestParseClusterShards:
+    """Tests for parse_cluster_shards function"""
+
+    def test_parse_shards(self):
+        """Test parsing CLUSTER SHARDS reply"""
+        nodes = parse_cluster_shards(CLUSTER_SHARDS_REPLY)
+        assert [n.addr for n in nodes] == ["127.0.0.1:30001", "127.0.0.1:30004", "127.0.0.1:30002"]
+        assert [n.role for n in nodes] == ["master", "slave", "master"]
+        assert nodes[0].shard == "0-5460"
+        assert nodes[1].shard == "0-5460"
+        assert nodes[2].shard == "5461-10922"
+
+    def test_parse_shards_resp3_maps(self):
+        """Test parsing RESP3 map replies"""
+        reply = [{
+            b"slots": [0, 16383],
+            b"nodes": [{b"id": b"x", b"ip": b"10.0.0.1", b"port": 6379,
+                        b"role": b"master", b"health": b"online"}],
+        }]
+        nodes = parse_cluster_shards(reply)
+        assert len(nodes) == 1
+        assert nodes[0].labels() == {"addr": "10.0.0.1:6379", "shard": "0-16383", "role": "master"}
+
+    def test_parse_empty(self):
+        """Test parsing empty reply"""
+        assert parse_cluster_shards([]) == []
+
+
+class TestParseClusterNodes:
+    """Tests for parse_cluster_nodes function"""
+
+    def test_parse_nodes(self):
+        """Test parsing CLUSTER NODES reply"""
+        nodes = parse_cluster_nodes(CLUSTER_NODES_REPLY)
+        by_addr = {n.addr: n for n in nodes}
+
+        assert set(by_addr) == {"127.0.0.1:30001", "127.0.0.1:30002", "127.0.0.1:30004"}
+        assert by_addr["127.0.0.1:30001"].role == "master"
+        assert by_addr["127.0.0.1:30001"].shard == "0-5460"
+        # Replica inherits shard of its master
+        assert by_addr["127.0.0.1:30004"].role == "slave"
+        assert by_addr["127.0.0.1:30004"].shard == "0-5460"
+
+    def test_parse_nodes_skips_failed(self):
+        """Test failed nodes are skipped"""
+        nodes = parse_cluster_nodes(CLUSTER_NODES_REPLY)
+        assert "127.0.0.1:30005" not in [n.addr for n in nodes]
+
+    def test_parse_nodes_single_slots_and_migrating(self):
+        """Test parsing single slots and migrating markers"""
+        reply = "abc 10.0.0.1:6379@16379 master - 0 0 1 connected 0-10 42 [43->-def]\n"
+        nodes = parse_cluster_nodes(reply)
+        assert nodes[0].shard == "0-10,42-42"
+
+
+class TestIsTopologyError:
+    """Tests for is_topology_error function"""
+
+    def test_moved_error(self):
+        """Test MOVED is a topology error"""
+        assert is_topology_error(redis.exceptions.MovedError("3999 127.0.0.1:6381"))
+
+    def test_connection_error(self):
+        """Test connection errors trigger refresh"""
+        assert is_topology_error(redis.exceptions.ConnectionError("refused"))
+
+    def test_other_error(self):
+        """Test unrelated errors don't trigger refresh"""
+        assert not is_topology_error(redis.exceptions.ResponseError("WRONGTYPE"))
+
+
+class TestClusterTopology:
+    """Tests for ClusterTopology class"""
+
+    def _make_topology(self, **kwargs):
+        clients = {}
+
+        def connect(addr):
+            client = MagicMock()
+            client.info.return_value = create_sample_info()
+            clients[addr] = client
+            return client
+
+        return ClusterTopology(connect, **kwargs), clients
+
+    def test_refresh_uses_cluster_shards(self):
+        """Test topology discovery with CLUSTER SHARDS"""
+        topology, _ = self._make_topology()
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+
+        nodes = topology.nodes(seed)
+        assert len(nodes) == 3
+        seed.execute_command.assert_called_once_with("CLUSTER", "SHARDS")
+
+    def test_refresh_falls_back_to_cluster_nodes(self):
+        """Test fallback to CLUSTER NODES on old Redis"""
+        topology, _ = self._make_topology()
+        seed = MagicMock()
+        seed.execute_command.side_effect = [
+            redis.exceptions.ResponseError("unknown subcommand 'SHARDS'"),
+            CLUSTER_NODES_REPLY,
+        ]
+
+        nodes = topology.nodes(seed)
+        assert len(nodes) == 3
+
+    def test_slot_map(self):
+        """Test slots are mapped to owning primaries"""
+        topology, _ = self._make_topology()
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+        topology.nodes(seed)
+
+        assert topology.node_for_slot(0).addr == "127.0.0.1:30001"
+        assert topology.node_for_slot(5461).addr == "127.0.0.1:30002"
+        assert topology.node_for_slot(16000) is None
+        assert topology.node_for_key("bar").addr == "127.0.0.1:30001"
+
+    def test_topology_cached(self):
+        """Test topology isn't re-read within refresh interval"""
+        topology, _ = self._make_topology(refresh_interval=60)
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+
+        topology.nodes(seed)
+        topology.nodes(seed)
+        assert seed.execute_command.call_count == 1
+
+    def test_refresh_on_moved(self):
+        """Test MOVED marks topology for refresh"""
+        topology, _ = self._make_topology(refresh_interval=60)
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+
+        topology.nodes(seed)
+        topology.handle_error(redis.exceptions.MovedError("3999 127.0.0.1:6381"))
+        topology.nodes(seed)
+        assert seed.execute_command.call_count == 2
+
+    def test_fetch_info_all_nodes(self):
+        """Test INFO is fetched from every node over cached clients"""
+        topology, clients = self._make_topology(max_workers=4)
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+
+        results = topology.fetch_info(seed)
+        assert len(results) == 3
+        assert all(error is None for _, _, error in results)
+        assert all("redis_version:7.0.0" in info for _, info, _ in results)
+
+        topology.fetch_info(seed)
+        assert len(clients) == 3
+        topology.close()
+
+    def test_fetch_info_node_error(self):
+        """Test failing node is reported and topology marked stale"""
+        topology, clients = self._make_topology()
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+
+        topology.nodes(seed)
+        failing = topology.client_for(topology.nodes()[0])
+        failing.info.side_effect = redis.exceptions.ConnectionError("refused")
+
+        results = topology.fetch_info(seed)
+        assert isinstance(results[0][2], redis.exceptions.ConnectionError)
+        assert results[0][1] is None
+        assert topology.needs_refresh()
+        topology.close()
+
+
+class TestNodeLabeledCollector:
+    """Tests for NodeLabeledCollector class"""
+
+    def test_adds_node_labels(self, mock_collector):
+        """Test node labels are merged into metric labels"""
+        node = ClusterNode("id", "10.0.0.1", 6379, "master", "0-16383")
+        labeled = NodeLabeledCollector(mock_collector, node.labels())
+
+        labeled._register_metric("db_keys", 5.0, labels={"db": "db0"})
+        metric = mock_collector._current_metrics["db_keys"][0]
+        assert metric["labels"] == {"db": "db0", "addr": "10.0.0.1:6379",
+                                    "shard": "0-16383", "role": "master"}
+
+
+class TestClusterCollector:
+    """Tests for cluster mode in RedisCollector"""
+
+    def test_collect_cluster(self):
+        """Test collecting INFO from all cluster nodes"""
+        options = Options(is_cluster=True, set_client_name=False)
+        collector = RedisCollector("redis://127.0.0.1:30001", options)
+
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+        collector.client = seed
+
+        node_client = MagicMock()
+        node_client.info.return_value = create_sample_info()
+        collector.cluster.connect = lambda addr: node_client
+
+        families = {f.name: f for f in collector.collect()}
+
+        assert families["redis_up"].samples[0].value == 1.0
+        assert families["redis_cluster_nodes_discovered"].samples[0].value == 3.0
+        node_up = families["redis_cluster_node_up"].samples
+        assert len(node_up) == 3
+        assert {s.labels["shard"] for s in node_up} == {"0-5460", "5461-10922"}
+        collector.cluster.close()
+
+    def test_collect_cluster_all_nodes_down(self):
+        """Test failed nodes are reported down and up is 0 when no node answers"""
+        options = Options(is_cluster=True, set_client_name=False)
+        collector = RedisCollector("redis://127.0.0.1:30001", options)
+
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+        collector.client = seed
+
+        node_client = MagicMock()
+        node_client.info.side_effect = redis.exceptions.ConnectionError("refused")
+        collector.cluster.connect = lambda addr: node_client
+
+        families = {f.name: f for f in collector.collect()}
+
+        assert families["redis_up"].samples[0].value == 0.0
+        node_up = families["redis_cluster_node_up"].samples
+        assert len(node_up) == 3
+        assert {s.value for s in node_up} == {0.0}
+        collector.cluster.close()
+
+    def test_collect_cluster_node_down(self):
+        """Test a failed node is reported down while the scrape stays up"""
+        options = Options(is_cluster=True, set_client_name=False)
+        collector = RedisCollector("redis://127.0.0.1:30001", options)
+
+        seed = MagicMock()
+        seed.execute_command.return_value = CLUSTER_SHARDS_REPLY
+        collector.client = seed
+
+        failing_addr = collector.cluster.nodes(seed)[0].addr
+
+        def connect(addr):
+            node_client = MagicMock()
+            if addr == failing_addr:
+                node_client.info.side_effect = redis.exceptions.ConnectionError("refused")
+            else:
+                node_client.info.return_value = create_sample_info()
+            return node_client
+
+        collector.cluster.connect = connect
+
+        families = {f.name: f for f in collector.collect()}
+
+        assert families["redis_up"].samples[0].value == 1.0
+        node_up = {s.labels["addr"]: s.value for s in families["redis_cluster_node_up"].samples}
+        assert node_up.pop(failing_addr) == 0.0
+        assert set(node_up.values()) == {1.0}
+        collector.cluster.close()
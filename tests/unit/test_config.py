@@ -1,9 +1,11 @@
 """Unit tests for config.py"""
 
 import os
+import sys
+
 import pytest
 
-from exporter.config import get_env, get_env_bool, get_env_float, Options
+from exporter.config import get_env, get_env_bool, get_env_float, get_env_int, Options
 
 
 class TestGetEnv:
@@ -88,6 +90,24 @@ class TestGetEnvFloat:
         assert get_env_float("NON_EXISTENT_VAR", 0.0) == 0.0
 
 
+class TestGetEnvInt:
+    """Tests for get_env_int function"""
+
+    def test_get_env_int_valid_value(self):
+        """Test valid int value"""
+        os.environ["TEST_VAR"] = "42"
+        assert get_env_int("TEST_VAR") == 42
+
+    def test_get_env_int_invalid_value(self):
+        """Test invalid int value falls back to default"""
+        os.environ["TEST_VAR"] = "4.2"
+        assert get_env_int("TEST_VAR", 7) == 7
+
+    def test_get_env_int_missing_with_default(self):
+        """Test getting non-existing env var with default"""
+        assert get_env_int("NON_EXISTENT_VAR", 16) == 16
+
+
 class TestOptions:
     """Tests for Options class"""
 
@@ -188,3 +208,20 @@ class TestOptions:
         opts = Options(namespace="original")
         opts.merge_cli_args(namespace="")
         assert opts.namespace == ""
+
+
+class TestParseArgs:
+    """Tests for command line flags"""
+
+    def test_config_flags(self, monkeypatch):
+        """Test CONFIG flags share the config. prefix"""
+        import main
+
+        monkeypatch.setattr(sys, "argv", ["redis-exporter", "--config.patterns=maxmemory",
+                                          "--config.ttl=30", "--config.command=MYCONFIG"])
+        args = main.parse_args()
+        assert (args.config_patterns, args.config_ttl, args.config_command) == ("maxmemory", 30.0, "MYCONFIG")
+
+        monkeypatch.setattr(sys, "argv", ["redis-exporter", "--config-command=MYCONFIG"])
+        with pytest.raises(SystemExit):
+            main.parse_args()
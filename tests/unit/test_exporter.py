@@ -94,3 +94,210 @@ class TestRedisCollector:
         collector._create_metric_descr("test_metric")
         collector._create_metric_descr("test_metric", labels=["label1", "label2"])
 
+
+    def test_register_histogram(self):
+        """Test histogram registration"""
+        collector = RedisCollector("redis://localhost:6379", Options())
+        
+        collector._register_histogram("test_seconds", [(0.1, 1.0), (float("inf"), 3.0)], 2.5,
+                                      labels={"cmd": "get"})
+        histogram = collector._current_histograms["test_seconds"][0]
+        assert histogram["buckets"] == [(0.1, 1.0), (float("inf"), 3.0)]
+        assert histogram["sum"] == 2.5
+        assert histogram["labels"] == {"cmd": "get"}
+
+    def test_collect_yields_histogram_family(self, sample_info):
+        """Test histograms are yielded as histogram families"""
+        collector = RedisCollector("redis://localhost:6379", Options(export_slowlog=True))
+        client = MagicMock()
+        client.info.return_value = sample_info
+        collector._connect = lambda: client
+        collector.slowlog.collect = lambda client, c: c._register_histogram(
+            "slowlog_command_duration_seconds", [(0.01, 2.0), (float("inf"), 3.0)], 1.5,
+            labels={"cmd": "get"})
+        
+        families = {f.name: f for f in collector.collect()}
+        family = families["redis_slowlog_command_duration_seconds"]
+        assert family.type == "histogram"
+        samples = {(s.name, s.labels.get("le")): s.value for s in family.samples}
+        assert samples[("redis_slowlog_command_duration_seconds_bucket", "0.01")] == 2.0
+        assert samples[("redis_slowlog_command_duration_seconds_bucket", "+Inf")] == 3.0
+        assert samples[("redis_slowlog_command_duration_seconds_count", None)] == 3.0
+        assert samples[("redis_slowlog_command_duration_seconds_sum", None)] == 1.5
+
+    def test_collect_requests_keysizes_section(self, sample_info):
+        """Test extra sections are pipelined until redis_version shows multi-section INFO support"""
+        collector = RedisCollector("redis://localhost:6379", Options(export_keysizes=True))
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        pipe.execute.return_value = [sample_info, ""]
+        client.info.return_value = sample_info
+        collector._connect = lambda: client
+        
+        list(collector.collect())
+        client.info.assert_not_called()
+        assert [c.args for c in pipe.info.call_args_list] == [(), ("keysizes",)]
+        
+        # sample_info is redis_version:7.0.0
+        list(collector.collect())
+        client.info.assert_called_once_with("default", "keysizes")
+    
+    def test_collect_old_server_pipelines_sections(self, sample_info):
+        """Test servers before 7.0 keep getting one INFO call per section"""
+        old_info = sample_info.replace("redis_version:7.0.0", "redis_version:6.2.14")
+        collector = RedisCollector("redis://localhost:6379", Options(export_commandstats=True))
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [old_info, "cmdstat_zadd:calls=1,usec=1\n"]
+        collector._connect = lambda: client
+        
+        collector.scrape()
+        collector.scrape()
+        client.info.assert_not_called()
+        assert collector._current_metrics["up"][0]["value"] == 1.0
+        assert "zadd" in [m["labels"]["cmd"] for m in collector._current_metrics["commands_total"]]
+    
+    @patch('exporter.exporter.connect_to_redis')
+    def test_client_list_uses_own_connection(self, mock_connect):
+        """Test CLIENT LIST refresh doesn't share the scrape client"""
+        collector = RedisCollector("redis://localhost:6379", Options(export_client_list=True))
+        collector._client_addr = "redis://localhost:6379"
+        collector.client_list.connect()
+        
+        assert mock_connect.call_args.kwargs["max_connections"] == 1
+        assert collector.client is None
+    
+    def test_collect_requests_commandstats_opt_in(self):
+        """Test commandstats is requested only when enabled and not filtered out"""
+        assert RedisCollector("redis://localhost:6379", Options()).info_sections == ()
+        for options in (Options(export_commandstats=True), Options(commandstats_top_n=10),
+                        Options(commandstats_allow="get,set")):
+            assert RedisCollector("redis://localhost:6379", options).info_sections == ("commandstats",)
+        
+        options = Options(export_commandstats=True, exclude_metrics="redis_commands_.*")
+        assert RedisCollector("redis://localhost:6379", options).info_sections == ()
+
+    @patch('exporter.exporter.extract_check_key_metrics')
+    def test_scrape_selected_collectors(self, mock_check_keys, sample_info):
+        """Test only selected sub-collectors run"""
+        collector = RedisCollector("redis://localhost:6379", Options(check_keys="user:*", export_slowlog=True))
+        client = MagicMock()
+        client.info.return_value = sample_info
+        collector._connect = lambda: client
+        collector.slowlog.collect = MagicMock()
+        
+        collector.scrape({"info"})
+        client.info.assert_called_once()
+        mock_check_keys.assert_not_called()
+        collector.slowlog.collect.assert_not_called()
+        assert collector._current_metrics["up"][0]["value"] == 1.0
+        
+        client.info.reset_mock()
+        collector.scrape({"keys", "slowlog"})
+        client.info.assert_not_called()
+        mock_check_keys.assert_called_once()
+        collector.slowlog.collect.assert_called_once()
+
+    def test_metric_filter(self, sample_info):
+        """Test filtered metrics are neither parsed nor registered"""
+        options = Options(exclude_metrics="redis_commands_.*,redis_memory_used_bytes")
+        collector = RedisCollector("redis://localhost:6379", options)
+        client = MagicMock()
+        client.info.return_value = sample_info
+        collector._connect = lambda: client
+        
+        assert "used_memory" not in collector.metric_map_gauges
+        with patch('exporter.info.parse_command_stats') as mock_parse:
+            collector.scrape()
+        mock_parse.assert_not_called()
+        assert "commands_total" not in collector._current_metrics
+        assert "memory_used_bytes" not in collector._current_metrics
+        assert "up" in collector._current_metrics
+        
+        collector._register_histogram("commands_latency_seconds", [(float("inf"), 1.0)], 1.0)
+        assert "commands_latency_seconds" not in collector._current_histograms
+
+    def test_metric_filter_invalid_pattern(self):
+        """Test invalid pattern fails collector creation"""
+        with pytest.raises(ValueError):
+            RedisCollector("redis://localhost:6379", Options(include_metrics="redis_("))
+
+    def test_commandstats_top_n(self, sample_info):
+        """Test commandstats top-N from options"""
+        collector = RedisCollector("redis://localhost:6379", Options(commandstats_top_n=1))
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [
+            sample_info, "cmdstat_zadd:calls=1,usec=1,usec_per_call=1.00\n"]
+        collector._connect = lambda: client
+        
+        collector.scrape()
+        commands = [m["labels"]["cmd"] for m in collector._current_metrics["commands_total"]]
+        assert len(commands) == 2
+        assert "other" in commands
+        assert collector._selectors()[1] is None
+
+    def test_samples_interned_across_scrapes(self, sample_info):
+        """Test scrapes reuse samples and drop label sets no longer registered"""
+        collector = RedisCollector("redis://localhost:6379", Options())
+        client = MagicMock()
+        client.info.return_value = sample_info
+        collector._connect = lambda: client
+        
+        collector.scrape()
+        first = {m["labels"]["cmd"]: m for m in collector._current_metrics["commands_total"]}
+        client.info.return_value = sample_info.replace("cmdstat_get:calls=10000", "cmdstat_get:calls=10001") \
+            .replace("cmdstat_del:", "cmdstat_unlink:")
+        collector.scrape()
+        second = {m["labels"]["cmd"]: m for m in collector._current_metrics["commands_total"]}
+        
+        assert second["get"] is first["get"]
+        assert second["get"]["value"] == 10001.0
+        assert second["unlink"] is not first["del"]
+        assert ("del",) not in collector._metric_slots["commands_total"]
+
+    def test_slots_of_missing_families_pruned(self, sample_info):
+        """Test families not registered by a scrape (e.g. failed INFO) don't keep their samples"""
+        collector = RedisCollector("redis://localhost:6379", Options())
+        client = MagicMock()
+        client.info.return_value = sample_info
+        collector._connect = lambda: client
+        
+        collector.scrape()
+        assert "commands_total" in collector._metric_slots
+        client.info.side_effect = Exception("down")
+        collector.scrape()
+        
+        assert "commands_total" not in collector._metric_slots
+        assert collector._current_metrics["up"][0]["value"] == 0.0
+        assert set(collector._metric_slots) == set(collector._current_metrics)
+
+    def test_scrape_phase_timings(self, sample_info):
+        """Test scrapes export phase histograms and Redis traffic counters"""
+        collector = RedisCollector("redis://localhost:6379", Options(check_keys="db0=user:*"))
+        client = MagicMock()
+        client.info.return_value = sample_info
+        client.connection_pool.connection_kwargs = {"db": 0}
+        collector._connect = lambda: client
+        
+        with patch('exporter.keys.get_keys_from_patterns', return_value=[]):
+            collector.scrape()
+        collector.observe_phase("render", 0.002)
+        collector.traffic.add_commands(3)
+        with patch('exporter.keys.get_keys_from_patterns', return_value=[]):
+            collector.scrape()
+        
+        phases = {h["labels"]["phase"]: h
+                  for h in collector._current_histograms["exporter_scrape_phase_duration_seconds"]}
+        assert set(phases) == {"connect", "info_roundtrip", "info_parse", "pattern_expansion",
+                               "key_inspection", "render"}
+        assert phases["connect"]["buckets"][-1] == (float("inf"), 2.0)
+        assert phases["render"]["buckets"][-1] == (float("inf"), 1.0)
+        assert collector._current_metrics["exporter_redis_commands_total"][0]["value"] == 3.0
+        assert collector._current_metrics["exporter_redis_commands_total"][0]["is_counter"]
+
+    def test_duplicate_samples_in_scrape(self):
+        """Test a label set registered twice keeps both samples"""
+        collector = RedisCollector("redis://localhost:6379", Options())
+        
+        collector._register_metric("test_metric", 1.0, labels={"key": "a"})
+        collector._register_metric("test_metric", 2.0, labels={"key": "a"})
+        assert [m["value"] for m in collector._current_metrics["test_metric"]] == [1.0, 2.0]
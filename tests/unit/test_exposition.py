@@ -0,0 +1,103 @@
+"""Unit tests for exposition.py"""
+
+from unittest.mock import patch
+
+from prometheus_client import CollectorRegistry, generate_latest
+from prometheus_client.openmetrics.exposition import generate_latest as generate_latest_openmetrics
+
+from exporter import Options, RedisCollector
+from exporter.exposition import ExpositionRenderer, escape_label_value, format_labels
+
+
+class FamiliesCollector:
+    """Exposes families built by RedisCollector from its current accumulators"""
+
+    def __init__(self, collector):
+        self.collector = collector
+
+    def collect(self):
+        return self.collector._metric_families()
+
+
+def make_collector():
+    collector = RedisCollector("redis://localhost:6379", Options())
+    collector._register_metric("up", 1.0)
+    collector._register_metric("commands_total", 123.0, is_counter=True, labels={"cmd": "get"})
+    collector._register_metric("commands_total", 4.0, is_counter=True, labels={"cmd": "set"})
+    collector._register_metric("db_keys", 1e21, labels={"db": "db0"})
+    collector._register_metric("exporter_last_scrape_error", 1.0,
+                               labels={"error": 'quote " backslash \\ newline \n'})
+    collector._register_histogram("latency_seconds", [(0.001, 1.0), (0.01, 5.0), (float("inf"), 6.0)],
+                                  0.05, labels={"cmd": "get"})
+    collector._register_histogram("keysizes_items", [(1.0, 2.0), (float("inf"), 3.0)], None,
+                                  labels={"db": "db0", "type": "list"})
+    return collector
+
+
+def expected(collector, openmetrics=False):
+    registry = CollectorRegistry()
+    registry.register(FamiliesCollector(collector))
+    if openmetrics:
+        return generate_latest_openmetrics(registry)
+    return generate_latest(registry)
+
+
+class TestFormatting:
+    """Tests for label formatting helpers"""
+
+    def test_escape_label_value(self):
+        """Test escaping of special characters"""
+        assert escape_label_value("plain") == "plain"
+        assert escape_label_value('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+    def test_format_labels(self):
+        """Test label set formatting"""
+        assert format_labels({}) == ""
+        assert format_labels({"b": "2", "a": "1"}) == '{a="1",b="2"}'
+        assert format_labels({"type": "list", "db": "db0"}, "+Inf") == '{db="db0",le="+Inf",type="list"}'
+
+
+class TestExpositionRenderer:
+    """Tests for ExpositionRenderer class"""
+
+    def test_matches_generate_latest(self):
+        """Test text output is identical to prometheus_client"""
+        collector = make_collector()
+        renderer = ExpositionRenderer("redis")
+
+        assert renderer.render(collector) == expected(collector)
+
+    def test_matches_generate_latest_openmetrics(self):
+        """Test OpenMetrics output is identical to prometheus_client"""
+        collector = make_collector()
+        renderer = ExpositionRenderer("redis")
+
+        assert renderer.render(collector, openmetrics=True) == expected(collector, openmetrics=True)
+        assert not renderer.render(collector, openmetrics=True, eof=False).endswith(b"# EOF\n")
+
+    def test_caches_reused(self):
+        """Test headers and label sets are cached across renders"""
+        collector = make_collector()
+        renderer = ExpositionRenderer("redis")
+        first = renderer.render(collector)
+        headers = dict(renderer._headers)
+        labels = dict(renderer._labels)
+
+        collector._current_metrics["up"][0]["value"] = 0.0
+        second = renderer.render(collector)
+
+        assert renderer._headers == headers
+        assert renderer._labels == labels
+        assert b"redis_up 0.0" in second
+        assert first != second
+
+    def test_scrape_output(self, mock_redis_client, sample_info):
+        """Test rendering a scrape of INFO metrics"""
+        collector = RedisCollector("redis://localhost:6379", Options())
+        mock_redis_client.info = lambda *sections: {}
+        with patch("exporter.info.format_info_result", return_value=sample_info), \
+                patch.object(collector, "_connect", return_value=mock_redis_client):
+            collector.scrape()
+
+        assert len(collector._current_metrics) > 10
+        assert ExpositionRenderer("redis").render(collector) == expected(collector)
@@ -0,0 +1,279 @@
+"""Unit tests for http_server.py"""
+
+import asyncio
+import gzip
+import threading
+
+from prometheus_client import CollectorRegistry
+from prometheus_client.core import GaugeMetricFamily
+
+from exporter import Options, RedisCollector
+from exporter.http_server import MetricsServer, MetricsSnapshot, accepts_gzip
+
+
+class CountingCollector:
+    """Collector counting collect() calls, optionally blocking until released"""
+
+    def __init__(self, block: bool = False):
+        self.calls = 0
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def collect(self):
+        self.calls += 1
+        self.release.wait(5)
+        yield GaugeMetricFamily("test_calls", "Collect calls", value=self.calls)
+
+
+def make_server(block: bool = False, snapshot_ttl: float = 0.0):
+    registry = CollectorRegistry()
+    collector = CountingCollector(block=block)
+    registry.register(collector)
+    return MetricsServer(registry, snapshot_ttl=snapshot_ttl), collector
+
+
+async def fetch(port: int, requests: list):
+    """Send requests over one connection, returns list of (status line, headers, body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    try:
+        for request in requests:
+            writer.write(request)
+            await writer.drain()
+            status = (await reader.readline()).decode().strip()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode()
+                if line in ("\r\n", ""):
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = b""
+            if not request.startswith(b"HEAD"):
+                body = await reader.readexactly(int(headers["content-length"]))
+            responses.append((status, headers, body))
+    finally:
+        writer.close()
+    return responses
+
+
+def run_with_server(server: MetricsServer, scenario):
+    async def main():
+        asyncio_server = await server.start("127.0.0.1", 0)
+        port = asyncio_server.sockets[0].getsockname()[1]
+        async with asyncio_server:
+            return await scenario(port)
+    return asyncio.run(main())
+
+
+class TestMetricsSnapshot:
+    """Tests for MetricsSnapshot class"""
+
+    def test_gzipped_once(self):
+        """Test body is compressed once and shared"""
+        snapshot = MetricsSnapshot(b"metric 1\n" * 100, "text/plain")
+
+        async def main():
+            first = await snapshot.gzipped()
+            second = await snapshot.gzipped()
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert first is second
+        assert gzip.decompress(first) == snapshot.body
+
+
+class TestAcceptsGzip:
+    """Tests for accepts_gzip function"""
+
+    def test_q_values(self):
+        """Test gzip is refused with q=0 and accepted otherwise"""
+        assert accepts_gzip("gzip")
+        assert accepts_gzip("deflate, gzip;q=0.5")
+        assert accepts_gzip("*")
+        assert not accepts_gzip("")
+        assert not accepts_gzip("gzip;q=0")
+        assert not accepts_gzip("gzip;q=0.0, deflate")
+        assert not accepts_gzip("*, gzip;q=0")
+        assert not accepts_gzip("identity")
+
+
+class TestMetricsServer:
+    """Tests for MetricsServer class"""
+
+    def test_metrics(self):
+        """Test /metrics returns rendered registry"""
+        server, _ = make_server()
+        responses = run_with_server(server, lambda port: fetch(
+            port, [b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n"]))
+
+        status, headers, body = responses[0]
+        assert status == "HTTP/1.1 200 OK"
+        assert headers["content-type"].startswith("text/plain")
+        assert b"test_calls 1.0" in body
+
+    def test_keep_alive(self):
+        """Test several requests are served over one connection"""
+        server, collector = make_server()
+        request = b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        responses = run_with_server(server, lambda port: fetch(port, [request, request, request]))
+
+        assert [r[0] for r in responses] == ["HTTP/1.1 200 OK"] * 3
+        assert all(r[1]["connection"] == "keep-alive" for r in responses)
+        # snapshot_ttl=0: every sequential scrape collects
+        assert collector.calls == 3
+
+    def test_connection_close(self):
+        """Test Connection: close and HTTP/1.0 close the connection"""
+        server, _ = make_server()
+
+        async def scenario(port):
+            closing = await fetch(port, [b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n"])
+            http10 = await fetch(port, [b"GET / HTTP/1.0\r\n\r\n"])
+            return closing + http10
+
+        responses = run_with_server(server, scenario)
+        assert all(r[1]["connection"] == "close" for r in responses)
+
+    def test_gzip(self):
+        """Test gzip encoding when accepted"""
+        server, _ = make_server()
+        responses = run_with_server(server, lambda port: fetch(
+            port, [b"GET /metrics HTTP/1.1\r\nAccept-Encoding: gzip, deflate\r\n\r\n",
+                   b"GET /metrics HTTP/1.1\r\nAccept-Encoding: gzip;q=0, identity\r\n\r\n"]))
+
+        _, headers, body = responses[0]
+        assert headers["content-encoding"] == "gzip"
+        assert headers["vary"] == "Accept, Accept-Encoding"
+        assert b"test_calls 1.0" in gzip.decompress(body)
+        _, headers, body = responses[1]
+        assert "content-encoding" not in headers
+        assert headers["vary"] == "Accept, Accept-Encoding"
+        assert b"test_calls" in body
+
+    def test_concurrent_scrapes_share_snapshot(self):
+        """Test scrapes during a running collection reuse its result"""
+        server, collector = make_server(block=True)
+        request = b"GET /metrics HTTP/1.1\r\nAccept-Encoding: gzip\r\n\r\n"
+
+        async def scenario(port):
+            tasks = [asyncio.ensure_future(fetch(port, [request])) for _ in range(5)]
+            await asyncio.sleep(0.2)
+            collector.release.set()
+            return await asyncio.gather(*tasks)
+
+        responses = run_with_server(server, scenario)
+        assert collector.calls == 1
+        bodies = {r[0][2] for r in responses}
+        assert len(bodies) == 1
+
+    def test_snapshot_ttl(self):
+        """Test snapshot is reused within the ttl"""
+        server, collector = make_server(snapshot_ttl=60)
+        request = b"GET /metrics HTTP/1.1\r\n\r\n"
+        run_with_server(server, lambda port: fetch(port, [request, request]))
+
+        assert collector.calls == 1
+
+    def test_openmetrics(self):
+        """Test OpenMetrics format is negotiated by Accept"""
+        server, _ = make_server()
+        responses = run_with_server(server, lambda port: fetch(
+            port, [b"GET /metrics HTTP/1.1\r\nAccept: application/openmetrics-text; version=1.0.0\r\n\r\n"]))
+
+        _, headers, body = responses[0]
+        assert headers["content-type"].startswith("application/openmetrics-text")
+        assert body.endswith(b"# EOF\n")
+
+    def test_head(self):
+        """Test HEAD returns headers only"""
+        server, _ = make_server()
+        responses = run_with_server(server, lambda port: fetch(
+            port, [b"HEAD /metrics HTTP/1.1\r\n\r\n", b"GET / HTTP/1.1\r\n\r\n"]))
+
+        assert responses[0][0] == "HTTP/1.1 200 OK"
+        assert int(responses[0][1]["content-length"]) > 0
+        assert b"/metrics" in responses[1][2]
+
+    def test_errors(self):
+        """Test unknown paths, methods and malformed requests"""
+        server, _ = make_server()
+
+        async def scenario(port):
+            responses = await fetch(port, [b"GET /unknown HTTP/1.1\r\n\r\n",
+                                           b"POST /metrics HTTP/1.1\r\nContent-Length: 2\r\n\r\nab"])
+            responses += await fetch(port, [b"garbage\r\n\r\n"])
+            return responses
+
+        responses = run_with_server(server, scenario)
+        assert [r[0] for r in responses] == ["HTTP/1.1 404 Not Found", "HTTP/1.1 405 Method Not Allowed",
+                                             "HTTP/1.1 400 Bad Request"]
+
+    def test_collect_error(self):
+        """Test collection errors return 500 and keep serving"""
+        registry = CollectorRegistry()
+
+        class FailingCollector:
+            def collect(self):
+                raise RuntimeError("boom")
+
+        registry.register(FailingCollector())
+        server = MetricsServer(registry)
+        responses = run_with_server(server, lambda port: fetch(
+            port, [b"GET /metrics HTTP/1.1\r\n\r\n", b"GET / HTTP/1.1\r\n\r\n"]))
+
+        assert responses[0][0] == "HTTP/1.1 500 Internal Server Error"
+        assert responses[1][0] == "HTTP/1.1 200 OK"
+
+    def test_native_collector(self):
+        """Test collector rendered natively followed by the registry"""
+        registry = CollectorRegistry()
+        registry.register(CountingCollector())
+        collector = RedisCollector("redis://localhost:6379", Options())
+        collector.scrape = lambda collect=None: collector._register_metric("up", 1.0)
+        server = MetricsServer(registry, collector=collector)
+
+        responses = run_with_server(server, lambda port: fetch(
+            port, [b"GET /metrics HTTP/1.1\r\n\r\n",
+                   b"GET /metrics HTTP/1.1\r\nAccept: application/openmetrics-text; version=1.0.0\r\n\r\n"]))
+
+        text, openmetrics = responses[0][2], responses[1][2]
+        assert text.startswith(b"# HELP redis_up up\n")
+        assert b"test_calls 1.0" in text
+        assert openmetrics.count(b"# EOF") == 1
+        assert openmetrics.endswith(b"# EOF\n")
+        # Render time is accounted for the next scrape
+        assert collector.timings._phases["render"].bucket_counts[-1] == 0
+        assert sum(collector.timings._phases["render"].bucket_counts) == 2
+
+    def test_protobuf(self):
+        """Test protobuf format is served when preferred"""
+        collector = RedisCollector("redis://localhost:6379", Options())
+        collector.scrape = lambda collect=None: collector._register_metric("up", 1.0)
+        server = MetricsServer(CollectorRegistry(), collector=collector)
+
+        accept = (b"application/vnd.google.protobuf;proto=io.prometheus.client.MetricFamily;"
+                  b"encoding=delimited;q=0.6,text/plain;version=0.0.4;q=0.3")
+        responses = run_with_server(server, lambda port: fetch(
+            port, [b"GET /metrics HTTP/1.1\r\nAccept: " + accept + b"\r\n\r\n"]))
+
+        _, headers, body = responses[0]
+        assert headers["content-type"].startswith("application/vnd.google.protobuf")
+        assert b"redis_up" in body
+
+    def test_collect_selection(self):
+        """Test collect[] query parameters select sub-collectors"""
+        collector = RedisCollector("redis://localhost:6379", Options())
+        selections = []
+        collector.scrape = lambda collect=None: selections.append(collect)
+        server = MetricsServer(CollectorRegistry(), collector=collector)
+
+        responses = run_with_server(server, lambda port: fetch(
+            port, [b"GET /metrics?collect[]=info&collect[]=keys HTTP/1.1\r\n\r\n",
+                   b"GET /metrics HTTP/1.1\r\n\r\n",
+                   b"GET /metrics?collect%5B%5D=unknown HTTP/1.1\r\n\r\n"]))
+
+        assert selections == [frozenset({"info", "keys"}), None]
+        assert [r[0] for r in responses] == ["HTTP/1.1 200 OK", "HTTP/1.1 200 OK", "HTTP/1.1 400 Bad Request"]
+        assert b"unknown" in responses[2][2]
@@ -1,14 +1,23 @@
 """Unit tests for info.py"""
 
 import pytest
+from unittest.mock import MagicMock
+
 from exporter.info import (
     parse_db_keyspace_string,
     parse_command_stats,
     parse_error_stats,
+    parse_connected_slave_string,
+    parse_keysizes_distribution,
+    KEYSIZES_BUCKETS,
     extract_info_metrics,
+    fetch_info,
+    format_info_result,
+    supports_multi_section_info,
     _should_include_metric,
     _get_metric_name,
 )
+from exporter.metrics import TopNSelector
 
 
 class TestParseDbKeyspaceString:
@@ -137,6 +146,51 @@ class TestParseErrorStats:
         assert result is None
 
 
+class TestParseConnectedSlaveString:
+    """Tests for parse_connected_slave_string function"""
+
+    def test_parse_replica(self):
+        """Test parsing replica line"""
+        result = parse_connected_slave_string("slave0", "ip=10.0.0.2,port=6380,state=online,offset=1000,lag=1")
+        assert result == ("10.0.0.2", "6380", "online", 1000.0, 1.0)
+
+    def test_parse_old_format(self):
+        """Test parsing pre-2.8 replica line without lag"""
+        result = parse_connected_slave_string("slave1", "10.0.0.3,6381,wait_bgsave")
+        assert result == ("10.0.0.3", "6381", "wait_bgsave", 0.0, -1.0)
+
+    def test_parse_other_field(self):
+        """Test non replica field"""
+        assert parse_connected_slave_string("slave_repl_offset", "100") is None
+
+
+class TestParseKeysizesDistribution:
+    """Tests for parse_keysizes_distribution function"""
+
+    def test_parse_strings(self):
+        """Test parsing string sizes with K suffix"""
+        db, key_type, buckets = parse_keysizes_distribution("db0_distrib_strings_sizes", "0=2,2=1,1K=3")
+        assert (db, key_type) == ("db0", "string")
+        assert len(buckets) == len(KEYSIZES_BUCKETS)
+        counts = dict(buckets)
+        assert counts[0.0] == 2.0
+        assert counts[3.0] == 3.0
+        assert counts[1023.0] == 3.0
+        assert counts[2047.0] == 6.0
+        assert counts[float("inf")] == 6.0
+
+    def test_parse_large_bins(self):
+        """Test bins over the fixed layout go to +Inf only"""
+        _, key_type, buckets = parse_keysizes_distribution("db3_distrib_hashes_items", "1=5,8G=2")
+        assert key_type == "hash"
+        assert buckets[-2] == (float(2 ** 33 - 1), 5.0)
+        assert buckets[-1] == (float("inf"), 7.0)
+
+    def test_parse_other_field(self):
+        """Test non keysizes field"""
+        assert parse_keysizes_distribution("db0", "keys=1,expires=0") is None
+
+
 class TestExtractInfoMetrics:
     """Tests for extract_info_metrics function"""
 
@@ -249,6 +303,187 @@ errorstat_WRONGTYPE:count=5
         # Check error stats
         assert "errors_total" in mock_collector._current_metrics
 
+    def test_extract_command_stats_top_n(self, sample_info_string, mock_collector):
+        """Test commands outside the top-N are summed as other"""
+        extract_info_metrics(
+            sample_info_string.replace("cmdstat_set", "cmdstat_del:calls=1,usec=100,usec_per_call=100.00\ncmdstat_set"),
+            {},
+            {},
+            mock_collector,
+            command_selector=TopNSelector(top_n=1),
+            command_top_by="usec",
+        )
+        
+        calls = {m["labels"]["cmd"]: m["value"] for m in mock_collector._current_metrics["commands_total"]}
+        duration = {m["labels"]["cmd"]: m["value"]
+                    for m in mock_collector._current_metrics["commands_duration_seconds_total"]}
+        assert calls == {"get": 10000, "other": 5001}
+        assert duration["other"] == pytest.approx(0.0251)
+
+    def test_extract_error_stats_allow_list(self, sample_info_string, mock_collector):
+        """Test error types outside the allow-list are summed as other"""
+        extract_info_metrics(
+            sample_info_string,
+            {},
+            {},
+            mock_collector,
+            error_selector=TopNSelector(allow=["WRONGTYPE"]),
+        )
+        
+        errors = {m["labels"]["err"]: m["value"] for m in mock_collector._current_metrics["errors_total"]}
+        assert errors == {"WRONGTYPE": 5, "other": 10}
+
+
+    def test_extract_stats_from_redis_py_dict(self, mock_collector):
+        """Test commandstats and errorstats parsed by redis-py (no section headers) are selected"""
+        info = format_info_result({
+            "cmdstat_get": {"calls": 100, "usec": 200, "usec_per_call": 2.0},
+            "cmdstat_set": {"calls": 50, "usec": 100, "usec_per_call": 2.0},
+            "cmdstat_del": {"calls": 1, "usec": 1, "usec_per_call": 1.0},
+            "errorstat_ERR": {"count": 3},
+            "errorstat_WRONGTYPE": {"count": 1},
+        })
+        extract_info_metrics(info, {}, {}, mock_collector,
+                             command_selector=TopNSelector(top_n=1),
+                             error_selector=TopNSelector(top_n=1))
+        
+        calls = {m["labels"]["cmd"]: m["value"] for m in mock_collector._current_metrics["commands_total"]}
+        errors = {m["labels"]["err"]: m["value"] for m in mock_collector._current_metrics["errors_total"]}
+        assert calls == {"get": 100, "other": 51}
+        assert errors == {"ERR": 3, "other": 1}
+
+
+class TestExtractReplicationMetrics:
+    """Tests for replication metrics in extract_info_metrics"""
+
+    MASTER_INFO = """# Replication
+role:master
+connected_slaves:2
+slave0:ip=10.0.0.2,port=6380,state=online,offset=1000,lag=1
+slave1:ip=10.0.0.3,port=6381,state=online,offset=1500,lag=0
+master_repl_offset:1500
+"""
+
+    REPLICA_INFO = {
+        "role": "slave",
+        "master_host": "10.0.0.1",
+        "master_port": 6379,
+        "master_link_status": "down",
+        "master_last_io_seconds_ago": -1,
+        "master_sync_in_progress": 1,
+        "master_sync_total_bytes": 1000,
+        "master_sync_read_bytes": 250,
+        "master_sync_left_bytes": 750,
+        "master_sync_perc": "25.00",
+        "slave_repl_offset": 42,
+        "slave_read_only": 1,
+    }
+
+    def test_replica_lag(self, mock_collector):
+        """Test per-replica offset and lag against master_repl_offset"""
+        extract_info_metrics(self.MASTER_INFO, {}, {}, mock_collector)
+        metrics = mock_collector._current_metrics
+
+        lag_bytes = {m["labels"]["slave_ip"]: m["value"] for m in metrics["connected_slave_lag_bytes"]}
+        assert lag_bytes == {"10.0.0.2": 500.0, "10.0.0.3": 0.0}
+        lag_seconds = {m["labels"]["slave_ip"]: m["value"] for m in metrics["connected_slave_lag_seconds"]}
+        assert lag_seconds == {"10.0.0.2": 1.0, "10.0.0.3": 0.0}
+        offset = metrics["connected_slave_offset_bytes"][0]
+        assert offset["value"] == 1000.0
+        assert offset["labels"] == {"slave_ip": "10.0.0.2", "slave_port": "6380", "slave_state": "online"}
+        assert "master_link_up" not in metrics
+
+    def test_replica_side_metrics(self, mock_collector):
+        """Test link status and sync progress on a replica (INFO parsed by redis-py)"""
+        extract_info_metrics(format_info_result(self.REPLICA_INFO), {}, {}, mock_collector)
+        metrics = mock_collector._current_metrics
+
+        assert metrics["master_link_up"][0]["value"] == 0.0
+        assert metrics["master_sync_in_progress"][0]["value"] == 1.0
+        assert metrics["master_sync_left_bytes"][0]["value"] == 750.0
+        assert metrics["master_sync_progress_ratio"][0]["value"] == pytest.approx(0.25)
+        assert metrics["slave_repl_offset"][0]["value"] == 42.0
+        assert metrics["slave_info"][0]["labels"] == {
+            "master_host": "10.0.0.1", "master_port": "6379", "read_only": "1",
+        }
+
+
+class TestExtractKeysizesMetrics:
+    """Tests for keysizes histograms in extract_info_metrics"""
+
+    def test_keysizes_histograms(self, mock_collector):
+        """Test keysizes lines become histograms and not keyspace metrics"""
+        info = format_info_result({
+            "db0": {"keys": 10, "expires": 0, "avg_ttl": 0},
+            "db0_distrib_strings_sizes": {"2": 3, "1K": 1},
+            "db0_distrib_zsets_items": {"16": 2},
+        })
+        extract_info_metrics(info, {}, {}, mock_collector)
+
+        assert [m["labels"]["db"] for m in mock_collector._current_metrics["db_keys"]] == ["db0"]
+        strings = mock_collector._current_histograms["keysizes_string_bytes"][0]
+        assert strings["labels"] == {"db": "db0"}
+        assert strings["sum"] is None
+        items = mock_collector._current_histograms["keysizes_items"][0]
+        assert items["labels"] == {"db": "db0", "type": "zset"}
+        assert dict(items["buckets"])[31.0] == 2.0
+
+
+class TestFetchInfo:
+    """Tests for fetch_info and supports_multi_section_info functions"""
+
+    def test_supports_multi_section_info(self):
+        """Test multi-section INFO is detected from redis_version"""
+        assert supports_multi_section_info("# Server\r\nredis_version:7.2.4\r\n")
+        assert not supports_multi_section_info("redis_version:6.2.14\n")
+        assert not supports_multi_section_info("role:master\n")
+
+    def test_fetch_info(self):
+        """Test extra sections are fetched in one call or pipelined"""
+        client = MagicMock()
+        client.info.return_value = {"role": "master"}
+        assert fetch_info(client) == "role:master\n"
+        client.info.assert_called_once_with()
+
+        fetch_info(client, ("commandstats",), multi_section=True)
+        client.info.assert_called_with("default", "commandstats")
+
+        pipe = client.pipeline.return_value
+        pipe.execute.return_value = [{"role": "master"}, {"cmdstat_get": {"calls": 1, "usec": 2}}]
+        assert fetch_info(client, ("commandstats",)) == "role:master\n\ncmdstat_get:calls=1,usec=2\n"
+        assert [c.args for c in pipe.info.call_args_list] == [(), ("commandstats",)]
+
+
+class TestFormatInfoResult:
+    """Tests for format_info_result function"""
+
+    def test_format_bytes(self):
+        """Test raw bytes reply is decoded"""
+        assert format_info_result(b"# Server\r\nredis_version:7.0.0\r\n") == "# Server\r\nredis_version:7.0.0\r\n"
+
+    def test_format_string(self):
+        """Test string reply is returned as-is"""
+        assert format_info_result("role:master\n") == "role:master\n"
+
+    def test_format_parsed_dict(self):
+        """Test dict parsed by redis-py is converted back to INFO format"""
+        result = format_info_result({
+            "role": "master",
+            "connected_clients": 10,
+            "db0": {"keys": 1, "expires": 0, "avg_ttl": 0},
+            "slave0": {"ip": "10.0.0.1", "port": 6379, "state": "online", "offset": 100, "lag": 0},
+            "cmdstat_get": {"calls": 2, "usec": 10, "usec_per_call": 5.0},
+        })
+        assert "role:master\n" in result
+        assert "connected_clients:10\n" in result
+        assert "db0:keys=1,expires=0,avg_ttl=0\n" in result
+        assert "slave0:ip=10.0.0.1,port=6379,state=online,offset=100,lag=0\n" in result
+        assert "cmdstat_get:calls=2,usec=10,usec_per_call=5.0\n" in result
+
+    def test_format_parsed_dict_bytes_keys(self):
+        """Test bytes keys are decoded"""
+        assert format_info_result({b"role": b"slave"}) == "role:slave\n"
+
 
 class TestShouldIncludeMetric:
     """Tests for _should_include_metric function"""
@@ -7,6 +7,8 @@ from exporter.keys import (
     scan_keys,
     get_key_info,
     get_keys_from_patterns,
+    get_keys_info_pipelined,
+    extract_cluster_check_key_metrics,
 )
 
 
@@ -228,3 +230,92 @@ class TestGetKeysFromPatterns:
         result_keys_bytes = [pair.key for pair in result if isinstance(pair.key, bytes)]
         assert "specific:key" in result_keys or "specific:key".encode() in result_keys_bytes
 
+
+
+class TestGetKeysInfoPipelined:
+    """Tests for get_keys_info_pipelined function"""
+
+    def test_get_keys_info_pipelined(self, mock_redis_client):
+        """Test getting info for many keys in one pipeline"""
+        mock_redis_client.set(b"test:num", b"42")
+        
+        keys = ["test:key1", "test:num", "test:hash1", "test:list1",
+                "test:set1", "test:zset1", "nonexistent:key"]
+        results, errors = get_keys_info_pipelined(mock_redis_client, keys)
+        
+        assert errors == []
+        assert results["test:key1"] == ("string", 6, "value1")
+        assert results["test:num"] == ("string", 2, "42")
+        assert results["test:hash1"] == ("hash", 2, None)
+        assert results["test:list1"] == ("list", 3, None)
+        assert results["test:set1"] == ("set", 2, None)
+        assert results["test:zset1"] == ("zset", 2, None)
+        assert results["nonexistent:key"] == ("none", 0, None)
+
+    def test_get_keys_info_pipelined_empty(self, mock_redis_client):
+        """Test with no keys"""
+        assert get_keys_info_pipelined(mock_redis_client, []) == ({}, [])
+
+
+class TestExtractClusterCheckKeyMetrics:
+    """Tests for extract_cluster_check_key_metrics function"""
+
+    def _make_cluster(self):
+        import fakeredis
+        from unittest.mock import MagicMock
+        from exporter.cluster import ClusterTopology
+        
+        node_clients = {
+            "10.0.0.1:6379": fakeredis.FakeStrictRedis(server=fakeredis.FakeServer()),
+            "10.0.0.2:6379": fakeredis.FakeStrictRedis(server=fakeredis.FakeServer()),
+        }
+        seed = MagicMock()
+        seed.execute_command.return_value = [
+            [b"slots", [0, 8191], b"nodes", [
+                [b"id", b"a", b"ip", b"10.0.0.1", b"port", 6379, b"role", b"master", b"health", b"online"]]],
+            [b"slots", [8192, 16383], b"nodes", [
+                [b"id", b"b", b"ip", b"10.0.0.2", b"port", 6379, b"role", b"master", b"health", b"online"]]],
+        ]
+        topology = ClusterTopology(lambda addr: node_clients[addr])
+        topology.nodes(seed)
+        return topology, seed, node_clients
+
+    def _client_for_key(self, topology, node_clients, key):
+        return node_clients[topology.node_for_key(key).addr]
+
+    def test_single_keys_routed_by_slot(self, mock_collector):
+        """Test single keys are checked on the node owning their slot"""
+        topology, seed, node_clients = self._make_cluster()
+        for key in ["foo", "bar", "{user}:a"]:
+            self._client_for_key(topology, node_clients, key).set(key, "12")
+        
+        extract_cluster_check_key_metrics(topology, seed, "", "foo,bar,{user}:a", mock_collector)
+        topology.close()
+        
+        key_sizes = {m["labels"]["key"]: m["value"] for m in mock_collector._current_metrics["key_size"]}
+        assert key_sizes == {"foo": 2.0, "bar": 2.0, "{user}:a": 2.0}
+        assert all(m["labels"]["db"] == "db0" for m in mock_collector._current_metrics["key_value"])
+
+    def test_patterns_fan_out_to_primaries(self, mock_collector):
+        """Test pattern SCAN runs on every primary"""
+        topology, seed, node_clients = self._make_cluster()
+        keys = [f"job:{i}" for i in range(20)]
+        for key in keys:
+            self._client_for_key(topology, node_clients, key).lpush(key, "x")
+        
+        extract_cluster_check_key_metrics(topology, seed, "job:*", "", mock_collector)
+        topology.close()
+        
+        checked = {m["labels"]["key"] for m in mock_collector._current_metrics["key_size"]}
+        assert checked == set(keys)
+        # Keys live on both shards
+        assert all(node_clients[addr].dbsize() > 0 for addr in node_clients)
+
+    def test_non_zero_db_skipped(self, mock_collector):
+        """Test keys outside db0 are skipped in cluster mode"""
+        topology, seed, node_clients = self._make_cluster()
+        
+        extract_cluster_check_key_metrics(topology, seed, "", "db1=foo", mock_collector)
+        topology.close()
+        
+        assert "key_size" not in mock_collector._current_metrics
@@ -0,0 +1,106 @@
+"""Unit tests for keyspace_events.py"""
+
+import time
+from unittest.mock import MagicMock
+
+import fakeredis
+import redis
+
+from exporter.keyspace_events import (
+    EVENT_FLAGS,
+    NOTIFY_KEYSPACE_EVENTS,
+    KeyspaceEventListener,
+    key_prefix,
+    missing_events,
+    parse_keyspace_dbs,
+)
+
+
+class TestHelpers:
+    """Tests for helper functions"""
+
+    def test_parse_dbs(self):
+        """Test parsing database list"""
+        assert parse_keyspace_dbs("0, db1,,x") == [0, 1]
+
+    def test_key_prefix(self):
+        """Test prefix extraction"""
+        assert key_prefix("job:42:result") == "job"
+        assert key_prefix("counter") == ""
+
+    def test_recommended_flags(self):
+        """Test the recommended setting publishes every counted event"""
+        assert NOTIFY_KEYSPACE_EVENTS.startswith("E")
+        assert set(EVENT_FLAGS) == {"new", "expired", "evicted"}
+        for flag in EVENT_FLAGS.values():
+            assert flag in NOTIFY_KEYSPACE_EVENTS
+        assert len(set(NOTIFY_KEYSPACE_EVENTS)) == len(NOTIFY_KEYSPACE_EVENTS)
+        assert missing_events(NOTIFY_KEYSPACE_EVENTS) == []
+
+    def test_missing_events(self):
+        """Test events not published by notify-keyspace-events"""
+        assert missing_events("") == ["new", "expired", "evicted"]
+        assert missing_events("Kxen") == ["new", "expired", "evicted"]
+        assert missing_events("Ex") == ["new", "evicted"]
+        assert missing_events("EA") == ["new"]
+        assert missing_events("AEn") == []
+
+
+class TestKeyspaceEventListener:
+    """Tests for KeyspaceEventListener class"""
+
+    def test_handle_event(self, mock_collector):
+        """Test events are counted per db, prefix and event"""
+        listener = KeyspaceEventListener(lambda: None, [0])
+        listener.handle_event("__keyevent@0__:expired", "job:1")
+        listener.handle_event("__keyevent@0__:expired", "job:2")
+        listener.handle_event("__keyevent@1__:evicted", "session:1")
+        listener.handle_event("__keyspace@0__:job:1", "expired")
+        listener.start = lambda: None
+
+        listener.collect(mock_collector)
+        counts = {(m["labels"]["db"], m["labels"]["prefix"], m["labels"]["event"]): m["value"]
+                  for m in mock_collector._current_metrics["keyspace_events_total"]}
+        assert counts == {("db0", "job", "expired"): 2.0, ("db1", "session", "evicted"): 1.0}
+
+    def test_prefix_table_bounded(self):
+        """Test new prefixes over the cap are counted as other"""
+        listener = KeyspaceEventListener(lambda: None, [0], max_prefixes=2)
+        for key in ["a:1", "b:1", "c:1", "d:1", "a:2"]:
+            listener.handle_event("__keyevent@0__:set", key)
+
+        assert listener._counts == {("db0", "a", "set"): 2, ("db0", "b", "set"): 1, ("db0", "other", "set"): 2}
+
+    def test_listener_receives_events(self):
+        """Test background listener counts published events"""
+        server = fakeredis.FakeServer()
+        publisher = fakeredis.FakeStrictRedis(server=server)
+        listener = KeyspaceEventListener(lambda: fakeredis.FakeStrictRedis(server=server), [0])
+        listener.start()
+        try:
+            deadline = time.time() + 5
+            while not listener.connected and time.time() < deadline:
+                time.sleep(0.01)
+            publisher.publish("__keyevent@0__:new", "job:1")
+            while not listener._counts and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            listener.stop()
+
+        assert listener._counts == {("db0", "job", "new"): 1}
+
+    def test_warns_about_missing_events(self, caplog):
+        """Test listener warns when Redis doesn't publish counted events"""
+        client = MagicMock()
+        client.config_get.return_value = {"notify-keyspace-events": "xE"}
+        listener = KeyspaceEventListener(lambda: client, [0])
+
+        listener._check_config(client)
+        assert "new, evicted events are not published" in caplog.text
+
+        caplog.clear()
+        client.config_get.return_value = {"notify-keyspace-events": NOTIFY_KEYSPACE_EVENTS}
+        listener._check_config(client)
+        client.config_get.side_effect = redis.exceptions.ResponseError("unknown command 'CONFIG'")
+        listener._check_config(client)
+        assert "not published" not in caplog.text
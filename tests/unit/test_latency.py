@@ -0,0 +1,199 @@
+"""Unit tests for latency.py"""
+
+import pytest
+import redis
+from unittest.mock import MagicMock
+
+from exporter.latency import (
+    LATENCY_BUCKETS_SECONDS,
+    LATENCY_BUCKETS_USEC,
+    LatencyEventCollector,
+    LatencyHistogramCollector,
+    parse_latency_histogram,
+    parse_latency_latest,
+    parse_latency_percentiles,
+)
+
+
+LATENCY_HISTOGRAM_REPLY = [
+    b"set", [b"calls", 100000, b"histogram_usec", [1, 99583, 2, 99852, 4, 99914, 8, 99940, 16, 99968, 33, 100000]],
+    b"get", [b"calls", 10, b"histogram_usec", [4, 7, 16, 10]],
+]
+
+
+def make_client(histogram_reply, latencystats=None):
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    pipe.execute.return_value = [histogram_reply, latencystats if latencystats is not None else {}]
+    return client
+
+
+class TestParseLatencyHistogram:
+    """Tests for parse_latency_histogram function"""
+
+    def test_parse_histogram(self):
+        """Test parsing LATENCY HISTOGRAM reply"""
+        result = parse_latency_histogram(LATENCY_HISTOGRAM_REPLY)
+        assert set(result) == {"set", "get"}
+
+        calls, counts = result["get"]
+        assert calls == 10
+        assert len(counts) == len(LATENCY_BUCKETS_USEC)
+        # Missing buckets are filled with the previous cumulative count
+        assert counts[:6] == [0, 0, 7, 7, 10, 10]
+        assert counts[-1] == 10
+
+    def test_parse_histogram_rounded_buckets(self):
+        """Test buckets above 16us (33, 66, 1052...) map to their power of two"""
+        reply = [b"get", [b"calls", 10, b"histogram_usec", [66, 4, 1052, 10]]]
+        calls, counts = parse_latency_histogram(reply)["get"]
+        assert counts[5] == 0
+        assert counts[6] == 4
+        assert counts[9] == 4
+        assert counts[10] == 10
+
+        calls, counts = parse_latency_histogram(LATENCY_HISTOGRAM_REPLY)["set"]
+        assert counts[4:7] == [99968, 100000, 100000]
+
+    def test_parse_histogram_resp3(self):
+        """Test parsing RESP3 map reply"""
+        reply = {b"ping": {b"calls": 3, b"histogram_usec": {1: 2, 2: 3}}}
+        calls, counts = parse_latency_histogram(reply)["ping"]
+        assert calls == 3
+        assert counts[:3] == [2, 3, 3]
+
+    def test_bucket_layout_shared(self):
+        """Test bucket layout is computed once and ends with +Inf"""
+        assert LATENCY_BUCKETS_SECONDS[0] == 1e-6
+        assert LATENCY_BUCKETS_SECONDS[-1] == float("inf")
+        assert len(LATENCY_BUCKETS_SECONDS) == len(LATENCY_BUCKETS_USEC) + 1
+
+
+class TestParseLatencyPercentiles:
+    """Tests for parse_latency_percentiles function"""
+
+    def test_parse_percentiles(self):
+        """Test parsing latencystats line"""
+        cmd, percentiles = parse_latency_percentiles("latency_percentiles_usec_get", "p50=1.003,p99=2.007,p99.9=4.015")
+        assert cmd == "get"
+        assert percentiles == [("0.5", pytest.approx(1.003e-6)), ("0.99", pytest.approx(2.007e-6)),
+                               ("0.999", pytest.approx(4.015e-6))]
+
+    def test_parse_other_field(self):
+        """Test non latencystats field"""
+        assert parse_latency_percentiles("cmdstat_get", "calls=1") is None
+
+
+class TestLatencyHistogramCollector:
+    """Tests for LatencyHistogramCollector class"""
+
+    def test_collect_histograms(self, mock_collector):
+        """Test histograms are registered with sums from the scrape's commandstats"""
+        client = make_client(
+            LATENCY_HISTOGRAM_REPLY,
+            latencystats={"latency_percentiles_usec_get": {"p50": 8.0, "p99": 16.0}},
+        )
+        mock_collector._register_metric("commands_duration_seconds_total", 90e-6, is_counter=True,
+                                        labels={"cmd": "get"})
+        LatencyHistogramCollector().collect(client, mock_collector)
+        assert client.pipeline.return_value.execute_command.call_count == 2
+
+        histograms = {h["labels"]["cmd"]: h for h in mock_collector._current_histograms["command_latency_seconds"]}
+        get = histograms["get"]
+        assert get["sum"] == pytest.approx(90e-6)
+        buckets = dict(get["buckets"])
+        assert buckets[4e-6] == 7
+        assert buckets[16e-6] == 10
+        assert buckets[float("inf")] == 10
+        assert histograms["set"]["sum"] is None
+
+        percentiles = {(m["labels"]["cmd"], m["labels"]["quantile"]): m["value"]
+                       for m in mock_collector._current_metrics["command_latency_percentiles_seconds"]}
+        assert percentiles[("get", "0.99")] == pytest.approx(16e-6)
+
+    def test_unsupported_disables_collector(self, mock_collector):
+        """Test Redis < 7.0 disables collector"""
+        client = make_client(redis.exceptions.ResponseError("ERR unknown subcommand 'HISTOGRAM'"))
+        collector = LatencyHistogramCollector()
+        collector.collect(client, mock_collector)
+        collector.collect(client, mock_collector)
+
+        assert collector.supported is False
+        assert client.pipeline.call_count == 1
+        assert mock_collector._current_histograms == {}
+
+
+class FakeLatencyClient:
+    """Minimal client answering LATENCY LATEST / LATENCY HISTORY"""
+
+    def __init__(self):
+        self.history = {}
+        self.history_requests = []
+
+    def add(self, event, timestamp, latency_ms):
+        self.history.setdefault(event, []).append([timestamp, latency_ms])
+
+    def execute_command(self, *args):
+        if args == ("LATENCY", "LATEST"):
+            return [[event.encode(), samples[-1][0], samples[-1][1], max(s[1] for s in samples)]
+                    for event, samples in self.history.items()]
+        if args[:2] == ("LATENCY", "HISTORY"):
+            self.history_requests.append(args[2])
+            return self.history.get(args[2], [])
+        raise ValueError(args)
+
+    def pipeline(self, transaction=True):
+        client = self
+        pipe = MagicMock()
+        commands = []
+        pipe.execute_command.side_effect = lambda *args: commands.append(args)
+        pipe.execute.side_effect = lambda raise_on_error=True: [client.execute_command(*a) for a in commands]
+        return pipe
+
+
+class TestLatencyEventCollector:
+    """Tests for LatencyEventCollector class"""
+
+    def test_parse_latency_latest(self):
+        """Test parsing LATENCY LATEST reply"""
+        result = parse_latency_latest([[b"command", 1700000000, 250, 1000], [b"bad"]])
+        assert result == {"command": (1700000000, 0.25, 1.0)}
+
+    def test_collect_events(self, mock_collector):
+        """Test per-event metrics and spike counts on first scrape"""
+        client = FakeLatencyClient()
+        client.add("command", 100, 300)
+        client.add("command", 110, 200)
+        client.add("fork", 105, 50)
+
+        LatencyEventCollector().collect(client, mock_collector)
+        metrics = mock_collector._current_metrics
+
+        last = {m["labels"]["event_name"]: m["value"] for m in metrics["latency_spike_last"]}
+        assert last == {"command": 110.0, "fork": 105.0}
+        durations = {m["labels"]["event_name"]: m["value"] for m in metrics["latency_spike_duration_seconds"]}
+        assert durations["command"] == pytest.approx(0.2)
+        maxes = {m["labels"]["event_name"]: m["value"] for m in metrics["latency_spike_max_duration_seconds"]}
+        assert maxes["command"] == pytest.approx(0.3)
+        spikes = {m["labels"]["event_name"]: m["value"] for m in metrics["latency_spikes_total"]}
+        assert spikes == {"command": 2.0, "fork": 1.0}
+
+    def test_history_only_for_changed_events(self, mock_collector):
+        """Test LATENCY HISTORY is requested only when latest timestamp changes"""
+        client = FakeLatencyClient()
+        client.add("command", 100, 300)
+        client.add("fork", 105, 50)
+
+        events = LatencyEventCollector()
+        events.collect(client, mock_collector)
+        assert sorted(client.history_requests) == ["command", "fork"]
+
+        # Nothing changed: no HISTORY requests
+        events.collect(client, mock_collector)
+        assert len(client.history_requests) == 2
+
+        client.add("fork", 120, 70)
+        client.add("fork", 130, 80)
+        events.collect(client, mock_collector)
+        assert client.history_requests[2:] == ["fork"]
+        assert events._spikes == {"command": 1, "fork": 3}
@@ -0,0 +1,86 @@
+"""Unit tests for memory.py"""
+
+import pytest
+import redis
+from unittest.mock import MagicMock, patch
+
+from exporter.memory import MemoryStatsCollector, memory_stats_metric_name
+
+
+MEMORY_STATS_REPLY = [
+    b"peak.allocated", 1048576,
+    b"overhead.total", 900000,
+    b"db.0", [b"overhead.hashtable.main", 72, b"overhead.hashtable.expires", 32],
+    b"db.3", [b"overhead.hashtable.main", 24, b"overhead.hashtable.expires", 0],
+    b"dataset.percentage", b"12.5",
+    b"allocator-fragmentation.ratio", b"1.25",
+    b"allocator-fragmentation.bytes", 4096,
+    b"keys.bytes-per-key", 120,
+]
+
+
+class TestMemoryStatsMetricName:
+    """Tests for memory_stats_metric_name function"""
+
+    @pytest.mark.parametrize("key,name", [
+        ("peak.allocated", "memory_stats_peak_allocated_bytes"),
+        ("allocator-fragmentation.ratio", "memory_stats_allocator_fragmentation_ratio"),
+        ("allocator-fragmentation.bytes", "memory_stats_allocator_fragmentation_bytes"),
+        ("dataset.percentage", "memory_stats_dataset_percentage"),
+        ("fragmentation", "memory_stats_fragmentation"),
+        ("keys.bytes-per-key", "memory_stats_keys_bytes_per_key"),
+    ])
+    def test_metric_name(self, key, name):
+        """Test field to metric name conversion"""
+        assert memory_stats_metric_name(key) == name
+
+
+class TestMemoryStatsCollector:
+    """Tests for MemoryStatsCollector class"""
+
+    def test_flatten(self):
+        """Test nested reply is flattened with per-db labels"""
+        samples = MemoryStatsCollector().flatten(MEMORY_STATS_REPLY)
+        by_key = {(name, labels.get("db")): value for name, value, labels in samples}
+
+        assert by_key[("memory_stats_peak_allocated_bytes", None)] == 1048576.0
+        assert by_key[("memory_stats_dataset_percentage", None)] == 12.5
+        assert by_key[("memory_stats_allocator_fragmentation_ratio", None)] == 1.25
+        assert by_key[("memory_stats_db_overhead_hashtable_main_bytes", "db0")] == 72.0
+        assert by_key[("memory_stats_db_overhead_hashtable_expires_bytes", "db3")] == 0.0
+
+    def test_plan_compiled_once(self):
+        """Test metric names are computed once per field"""
+        stats = MemoryStatsCollector()
+        with patch("exporter.memory.memory_stats_metric_name",
+                   side_effect=memory_stats_metric_name) as name_func:
+            stats.flatten(MEMORY_STATS_REPLY)
+            calls = name_func.call_count
+            stats.flatten(MEMORY_STATS_REPLY)
+            assert name_func.call_count == calls
+        # db.0 and db.3 share the same sub-field names
+        assert len(stats._db_plan) == 2
+
+    def test_collect_interval(self, mock_collector):
+        """Test MEMORY STATS runs once per interval and cached samples are served"""
+        client = MagicMock()
+        client.execute_command.return_value = MEMORY_STATS_REPLY
+        stats = MemoryStatsCollector(interval=60)
+
+        with patch("exporter.memory.time.time", side_effect=[1000.0, 1030.0]):
+            stats.collect(client, mock_collector)
+            stats.collect(client, mock_collector)
+
+        client.execute_command.assert_called_once_with("MEMORY", "STATS")
+        assert len(mock_collector._current_metrics["memory_stats_peak_allocated_bytes"]) == 2
+
+    def test_unsupported(self, mock_collector):
+        """Test unknown command disables collector"""
+        client = MagicMock()
+        client.execute_command.side_effect = redis.exceptions.ResponseError("ERR unknown command 'MEMORY'")
+        stats = MemoryStatsCollector(interval=0)
+        stats.collect(client, mock_collector)
+        stats.collect(client, mock_collector)
+
+        assert stats.supported is False
+        assert client.execute_command.call_count == 1
@@ -8,6 +8,10 @@ from exporter.metrics import (
     format_keyspace_info,
     format_cmdstat_info,
     should_include_metric,
+    parse_metric_patterns,
+    MetricFilter,
+    TopNSelector,
+    parse_name_list,
 )
 
 
@@ -228,3 +232,107 @@ class TestShouldIncludeMetric:
         assert should_include_metric("other_metric", metric_map_gauges, metric_map_counters) is False
         assert should_include_metric("random_key", metric_map_gauges, metric_map_counters) is False
 
+
+
+class TestParseMetricPatterns:
+    """Tests for parse_metric_patterns function"""
+
+    def test_parse(self):
+        """Test parsing comma-separated patterns"""
+        assert parse_metric_patterns("redis_up, redis_db_.*,") == ["redis_up", "redis_db_.*"]
+        assert parse_metric_patterns("") == []
+
+    def test_invalid(self):
+        """Test invalid regex raises ValueError"""
+        with pytest.raises(ValueError):
+            parse_metric_patterns("redis_(")
+
+
+class TestMetricFilter:
+    """Tests for MetricFilter class"""
+
+    def test_include(self):
+        """Test only included metrics pass"""
+        metric_filter = MetricFilter("redis", include=["redis_up", "redis_commands_.*"])
+        assert metric_filter.allows("up")
+        assert metric_filter.allows("commands_total")
+        assert not metric_filter.allows("db_keys")
+        # Patterns match full names
+        assert not metric_filter.allows("up_time")
+
+    def test_exclude(self):
+        """Test excluded metrics are dropped, exclude wins over include"""
+        metric_filter = MetricFilter("redis", include=["redis_commands_.*"],
+                                     exclude=["redis_commands_failed_calls_total", "redis_commands_rejected.*"])
+        assert metric_filter.allows("commands_total")
+        assert not metric_filter.allows("commands_failed_calls_total")
+        assert not metric_filter.allows("commands_rejected_calls_total")
+
+        metric_filter = MetricFilter("redis", exclude=["redis_db_.*"])
+        assert metric_filter.allows("up")
+        assert not metric_filter.allows("db_keys")
+
+    def test_cached(self):
+        """Test decisions are cached"""
+        metric_filter = MetricFilter("redis", exclude=["redis_db_.*"])
+        metric_filter.allows("db_keys")
+        assert metric_filter._cache == {"db_keys": False}
+
+
+class TestTopNSelector:
+    """Tests for TopNSelector class"""
+
+    def test_no_limit(self):
+        """Test all names are selected without limits"""
+        assert TopNSelector().select({"get": 1.0, "set": 2.0}) == {"get", "set"}
+
+    def test_allow_list(self):
+        """Test only allowed names are selected"""
+        assert TopNSelector(allow=parse_name_list("get, set")).select(
+            {"get": 1.0, "set": 2.0, "hget": 3.0}) == {"get", "set"}
+
+    def test_top_n(self):
+        """Test top names by score are selected"""
+        selector = TopNSelector(top_n=2)
+        assert selector.select({"get": 10.0, "set": 5.0, "hget": 1.0}) == {"get", "set"}
+
+    def test_hysteresis(self):
+        """Test members are only replaced by clearly stronger names"""
+        selector = TopNSelector(top_n=2, hysteresis=1.2)
+        selector.select({"get": 100.0, "set": 50.0, "hget": 10.0})
+
+        # hget slightly overtakes set: membership is kept
+        assert selector.select({"get": 100.0, "set": 50.0, "hget": 55.0}) == {"get", "set"}
+        # hget clearly overtakes set: replaced
+        assert selector.select({"get": 100.0, "set": 50.0, "hget": 70.0}) == {"get", "hget"}
+
+    def test_member_disappears(self):
+        """Test members missing from scores are replaced"""
+        selector = TopNSelector(top_n=2)
+        selector.select({"get": 100.0, "set": 50.0, "hget": 10.0})
+        assert selector.select({"get": 100.0, "hget": 10.0, "del": 5.0}) == {"get", "hget"}
+
+    def test_other_totals_monotonic(self):
+        """Test "other" doesn't drop when a name is promoted or demoted"""
+        selector = TopNSelector(top_n=1, hysteresis=1.2)
+        scores = {"get": 100.0, "set": 50.0, "hget": 10.0}
+        selector.select(scores)
+        assert selector.other_totals({k: (v,) for k, v in scores.items()}) == [60.0]
+
+        # hget replaces get: hget's calls stay in "other", get adds nothing yet
+        scores = {"get": 101.0, "set": 55.0, "hget": 200.0}
+        assert selector.select(scores) == {"hget"}
+        assert selector.other_totals({k: (v,) for k, v in scores.items()}) == [65.0]
+
+        # Demoted get adds its increases from now on, new del counts fully
+        scores = {"get": 103.0, "set": 56.0, "hget": 300.0, "del": 2.0}
+        selector.select(scores)
+        assert selector.other_totals({k: (v,) for k, v in scores.items()}) == [70.0]
+
+    def test_other_totals_counter_reset(self):
+        """Test counters going down (server restart) count from zero"""
+        selector = TopNSelector(top_n=1)
+        selector.select({"get": 100.0, "set": 50.0})
+        selector.other_totals({"get": (100.0,), "set": (50.0,)})
+        selector.select({"get": 10.0, "set": 5.0})
+        assert selector.other_totals({"get": (10.0,), "set": (5.0,)}) == [55.0]
@@ -0,0 +1,263 @@
+"""Unit tests for protobuf.py"""
+
+import struct
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, Summary
+
+from exporter import Options, RedisCollector
+from exporter.latency import LATENCY_BUCKETS_SECONDS
+from exporter.protobuf import (
+    COUNTER,
+    GAUGE,
+    HISTOGRAM,
+    SUMMARY,
+    ProtobufRenderer,
+    accepts_protobuf,
+    encode_varint,
+    encode_zigzag,
+    native_layout,
+)
+
+# 2^-20s (~1us) .. 0.5s
+POWER_OF_TWO_BUCKETS = tuple(2.0 ** i for i in range(-20, 0)) + (float("inf"),)
+
+
+def read_varint(data: bytes, pos: int):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return result, pos
+
+
+def unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def decode_message(data: bytes) -> dict:
+    """Decode message into {field: [values]} (varints as int, doubles as float, bytes otherwise)"""
+    fields = {}
+    pos = 0
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 1:
+            value = struct.unpack("<d", data[pos:pos + 8])[0]
+            pos += 8
+        elif wire_type == 2:
+            length, pos = read_varint(data, pos)
+            value = data[pos:pos + length]
+            pos += length
+        else:
+            raise ValueError(f"Unexpected wire type {wire_type}")
+        fields.setdefault(field, []).append(value)
+    return fields
+
+
+def decode_families(data: bytes) -> dict:
+    """Decode delimited MetricFamily stream into {name: (type, [metric fields])}"""
+    families = {}
+    pos = 0
+    while pos < len(data):
+        length, pos = read_varint(data, pos)
+        family = decode_message(data[pos:pos + length])
+        pos += length
+        metrics = [decode_message(m) for m in family.get(4, [])]
+        families[family[1][0].decode()] = (family[3][0], metrics)
+    return families
+
+
+def labels_of(metric: dict) -> dict:
+    pairs = [decode_message(p) for p in metric.get(1, [])]
+    return {p[1][0].decode(): p[2][0].decode() for p in pairs}
+
+
+def decode_native(histogram: dict) -> dict:
+    """Expand native positive buckets into {index: count}"""
+    buckets = {}
+    deltas = []
+    data = histogram.get(13, [b""])[0]
+    pos = 0
+    while pos < len(data):
+        value, pos = read_varint(data, pos)
+        deltas.append(unzigzag(value))
+    index = 0
+    count = 0
+    delta_iter = iter(deltas)
+    first = True
+    for span in histogram.get(12, []):
+        span = decode_message(span)
+        offset = unzigzag(span.get(1, [0])[0])
+        index = offset if first else index + offset
+        first = False
+        for _ in range(span.get(2, [0])[0]):
+            count += next(delta_iter)
+            buckets[index] = count
+            index += 1
+    return buckets
+
+
+class TestEncoding:
+    """Tests for low level encoding helpers"""
+
+    @pytest.mark.parametrize("value,encoded", [(0, b"\x00"), (1, b"\x01"), (300, b"\xac\x02")])
+    def test_varint(self, value, encoded):
+        """Test varint encoding"""
+        assert encode_varint(value) == encoded
+
+    @pytest.mark.parametrize("value,encoded", [(0, b"\x00"), (-1, b"\x01"), (1, b"\x02"), (-2, b"\x03")])
+    def test_zigzag(self, value, encoded):
+        """Test zigzag encoding"""
+        assert encode_zigzag(value) == encoded
+
+
+class TestAcceptsProtobuf:
+    """Tests for accepts_protobuf function"""
+
+    PROTOBUF = "application/vnd.google.protobuf;proto=io.prometheus.client.MetricFamily;encoding=delimited"
+
+    def test_accepts(self):
+        """Test protobuf preferred by Prometheus"""
+        assert accepts_protobuf(f"{self.PROTOBUF};q=0.6,application/openmetrics-text;version=1.0.0;q=0.5,"
+                                "text/plain;version=0.0.4;q=0.4,*/*;q=0.1")
+        assert accepts_protobuf(self.PROTOBUF)
+
+    def test_not_preferred(self):
+        """Test other formats with higher q win"""
+        assert not accepts_protobuf(f"{self.PROTOBUF};q=0.5,application/openmetrics-text;version=1.0.0")
+        assert not accepts_protobuf("text/plain")
+        assert not accepts_protobuf("")
+        assert not accepts_protobuf("application/vnd.google.protobuf;encoding=text")
+
+
+class TestNativeLayout:
+    """Tests for native_layout function"""
+
+    def test_latency_layout(self):
+        """Test power-of-two microsecond buckets stay classic (not powers of two in seconds)"""
+        assert native_layout(LATENCY_BUCKETS_SECONDS) is None
+
+    def test_negative_exponents(self):
+        """Test power-of-two fractions of a second map to consecutive native buckets"""
+        assert native_layout(POWER_OF_TWO_BUCKETS) == (False, list(range(-20, 0)))
+
+    def test_powers_of_two(self):
+        """Test exact powers of two and zero bucket"""
+        assert native_layout((0.0, 1.0, 2.0, 4.0, float("inf"))) == (True, [0, 1, 2])
+
+    def test_classic_layouts(self):
+        """Test layouts that are not exponential stay classic"""
+        assert native_layout((0.001, 0.0025, 0.005, 0.01, 1.0, float("inf"))) is None
+        assert native_layout((0.0, 1.0, 3.0, 7.0, float("inf"))) is None
+        assert native_layout((float("inf"),)) is None
+
+
+class TestProtobufRenderer:
+    """Tests for ProtobufRenderer class"""
+
+    def make_collector(self):
+        collector = RedisCollector("redis://localhost:6379", Options())
+        collector._register_metric("up", 1.0)
+        collector._register_metric("commands_total", 7.0, is_counter=True, labels={"cmd": "get"})
+        return collector
+
+    def test_gauges_and_counters(self):
+        """Test gauge and counter families"""
+        families = decode_families(ProtobufRenderer("redis").render(self.make_collector()))
+
+        metric_type, metrics = families["redis_up"]
+        assert metric_type == GAUGE
+        assert decode_message(metrics[0][2][0])[1] == [1.0]
+
+        metric_type, metrics = families["redis_commands_total"]
+        assert metric_type == COUNTER
+        assert labels_of(metrics[0]) == {"cmd": "get"}
+        assert decode_message(metrics[0][3][0])[1] == [7.0]
+
+    def test_native_histogram(self):
+        """Test power-of-two histogram is sent as sparse native histogram"""
+        collector = self.make_collector()
+        # 3 calls <= 2^-20s, 2 calls in (2^-18s, 2^-17s], 1 call over the last bound
+        counts = [3, 3, 3, 5] + [5] * (len(POWER_OF_TWO_BUCKETS) - 5) + [6]
+        collector._register_histogram("request_duration_seconds",
+                                      list(zip(POWER_OF_TWO_BUCKETS, map(float, counts))),
+                                      0.5, labels={"cmd": "get"})
+
+        families = decode_families(ProtobufRenderer("redis").render(collector))
+        metric_type, metrics = families["redis_request_duration_seconds"]
+        histogram = decode_message(metrics[0][7][0])
+
+        assert metric_type == HISTOGRAM
+        assert histogram[1] == [6]
+        assert histogram[2] == [0.5]
+        assert 3 not in histogram  # no classic buckets
+        assert decode_native(histogram) == {-20: 3, -17: 2, 0: 1}
+
+    def test_native_histogram_with_classic_buckets(self):
+        """Test classic buckets are added on request"""
+        collector = self.make_collector()
+        collector._register_histogram("h", [(1.0, 1.0), (2.0, 2.0), (float("inf"), 2.0)], 3.0)
+
+        families = decode_families(ProtobufRenderer("redis", classic_histograms=True).render(collector))
+        histogram = decode_message(families["redis_h"][1][0][7][0])
+
+        assert len(histogram[3]) == 2
+        assert decode_native(histogram) == {0: 1, 1: 1}
+
+    def test_empty_native_histogram(self):
+        """Test empty native histogram has a no-op span"""
+        collector = self.make_collector()
+        collector._register_histogram("h", [(1.0, 0.0), (float("inf"), 0.0)], 0.0)
+
+        families = decode_families(ProtobufRenderer("redis").render(collector))
+        histogram = decode_message(families["redis_h"][1][0][7][0])
+
+        assert len(histogram[12]) == 1
+        assert decode_native(histogram) == {}
+
+    def test_classic_histogram(self):
+        """Test non-exponential layouts are sent as classic buckets"""
+        collector = self.make_collector()
+        collector._register_histogram("keysizes_items", [(0.0, 1.0), (1.0, 2.0), (3.0, 4.0), (float("inf"), 4.0)],
+                                      None, labels={"db": "db0"})
+
+        families = decode_families(ProtobufRenderer("redis").render(collector))
+        histogram = decode_message(families["redis_keysizes_items"][1][0][7][0])
+
+        assert histogram[1] == [4]
+        assert 2 not in histogram
+        assert [decode_message(b)[1][0] for b in histogram[3]] == [1, 2, 4]
+        assert 5 not in histogram
+
+    def test_registry(self):
+        """Test prometheus_client registry metrics"""
+        registry = CollectorRegistry()
+        Counter("requests", "Requests", ["path"], registry=registry).labels("/").inc(2)
+        Gauge("temperature", "Temperature", registry=registry).set(21.5)
+        Histogram("duration_seconds", "Duration", buckets=(0.5, 1.0, 2.0), registry=registry).observe(0.7)
+        Summary("size_bytes", "Size", registry=registry).observe(10)
+
+        families = decode_families(ProtobufRenderer("").render_registry(registry))
+
+        assert families["requests_total"][0] == COUNTER
+        assert labels_of(families["requests_total"][1][0]) == {"path": "/"}
+        assert "requests_created" not in families
+        assert decode_message(families["temperature"][1][0][2][0])[1] == [21.5]
+
+        metric_type, metrics = families["duration_seconds"]
+        histogram = decode_message(metrics[0][7][0])
+        assert metric_type == HISTOGRAM
+        assert histogram[1] == [1]
+        assert decode_native(histogram) == {0: 1}
+
+        metric_type, metrics = families["size_bytes"]
+        summary = decode_message(metrics[0][4][0])
+        assert metric_type == SUMMARY
+        assert summary[1] == [1]
+        assert summary[2] == [10.0]
@@ -3,7 +3,8 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
-from exporter.redis_client import connect_to_redis, do_redis_cmd
+from exporter.redis_client import RedisTraffic, connect_to_redis, decode_reply, do_redis_cmd, pairs_to_dict
+from exporter.resp_server import RespServer, ServerThread, VirtualKeyspace
 
 
 class TestConnectToRedis:
@@ -100,6 +101,25 @@ class TestConnectToRedis:
         assert call_kwargs["socket_timeout"] == 10.0
         assert call_kwargs["socket_connect_timeout"] == 10.0
 
+    @patch('exporter.redis_client.redis.Redis')
+    def test_connect_resp3_single_connection(self, mock_redis_class):
+        """Test RESP3 single connection client with connect callback"""
+        mock_client = MagicMock()
+        mock_client.ping.return_value = True
+        mock_redis_class.return_value = mock_client
+        on_connect = Mock()
+        
+        connect_to_redis("redis://localhost:6379", protocol=3, max_connections=1,
+                         redis_connect_func=on_connect)
+        
+        call_kwargs = mock_redis_class.call_args[1]
+        assert call_kwargs["protocol"] == 3
+        assert call_kwargs["max_connections"] == 1
+        assert call_kwargs["redis_connect_func"] is on_connect
+        
+        connect_to_redis("redis://localhost:6379")
+        assert "protocol" not in mock_redis_class.call_args[1]
+
     @patch('exporter.redis_client.redis.Redis')
     def test_connect_set_client_name(self, mock_redis_class):
         """Test setting client name"""
@@ -158,6 +178,27 @@ class TestConnectToRedis:
         assert client == mock_client
 
 
+    def test_connect_counts_traffic(self):
+        """Test commands and bytes read are counted, pipelines per command"""
+        server = RespServer({0: VirtualKeyspace(10)})
+        traffic = RedisTraffic()
+        with ServerThread([server]):
+            client = connect_to_redis(f"redis://127.0.0.1:{server.port}", traffic=traffic)
+            # Connection handshake, PING and CLIENT SETNAME
+            assert traffic.commands >= 2
+            
+            commands, read_bytes = traffic.commands, traffic.read_bytes
+            assert client.get("key:0") == b"0"
+            assert traffic.read_bytes - read_bytes == len(b"$1\r\n0\r\n")
+            
+            pipe = client.pipeline(transaction=False)
+            pipe.dbsize()
+            pipe.echo("x")
+            pipe.execute()
+            assert traffic.commands - commands == 3
+            assert traffic.read_bytes - read_bytes == len(b"$1\r\n0\r\n:10\r\n$1\r\nx\r\n")
+
+
 class TestDoRedisCmd:
     """Tests for do_redis_cmd function"""
 
@@ -199,3 +240,25 @@ class TestDoRedisCmd:
         with pytest.raises(Exception, match="Command failed"):
             do_redis_cmd(mock_client, "INVALID", "command")
 
+
+
+class TestReplyHelpers:
+    """Tests for decode_reply and pairs_to_dict functions"""
+
+    def test_decode_reply(self):
+        """Test decoding reply items"""
+        assert decode_reply(b"master") == "master"
+        assert decode_reply(6379) == "6379"
+        assert decode_reply("ok") == "ok"
+
+    def test_pairs_to_dict_flat_list(self):
+        """Test converting flat key/value list"""
+        assert pairs_to_dict([b"ip", b"10.0.0.1", b"port", 6379]) == {"ip": b"10.0.0.1", "port": 6379}
+
+    def test_pairs_to_dict_resp3_map(self):
+        """Test converting RESP3 map"""
+        assert pairs_to_dict({b"quorum": 2}) == {"quorum": 2}
+
+    def test_pairs_to_dict_odd_length(self):
+        """Test trailing key without value is ignored"""
+        assert pairs_to_dict([b"a", 1, b"b"]) == {"a": 1}
@@ -0,0 +1,71 @@
+"""Unit tests for redis_config.py"""
+
+import redis
+from unittest.mock import MagicMock, patch
+
+from exporter.redis_config import ConfigCollector, parse_config_patterns
+
+
+def make_client(*replies):
+    client = MagicMock()
+    client.pipeline.return_value.execute.return_value = list(replies)
+    return client
+
+
+class TestParseConfigPatterns:
+    """Tests for parse_config_patterns function"""
+
+    def test_parse_patterns(self):
+        """Test splitting and trimming patterns"""
+        assert parse_config_patterns("maxmemory, maxclients,,io-*") == ["maxmemory", "maxclients", "io-*"]
+        assert parse_config_patterns("") == []
+
+
+class TestConfigCollector:
+    """Tests for ConfigCollector class"""
+
+    def test_collect_values(self, mock_collector):
+        """Test numeric and string settings"""
+        client = make_client(
+            [b"maxmemory", b"1073741824"],
+            [b"io-threads", b"4", b"io-threads-do-reads", b"no"],
+            [b"save", b"3600 1 300 100"],
+        )
+        ConfigCollector(["maxmemory", "io-threads*", "save"]).collect(client, mock_collector)
+        metrics = mock_collector._current_metrics
+
+        assert metrics["config_maxmemory"][0]["value"] == 1073741824.0
+        assert metrics["config_io_threads"][0]["value"] == 4.0
+        string_values = {m["labels"]["key"]: m["labels"]["value"] for m in metrics["config_key_value"]}
+        assert string_values == {"io-threads-do-reads": "no", "save": "3600 1 300 100"}
+
+    def test_cached_between_refreshes(self, mock_collector):
+        """Test CONFIG GET runs once per TTL"""
+        client = make_client([b"maxclients", b"10000"])
+        config = ConfigCollector(["maxclients"], ttl=300)
+
+        with patch("exporter.redis_config.time.time", side_effect=[1000.0, 1100.0, 1400.0]):
+            config.collect(client, mock_collector)
+            config.collect(client, mock_collector)
+            assert client.pipeline.call_count == 1
+            config.collect(client, mock_collector)
+            assert client.pipeline.call_count == 2
+
+        assert len(mock_collector._current_metrics["config_maxclients"]) == 3
+
+    def test_renamed_command(self, mock_collector):
+        """Test configured command name is used"""
+        client = make_client([b"hz", b"10"])
+        ConfigCollector(["hz"], command="MYCONFIG").collect(client, mock_collector)
+        client.pipeline.return_value.execute_command.assert_called_once_with("MYCONFIG", "GET", "hz")
+
+    def test_acl_denied_disables(self, mock_collector):
+        """Test ACL denied CONFIG disables collector"""
+        client = make_client(redis.exceptions.NoPermissionError("NOPERM this user has no permissions"))
+        config = ConfigCollector(["maxmemory"], ttl=0)
+        config.collect(client, mock_collector)
+        config.collect(client, mock_collector)
+
+        assert config.supported is False
+        assert client.pipeline.call_count == 1
+        assert mock_collector._current_metrics == {}
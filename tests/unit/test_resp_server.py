@@ -0,0 +1,171 @@
+"""Unit tests for resp_server.py"""
+
+import time
+
+import pytest
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+
+from exporter import Options, RedisCollector
+from exporter.cluster import parse_cluster_shards
+from exporter.resp_server import (
+    Fault,
+    RespServer,
+    ServerThread,
+    Status,
+    VirtualKeyspace,
+    encode,
+    parse_faults,
+    make_info,
+    split_info_sections,
+)
+
+
+@pytest.fixture
+def server():
+    server = RespServer({0: VirtualKeyspace(100_000, "user:"), 1: VirtualKeyspace(10)},
+                        slowlog_per_second=1000.0)
+    with ServerThread([server]):
+        yield server
+
+
+def client_for(server, protocol=2):
+    return redis.Redis(host="127.0.0.1", port=server.port, protocol=protocol, socket_timeout=5)
+
+
+class TestEncoding:
+    """Tests for encode and INFO helpers"""
+
+    def test_encode(self):
+        """Test RESP2 and RESP3 encoding"""
+        assert encode(Status("OK")) == b"+OK\r\n"
+        assert encode(None) == b"$-1\r\n"
+        assert encode(42) == b":42\r\n"
+        assert encode([b"a", 1]) == b"*2\r\n$1\r\na\r\n:1\r\n"
+        assert encode({b"k": b"v"}) == b"*2\r\n$1\r\nk\r\n$1\r\nv\r\n"
+        assert encode({b"k": b"v"}, resp3=True) == b"%1\r\n$1\r\nk\r\n$1\r\nv\r\n"
+
+    def test_split_info_sections(self):
+        """Test INFO text is split by section"""
+        sections = split_info_sections(make_info(commands=2, keys={0: 5}))
+        assert sections["keyspace"].startswith("# Keyspace\r\ndb0:keys=5")
+        assert sections["commandstats"].count("cmdstat_") == 2
+
+    def test_parse_faults(self):
+        """Test fault specs"""
+        faults = parse_faults(["info=0.5"], ["*=0.1"], ["scan=0.2:10"])
+        assert faults["INFO"] == Fault(latency=0.5)
+        assert faults["*"].error_rate == 0.1
+        assert faults["SCAN"].stall_rate == 0.2 and faults["SCAN"].stall_seconds == 10.0
+        with pytest.raises(ValueError):
+            parse_faults(["INFO"], [], [])
+
+
+class TestVirtualKeyspace:
+    """Tests for VirtualKeyspace class"""
+
+    def test_lookup(self):
+        """Test keys exist only within the keyspace"""
+        keyspace = VirtualKeyspace(100, "k:")
+        assert keyspace.index(b"k:42") == 42
+        assert keyspace.index(b"k:100") is None
+        assert keyspace.index(b"k:042") is None
+        assert keyspace.index(b"other") is None
+
+    def test_scan(self):
+        """Test cursor iteration covers every matching key once"""
+        keyspace = VirtualKeyspace(1000, "k:")
+        cursor, found = 0, []
+        while True:
+            cursor, batch = keyspace.scan(cursor, b"k:1*", 128, None)
+            found += batch
+            if cursor == 0:
+                break
+        assert len(found) == 111
+        assert keyspace.scan(0, None, 12, "hash")[1] == [b"k:1", b"k:7"]
+
+
+class TestRespServer:
+    """Tests for RespServer class"""
+
+    @pytest.mark.parametrize("protocol", [2, 3])
+    def test_commands(self, server, protocol):
+        """Test commands over RESP2 and RESP3"""
+        client = client_for(server, protocol)
+
+        assert client.ping()
+        assert client.dbsize() == 100_000
+        assert client.type("user:0") == b"string"
+        assert client.get("user:0") == b"0"
+        assert client.hlen("user:1") > 0
+        assert client.type("missing") == b"none"
+        with pytest.raises(redis.ResponseError):
+            client.llen("user:0")
+        assert client.config_get("maxmemory") == {"maxmemory": "0"}
+
+        client.select(1)
+        assert client.dbsize() == 10
+
+    def test_info_sections(self, server):
+        """Test INFO sections like Redis (commandstats only on request)"""
+        client = client_for(server)
+        assert "cmdstat_command1" not in client.info()
+        assert "cmdstat_command1" in client.info("commandstats")
+        assert client.info("keyspace") == {"db0": {"keys": 100000, "expires": 0, "avg_ttl": 0},
+                                           "db1": {"keys": 10, "expires": 0, "avg_ttl": 0}}
+
+    def test_slowlog(self, server):
+        """Test slowlog entries grow over time"""
+        time.sleep(0.01)
+        client = client_for(server)
+        entries = client.execute_command("SLOWLOG", "GET", 3)
+        assert len(entries) == 3
+        assert entries[0][0] > entries[1][0]
+        assert client.execute_command("SLOWLOG", "LEN") > 0
+
+    def test_cluster(self):
+        """Test single-node cluster topology"""
+        server = RespServer(cluster=True)
+        with ServerThread([server]):
+            client = client_for(server)
+            nodes = parse_cluster_shards(client.execute_command("CLUSTER", "SHARDS"))
+            assert [(n.port, n.role, n.slots) for n in nodes] == [(server.port, "master", [(0, 16383)])]
+            assert b"cluster_state:ok" in client.execute_command("CLUSTER", "INFO")
+
+    def test_faults(self, server):
+        """Test injected errors and latency"""
+        client = client_for(server)
+        server.faults["DBSIZE"] = Fault(error_rate=1.0)
+        server.faults["TYPE"] = Fault(latency=0.05)
+
+        with pytest.raises(redis.ResponseError, match="injected"):
+            client.dbsize()
+        start = time.time()
+        client.type("user:1")
+        assert time.time() - start >= 0.05
+
+    def test_stall_times_out(self, server):
+        """Test stalled replies hit the client timeout"""
+        server.faults["PING"] = Fault(stall_rate=1.0, stall_seconds=10)
+        client = redis.Redis(host="127.0.0.1", port=server.port, socket_timeout=0.1, retry=Retry(NoBackoff(), 0))
+        with pytest.raises(redis.TimeoutError):
+            client.ping()
+
+    def test_exporter_scrape(self, server):
+        """Test exporter scrape with key checks against the stand-in"""
+        collector = RedisCollector(f"redis://127.0.0.1:{server.port}", Options(check_keys="db0=user:999*"))
+        collector.scrape()
+
+        assert collector._current_metrics["up"][0]["value"] == 1.0
+        assert len(collector._current_metrics["db_keys"]) == 2
+        assert len(collector._current_metrics["key_size"]) == 111
+
+    def test_exporter_scrape_stats_top_n(self, server):
+        """Test commandstats and errorstats reach the top-N selectors against the stand-in"""
+        options = Options(commandstats_top_n=3, errorstats_top_n=2)
+        collector = RedisCollector(f"redis://127.0.0.1:{server.port}", options)
+        collector.scrape()
+
+        assert len(collector._current_metrics["commands_total"]) == 4
+        assert len(collector._current_metrics["errors_total"]) == 3
@@ -0,0 +1,115 @@
+"""Unit tests for scripts.py"""
+
+import pytest
+import redis
+from unittest.mock import MagicMock, patch
+
+from exporter.scripts import LuaScript, ScriptCollector, parse_script_arg, parse_script_result
+
+
+SCRIPT_SOURCE = 'return {"jobs_pending", redis.call("LLEN", "jobs"), "jobs_failed", "3"}'
+
+
+@pytest.fixture
+def script_file(tmp_path):
+    path = tmp_path / "jobs.lua"
+    path.write_text(SCRIPT_SOURCE)
+    return str(path)
+
+
+def make_client(reply=None):
+    client = MagicMock()
+    client.script_load.return_value = b"abc123"
+    client.evalsha.return_value = reply if reply is not None else [b"jobs_pending", 5, b"jobs_failed", b"3"]
+    return client
+
+
+class TestParseScriptArg:
+    """Tests for parse_script_arg function"""
+
+    def test_parse_scripts(self, script_file):
+        """Test reading scripts with default and per-script settings"""
+        scripts = parse_script_arg(f"{script_file}, {script_file}?interval=60&timeout=5", interval=10)
+        assert [s.source for s in scripts] == [SCRIPT_SOURCE, SCRIPT_SOURCE]
+        assert scripts[0].filename == "jobs.lua"
+        assert (scripts[0].interval, scripts[0].timeout) == (10, None)
+        assert (scripts[1].interval, scripts[1].timeout) == (60.0, 5.0)
+
+    def test_missing_file(self, tmp_path):
+        """Test missing script fails at startup"""
+        with pytest.raises(OSError):
+            parse_script_arg(str(tmp_path / "missing.lua"))
+
+
+class TestParseScriptResult:
+    """Tests for parse_script_result function"""
+
+    def test_parse_pairs(self):
+        """Test name/value pairs, non-numeric values are skipped"""
+        assert parse_script_result([b"a", 1, b"b", b"2.5", b"c", b"x"]) == [("a", 1.0), ("b", 2.5)]
+
+    def test_parse_invalid(self):
+        """Test non-array reply"""
+        with pytest.raises(ValueError):
+            parse_script_result(b"OK")
+
+
+class TestScriptCollector:
+    """Tests for ScriptCollector class"""
+
+    def test_collect_values(self, mock_collector):
+        """Test script is loaded once and run with EVALSHA"""
+        client = make_client()
+        scripts = ScriptCollector([LuaScript("/s/jobs.lua", SCRIPT_SOURCE)], connect=None)
+        scripts.collect(client, mock_collector)
+        scripts.collect(client, mock_collector)
+
+        client.script_load.assert_called_once_with(SCRIPT_SOURCE)
+        assert client.evalsha.call_count == 2
+        client.evalsha.assert_called_with("abc123", 0)
+
+        values = {m["labels"]["key"]: m["value"] for m in mock_collector._current_metrics["script_values"]}
+        assert values == {"jobs_pending": 5.0, "jobs_failed": 3.0}
+        assert mock_collector._current_metrics["script_result"][0]["value"] == 1.0
+
+    def test_noscript_reloads(self, mock_collector):
+        """Test NOSCRIPT reloads the script and retries"""
+        client = make_client()
+        client.evalsha.side_effect = [redis.exceptions.NoScriptError("NOSCRIPT"), [b"a", 1]]
+        script = LuaScript("/s/a.lua", "return {'a', 1}")
+        script.sha = "stale"
+
+        ScriptCollector([script], connect=None).collect(client, mock_collector)
+
+        client.script_load.assert_called_once()
+        assert script.values == [("a", 1.0)]
+        assert script.ok is True
+
+    def test_interval_serves_cached_result(self, mock_collector):
+        """Test script runs once per interval"""
+        client = make_client()
+        scripts = ScriptCollector([LuaScript("/s/jobs.lua", SCRIPT_SOURCE, interval=60)], connect=None)
+
+        with patch("exporter.scripts.time.time", return_value=1000.0):
+            scripts.collect(client, mock_collector)
+        with patch("exporter.scripts.time.time", return_value=1030.0):
+            scripts.collect(client, mock_collector)
+
+        assert client.evalsha.call_count == 1
+        assert len(mock_collector._current_metrics["script_values"]) == 4
+
+    def test_timeout(self, mock_collector):
+        """Test timed out script uses own client, is killed and reported"""
+        client = make_client()
+        script_client = make_client()
+        script_client.evalsha.side_effect = redis.exceptions.TimeoutError("Timeout reading")
+        connect = MagicMock(return_value=script_client)
+
+        scripts = ScriptCollector([LuaScript("/s/slow.lua", "while true do end", timeout=2.0)], connect)
+        scripts.collect(client, mock_collector)
+
+        connect.assert_called_once_with(2.0)
+        client.execute_command.assert_called_once_with("SCRIPT", "KILL")
+        assert scripts._clients == {}
+        assert mock_collector._current_metrics["script_result"][0]["value"] == 0.0
+        assert mock_collector._current_metrics["script_errors_total"][0]["value"] == 1.0
@@ -0,0 +1,253 @@
+"""Unit tests for sentinel.py"""
+
+import threading
+
+import pytest
+import redis
+from unittest.mock import MagicMock, patch
+
+from exporter import Options, RedisCollector
+from exporter.sentinel import (
+    SentinelResolver,
+    extract_sentinel_metrics,
+    is_sentinel_addr,
+    parse_sentinel_addr,
+)
+
+
+SENTINEL_MASTERS_REPLY = [
+    [b"name", b"mymaster", b"ip", b"10.0.0.1", b"port", b"6379", b"flags", b"master",
+     b"num-slaves", b"2", b"num-other-sentinels", b"2", b"quorum", b"2"],
+    [b"name", b"other", b"ip", b"10.0.0.5", b"port", b"6380", b"flags", b"master,s_down",
+     b"num-slaves", b"0", b"num-other-sentinels", b"1", b"quorum", b"1"],
+]
+
+
+class TestParseSentinelAddr:
+    """Tests for parse_sentinel_addr function"""
+
+    def test_is_sentinel_addr(self):
+        """Test sentinel address detection"""
+        assert is_sentinel_addr("redis+sentinel://localhost:26379/mymaster")
+        assert is_sentinel_addr("rediss+sentinel://localhost:26379/mymaster")
+        assert not is_sentinel_addr("redis://localhost:6379")
+
+    def test_parse_multiple_sentinels(self):
+        """Test parsing address with several sentinels"""
+        target = parse_sentinel_addr("redis+sentinel://s1:26379,s2:26380,s3/mymaster")
+        assert target.sentinels == [("s1", 26379), ("s2", 26380), ("s3", 26379)]
+        assert target.master_name == "mymaster"
+        assert target.role == "master"
+        assert target.tls is False
+
+    def test_parse_credentials_and_role(self):
+        """Test parsing credentials and replica role"""
+        target = parse_sentinel_addr("rediss+sentinel://user:p%40ss@s1:26379/mymaster?role=slave")
+        assert target.user == "user"
+        assert target.password == "p@ss"
+        assert target.role == "replica"
+        assert target.tls is True
+
+    def test_parse_missing_master_name(self):
+        """Test master name is required"""
+        with pytest.raises(ValueError):
+            parse_sentinel_addr("redis+sentinel://s1:26379")
+
+    def test_parse_invalid_role(self):
+        """Test invalid role raises error"""
+        with pytest.raises(ValueError):
+            parse_sentinel_addr("redis+sentinel://s1:26379/mymaster?role=primary")
+
+
+class TestSentinelResolver:
+    """Tests for SentinelResolver class"""
+
+    def _make_resolver(self, addr="redis+sentinel://s1:26379,s2:26379/mymaster"):
+        sentinel_client = MagicMock()
+        sentinel_client.execute_command.return_value = [b"10.0.0.1", b"6379"]
+        resolver = SentinelResolver(parse_sentinel_addr(addr), lambda host, port: sentinel_client)
+        return resolver, sentinel_client
+
+    def test_resolve_master(self):
+        """Test resolving master address"""
+        resolver, sentinel_client = self._make_resolver()
+        assert resolver.resolve() == ("10.0.0.1", 6379)
+        sentinel_client.execute_command.assert_called_once_with(
+            "SENTINEL", "GET-MASTER-ADDR-BY-NAME", "mymaster")
+
+    def test_resolve_cached(self):
+        """Test Sentinel isn't queried again while address is cached"""
+        resolver, sentinel_client = self._make_resolver()
+        resolver.resolve()
+        resolver.resolve()
+        assert sentinel_client.execute_command.call_count == 1
+
+    def test_switch_master_updates_address(self):
+        """Test +switch-master event updates cached address without a query"""
+        resolver, sentinel_client = self._make_resolver()
+        resolver.resolve()
+
+        resolver.handle_event("+switch-master", "mymaster 10.0.0.1 6379 10.0.0.2 6379")
+        assert resolver.resolve() == ("10.0.0.2", 6379)
+        assert sentinel_client.execute_command.call_count == 1
+        assert resolver.switch_master_events == 1
+
+    def test_switch_master_other_master_ignored(self):
+        """Test events for other masters are ignored"""
+        resolver, _ = self._make_resolver()
+        resolver.resolve()
+
+        resolver.handle_event("+switch-master", "other 10.0.0.5 6379 10.0.0.6 6379")
+        assert resolver.cached_address == ("10.0.0.1", 6379)
+        assert resolver.switch_master_events == 0
+
+    def test_resolve_replica(self):
+        """Test resolving a healthy replica"""
+        resolver, sentinel_client = self._make_resolver("redis+sentinel://s1/mymaster?role=replica")
+        sentinel_client.execute_command.return_value = [
+            [b"ip", b"10.0.0.3", b"port", b"6379", b"flags", b"slave,s_down"],
+            [b"ip", b"10.0.0.4", b"port", b"6379", b"flags", b"slave"],
+        ]
+        assert resolver.resolve() == ("10.0.0.4", 6379)
+
+    def test_replica_sdown_invalidates(self):
+        """Test +sdown of the cached replica invalidates address"""
+        resolver, sentinel_client = self._make_resolver("redis+sentinel://s1/mymaster?role=replica")
+        sentinel_client.execute_command.return_value = [
+            [b"ip", b"10.0.0.4", b"port", b"6379", b"flags", b"slave"],
+        ]
+        resolver.resolve()
+
+        resolver.handle_event("+sdown", "slave 10.0.0.4:6379 10.0.0.4 6379 @ mymaster 10.0.0.1 6379")
+        assert resolver.cached_address is None
+
+    def test_failover_to_next_sentinel(self):
+        """Test next sentinel is used when the first one fails"""
+        good = MagicMock()
+        good.execute_command.return_value = [b"10.0.0.1", b"6379"]
+        bad = MagicMock()
+        bad.execute_command.side_effect = redis.exceptions.ConnectionError("refused")
+        clients = {"s1": bad, "s2": good}
+
+        resolver = SentinelResolver(parse_sentinel_addr("redis+sentinel://s1,s2/mymaster"),
+                                    lambda host, port: clients[host])
+        assert resolver.resolve() == ("10.0.0.1", 6379)
+
+    def test_watcher_has_own_connection(self):
+        """Test watcher errors don't close the client shared with scrapes"""
+        subscribed = threading.Event()
+        clients = []
+
+        def connect(host, port):
+            client = MagicMock()
+            client.pubsub.return_value.subscribe.side_effect = lambda *channels: subscribed.set()
+            client.pubsub.return_value.get_message.side_effect = redis.exceptions.ConnectionError("lost")
+            clients.append(client)
+            return client
+
+        resolver = SentinelResolver(parse_sentinel_addr("redis+sentinel://s1,s2/mymaster"), connect)
+        shared = resolver.sentinel_client()
+        resolver.start()
+        assert subscribed.wait(5)
+        resolver.stop()
+
+        watcher_client = clients[1]
+        assert watcher_client is not shared
+        watcher_client.close.assert_called()
+        # Shared client is closed only by stop(), sentinels weren't rotated
+        assert shared.close.call_count == 1
+        assert resolver.target.sentinels[0] == ("s1", 26379)
+
+    def test_failed_query_rotates_once(self):
+        """Test a failed query closes the shared client and rotates sentinels"""
+        bad = MagicMock()
+        bad.execute_command.side_effect = redis.exceptions.ConnectionError("refused")
+        good = MagicMock()
+        good.execute_command.return_value = [b"10.0.0.1", b"6379"]
+        clients = {"s1": bad, "s2": good}
+
+        resolver = SentinelResolver(parse_sentinel_addr("redis+sentinel://s1,s2/mymaster"),
+                                    lambda host, port: clients[host])
+        assert resolver.resolve() == ("10.0.0.1", 6379)
+        bad.close.assert_called_once()
+        assert resolver.target.sentinels == [("s2", 26379), ("s1", 26379)]
+        assert resolver.sentinel_client() is good
+
+
+class TestExtractSentinelMetrics:
+    """Tests for extract_sentinel_metrics function"""
+
+    def test_extract_sentinel_metrics(self, mock_collector):
+        """Test metrics from SENTINEL MASTERS"""
+        extract_sentinel_metrics(SENTINEL_MASTERS_REPLY, mock_collector)
+        metrics = mock_collector._current_metrics
+
+        assert metrics["sentinel_masters"][0]["value"] == 2.0
+
+        quorum = {m["labels"]["master_name"]: m["value"] for m in metrics["sentinel_master_quorum"]}
+        assert quorum == {"mymaster": 2.0, "other": 1.0}
+
+        sentinels = {m["labels"]["master_name"]: m["value"] for m in metrics["sentinel_master_sentinels"]}
+        assert sentinels == {"mymaster": 3.0, "other": 2.0}
+
+        slaves = {m["labels"]["master_name"]: m["value"] for m in metrics["sentinel_master_slaves"]}
+        assert slaves == {"mymaster": 2.0, "other": 0.0}
+
+        status = {m["labels"]["master_name"]: m for m in metrics["sentinel_master_status"]}
+        assert status["mymaster"]["value"] == 1.0
+        assert status["mymaster"]["labels"]["master_address"] == "10.0.0.1:6379"
+        assert status["other"]["value"] == 0.0
+        assert status["other"]["labels"]["master_status"] == "sdown"
+
+    def test_extract_empty(self, mock_collector):
+        """Test empty reply"""
+        extract_sentinel_metrics([], mock_collector)
+        assert mock_collector._current_metrics["sentinel_masters"][0]["value"] == 0.0
+
+
+class TestSentinelCollector:
+    """Tests for Sentinel mode in RedisCollector"""
+
+    @patch('exporter.exporter.connect_to_redis')
+    def test_connect_follows_switch_master(self, mock_connect):
+        """Test collector reconnects after failover event"""
+        mock_connect.side_effect = lambda addr, **kwargs: MagicMock(name=addr)
+
+        collector = RedisCollector("redis+sentinel://s1:26379/mymaster", Options())
+        sentinel_client = MagicMock()
+        sentinel_client.execute_command.return_value = [b"10.0.0.1", b"6379"]
+        collector.sentinel.connect = lambda host, port: sentinel_client
+        collector.sentinel.start = lambda: None
+
+        collector._connect()
+        assert mock_connect.call_args[0][0] == "redis://10.0.0.1:6379"
+
+        collector.sentinel.handle_event("+switch-master", "mymaster 10.0.0.1 6379 10.0.0.2 6379")
+        collector._connect()
+        assert mock_connect.call_args[0][0] == "redis://10.0.0.2:6379"
+        # Sentinel was queried only once
+        assert sentinel_client.execute_command.call_count == 1
+
+    @patch('exporter.exporter.connect_to_redis')
+    def test_scrape_sentinel_selection(self, mock_connect):
+        """Test Sentinel metrics follow collect[] and their errors are handled by the scrape"""
+        redis_client = MagicMock()
+        redis_client.info.return_value = "redis_version:7.2.0\r\n"
+        mock_connect.return_value = redis_client
+
+        collector = RedisCollector("redis+sentinel://s1:26379/mymaster", Options())
+        sentinel_client = MagicMock()
+        sentinel_client.execute_command.side_effect = lambda *args: (
+            SENTINEL_MASTERS_REPLY if args[1] == "MASTERS" else [b"10.0.0.1", b"6379"])
+        collector.sentinel.connect = lambda host, port: sentinel_client
+        collector.sentinel.start = lambda: None
+
+        collector.scrape({"info"})
+        assert "sentinel_masters" not in collector._current_metrics
+
+        collector.scrape({"sentinel"})
+        assert collector._current_metrics["sentinel_masters"][0]["value"] == 2.0
+
+        with patch('exporter.exporter.extract_sentinel_metrics', side_effect=ValueError("bad reply")):
+            collector.scrape()
+        assert collector._current_metrics["up"][0]["value"] == 0.0
@@ -0,0 +1,190 @@
+"""Unit tests for slowlog.py"""
+
+import pytest
+
+from exporter.slowlog import SlowlogCollector, parse_slowlog_entry
+
+
+class FakeSlowlogClient:
+    """Minimal client answering SLOWLOG commands, recording GET sizes"""
+
+    def __init__(self, max_len=128):
+        self.entries = []
+        self.next_id = 0
+        self.max_len = max_len
+        self.get_sizes = []
+
+    def add(self, cmd, duration_usec):
+        entry = [self.next_id, 1700000000, duration_usec, [cmd.encode(), b"key"], b"127.0.0.1:5000", b""]
+        self.entries.insert(0, entry)
+        del self.entries[self.max_len:]
+        self.next_id += 1
+
+    def execute_command(self, *args):
+        if args[:2] == ("SLOWLOG", "LEN"):
+            return len(self.entries)
+        if args[:2] == ("SLOWLOG", "GET"):
+            self.get_sizes.append(args[2])
+            return self.entries[:args[2]]
+        raise ValueError(args)
+
+    def pipeline(self, transaction=True):
+        client = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def execute_command(self, *args):
+                self.commands.append(args)
+
+            def execute(self):
+                return [client.execute_command(*args) for args in self.commands]
+
+        return Pipeline()
+
+
+class TestParseSlowlogEntry:
+    """Tests for parse_slowlog_entry function"""
+
+    def test_parse_entry(self):
+        """Test parsing raw slowlog entry"""
+        entry = [14, 1309448221, 15000, [b"SET", b"key", b"value"], b"127.0.0.1:58217", b"worker"]
+        assert parse_slowlog_entry(entry) == (14, 0.015, "set")
+
+    def test_parse_invalid_entry(self):
+        """Test invalid entry returns None"""
+        assert parse_slowlog_entry([b"x"]) is None
+
+
+class TestSlowlogCollector:
+    """Tests for SlowlogCollector class"""
+
+    def test_first_scrape_ingests_all(self, mock_collector):
+        """Test all existing entries are ingested on first scrape"""
+        client = FakeSlowlogClient()
+        client.add("get", 2000)
+        client.add("set", 20000)
+        client.add("get", 3000000)
+
+        slowlog = SlowlogCollector()
+        slowlog.collect(client, mock_collector)
+
+        metrics = mock_collector._current_metrics
+        assert metrics["slowlog_length"][0]["value"] == 3.0
+        assert metrics["slowlog_last_id"][0]["value"] == 2.0
+        assert metrics["last_slow_execution_duration_seconds"][0]["value"] == 3.0
+
+        counts = {m["labels"]["cmd"]: m["value"] for m in metrics["slowlog_commands_total"]}
+        assert counts == {"get": 2.0, "set": 1.0}
+
+        histograms = {h["labels"]["cmd"]: h
+                      for h in mock_collector._current_histograms["slowlog_command_duration_seconds"]}
+        get_buckets = dict(histograms["get"]["buckets"])
+        assert get_buckets[0.0025] == 1.0
+        assert get_buckets[2.5] == 1.0
+        assert get_buckets[5.0] == 2.0
+        assert get_buckets[float("inf")] == 2.0
+        assert histograms["get"]["sum"] == pytest.approx(3.002)
+
+    def test_fetches_only_new_entries(self, mock_collector):
+        """Test subsequent scrapes fetch only entries added since the last one"""
+        client = FakeSlowlogClient()
+        for _ in range(50):
+            client.add("get", 1000)
+
+        slowlog = SlowlogCollector()
+        slowlog.fetch(client)
+        assert client.get_sizes == [1, 50]
+
+        client.add("set", 1000)
+        client.add("set", 1000)
+        slowlog.fetch(client)
+        assert client.get_sizes[-2:] == [1, 2]
+
+        # Nothing new: only LEN and GET 1
+        slowlog.fetch(client)
+        assert client.get_sizes[-1:] == [1]
+        assert len(client.get_sizes) == 5
+
+        assert slowlog._commands["get"].count == 50
+        assert slowlog._commands["set"].count == 2
+
+    def test_missed_entries_counted(self):
+        """Test entries rotated out between scrapes are counted"""
+        client = FakeSlowlogClient(max_len=10)
+        client.add("get", 1000)
+
+        slowlog = SlowlogCollector()
+        slowlog.fetch(client)
+
+        for _ in range(15):
+            client.add("get", 1000)
+        slowlog.fetch(client)
+
+        assert slowlog.missed_entries == 5
+        assert slowlog._commands["get"].count == 11
+
+    def test_server_restart(self):
+        """Test IDs going backwards re-ingest available entries"""
+        client = FakeSlowlogClient()
+        for _ in range(5):
+            client.add("get", 1000)
+
+        slowlog = SlowlogCollector()
+        slowlog.fetch(client)
+
+        restarted = FakeSlowlogClient()
+        restarted.add("set", 1000)
+        slowlog.fetch(restarted)
+
+        assert slowlog.last_id == 0
+        assert slowlog._commands["set"].count == 1
+
+    def test_max_commands_cap(self, mock_collector):
+        """Test commands over the cap are accounted as other"""
+        client = FakeSlowlogClient()
+        for cmd in ["get", "set", "hgetall", "zrange"]:
+            client.add(cmd, 1000)
+
+        slowlog = SlowlogCollector(max_commands=2)
+        slowlog.collect(client, mock_collector)
+
+        counts = {m["labels"]["cmd"]: m["value"] for m in mock_collector._current_metrics["slowlog_commands_total"]}
+        assert counts == {"get": 1.0, "set": 1.0, "other": 2.0}
+
+    def test_max_commands_ranked_by_activity(self, mock_collector):
+        """Test a command getting hot later replaces the weakest exported one"""
+        client = FakeSlowlogClient()
+        for cmd in ["get", "get", "set", "hgetall"]:
+            client.add(cmd, 1000)
+        slowlog = SlowlogCollector(max_commands=2)
+        slowlog.collect(client, mock_collector)
+
+        for _ in range(5):
+            client.add("zrange", 1000)
+        mock_collector._current_metrics.clear()
+        mock_collector._current_histograms.clear()
+        slowlog.collect(client, mock_collector)
+
+        counts = {m["labels"]["cmd"]: m["value"] for m in mock_collector._current_metrics["slowlog_commands_total"]}
+        # Demoted set keeps its past entries out of "other", so "other" never decreases
+        assert counts == {"get": 2.0, "zrange": 5.0, "other": 1.0}
+        other = [h for h in mock_collector._current_histograms["slowlog_command_duration_seconds"]
+                 if h["labels"]["cmd"] == "other"][0]
+        assert other["buckets"][-1] == (float("inf"), 1.0)
+
+        client.add("set", 1000)
+        mock_collector._current_metrics.clear()
+        slowlog.collect(client, mock_collector)
+        counts = {m["labels"]["cmd"]: m["value"] for m in mock_collector._current_metrics["slowlog_commands_total"]}
+        assert counts["other"] == 2.0
+
+    def test_error_is_logged(self, mock_collector):
+        """Test errors (e.g. ACL denied) don't raise"""
+        class FailingClient(FakeSlowlogClient):
+            def execute_command(self, *args):
+                raise Exception("NOPERM")
+
+        SlowlogCollector().collect(FailingClient(), mock_collector)
+        assert "slowlog_length" not in mock_collector._current_metrics
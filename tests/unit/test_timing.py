@@ -0,0 +1,37 @@
+"""Unit tests for timing.py"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from exporter.timing import ScrapeTimings
+
+
+class TestScrapeTimings:
+    """Tests for ScrapeTimings class"""
+
+    def test_collect_histograms(self):
+        """Test observations accumulate into cumulative buckets per phase"""
+        timings = ScrapeTimings(buckets=(0.01, 0.1))
+        timings.observe("connect", 0.005)
+        timings.observe("connect", 0.05)
+        timings.observe("render", 1.0)
+
+        collector = MagicMock()
+        timings.collect(collector)
+
+        calls = {c.kwargs["labels"]["phase"]: c.args for c in collector._register_histogram.call_args_list}
+        assert calls["connect"] == ("exporter_scrape_phase_duration_seconds",
+                                    [(0.01, 1.0), (0.1, 2.0), (float("inf"), 2.0)], pytest.approx(0.055))
+        assert calls["render"][1] == [(0.01, 0.0), (0.1, 0.0), (float("inf"), 1.0)]
+
+    def test_time_observes_on_error(self):
+        """Test the time context manager observes also when the block raises"""
+        timings = ScrapeTimings()
+        with pytest.raises(RuntimeError):
+            with timings.time("info_roundtrip"):
+                raise RuntimeError("boom")
+
+        collector = MagicMock()
+        timings.collect(collector)
+        collector._register_histogram.assert_called_once()
+        assert collector._register_histogram.call_args.args[1][-1] == (float("inf"), 1.0)
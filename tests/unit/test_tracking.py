@@ -0,0 +1,103 @@
+"""Unit tests for tracking.py"""
+
+import fakeredis
+import pytest
+import redis
+from unittest.mock import MagicMock
+
+from exporter.keys import DbKeyPair, extract_check_key_metrics
+from exporter.tracking import KeyTrackingCache
+
+
+def make_cache():
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeStrictRedis(server=server)
+    client.set("config:limit", "100")
+    client.rpush("queue", "a", "b")
+    cache = KeyTrackingCache(lambda on_connect: fakeredis.FakeStrictRedis(server=server))
+    return cache, client
+
+
+KEYS = [DbKeyPair("0", "config:limit"), DbKeyPair("0", "queue")]
+
+
+class TestKeyTrackingCache:
+    """Tests for KeyTrackingCache class"""
+
+    def test_cached_until_invalidated(self):
+        """Test keys are read from Redis only on misses"""
+        cache, client = make_cache()
+
+        result = cache.get_keys_info(KEYS)
+        assert result[("0", "config:limit")] == ("string", 3, "100")
+        assert result[("0", "queue")] == ("list", 2, None)
+        assert (cache.hits, cache.misses, cache.entries) == (0, 2, 2)
+
+        # Changes without invalidation aren't seen: the value is served from cache
+        client.set("config:limit", "200")
+        assert cache.get_keys_info(KEYS)[("0", "config:limit")] == ("string", 3, "100")
+        assert cache.hits == 2
+
+        cache.handle_invalidation([b"invalidate", [b"config:limit"]])
+        assert cache.get_keys_info(KEYS)[("0", "config:limit")] == ("string", 3, "200")
+        assert (cache.hits, cache.misses, cache.invalidations) == (3, 3, 1)
+
+    def test_flush_invalidation(self):
+        """Test null invalidation (FLUSHALL) drops every entry"""
+        cache, _ = make_cache()
+        cache.get_keys_info(KEYS)
+        cache.handle_invalidation([b"invalidate", None])
+        assert cache.entries == 0
+
+    def test_invalidated_during_fetch_not_cached(self):
+        """Test values invalidated while being fetched aren't cached"""
+        cache, _ = make_cache()
+        original_fetch = cache._fetch
+
+        def fetch(db, key_names):
+            result = original_fetch(db, key_names)
+            cache.handle_invalidation([b"invalidate", [b"queue"]])
+            return result
+
+        cache._fetch = fetch
+        result = cache.get_keys_info(KEYS)
+        assert ("0", "queue") in result
+        assert cache.entries == 1
+
+    def test_on_connect_enables_tracking(self):
+        """Test connect callback enables tracking and registers handler"""
+        cache, _ = make_cache()
+        cache.get_keys_info(KEYS)
+        connection = MagicMock()
+
+        cache.on_connect(connection)
+
+        connection.send_command.assert_called_once_with("CLIENT", "TRACKING", "ON")
+        connection._parser.set_invalidation_push_handler.assert_called_once_with(cache.handle_invalidation)
+        # Reconnect drops entries, invalidations could have been missed
+        assert cache.entries == 0
+
+    def test_on_connect_without_push_handlers(self):
+        """Test parser without push handler support fails with a clear error"""
+        cache, _ = make_cache()
+        connection = MagicMock()
+        connection._parser = object()
+
+        with pytest.raises(redis.exceptions.ConnectionError, match="RESP3"):
+            cache.on_connect(connection)
+
+    def test_process_invalidations_real_pool(self):
+        """Test pending invalidations are drained from a pooled connection"""
+        cache, _ = make_cache()
+        cache.client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+        cache._process_invalidations()
+        assert len(cache.client.connection_pool._available_connections) == 1
+
+    def test_extract_uses_cache(self, mock_collector):
+        """Test single keys are served by the cache in extract_check_key_metrics"""
+        cache, client = make_cache()
+        extract_check_key_metrics(client, "", "db0=config:limit", mock_collector, key_cache=cache)
+        extract_check_key_metrics(client, "", "db0=config:limit", mock_collector, key_cache=cache)
+
+        assert [m["value"] for m in mock_collector._current_metrics["key_value"]] == [100.0, 100.0]
+        assert cache.hits == 1